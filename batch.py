@@ -0,0 +1,223 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+from ia_crawler.crawler import SiteIACrawler
+from ia_crawler.exporters import check_format, export
+from ia_crawler.metrics import get_metrics, format_summary, span
+from ia_crawler.page_cache import normalize_cache_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FORMATS = ('txt', 'csv', 'md')
+MANIFEST_NAME = "manifest.jsonl"
+
+
+def load_seeds(path):
+    # 한 줄에 URL 하나. 빈 줄과 #으로 시작하는 줄은 무시하고 중복은 처음 것만 남김
+    seeds, seen = [], set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            url = line.strip()
+            if not url or url.startswith('#'):
+                continue
+            if not urlparse(url).scheme:
+                url = "https://" + url
+            key = normalize_cache_url(url)
+            if key not in seen:
+                seen.add(key)
+                seeds.append(url)
+    return seeds
+
+
+def site_dir_name(url):
+    # 사람이 알아볼 수 있는 호스트/경로 + 충돌 방지용 짧은 해시
+    parts = urlparse(url)
+    slug = re.sub(r'[^A-Za-z0-9._-]+', '_', f"{parts.netloc}{parts.path}").strip('_')[:80]
+    digest = hashlib.sha1(normalize_cache_url(url).encode('utf-8')).hexdigest()[:8]
+    return f"{slug}-{digest}"
+
+
+class Manifest:
+    # 시드별 결과를 한 줄씩 append. 재시작 시 status가 ok인 시드는 건너뜀
+    def __init__(self, out_dir):
+        self.path = os.path.join(out_dir, MANIFEST_NAME)
+        self._lock = threading.Lock()
+
+    def completed(self):
+        done = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # 중단되며 잘린 마지막 줄
+                if entry.get('status') == 'ok':
+                    done.add(normalize_cache_url(entry['url']))
+        return done
+
+    def append(self, result):
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def crawl_seed(url, out_dir, formats=DEFAULT_FORMATS, site=False, max_depth=2, max_pages=100, concurrency=4,
+               snapshot=False, screenshots=False, sitemaps=False, respect_robots=True):
+    # 시드 하나를 크롤링해 out_dir/<사이트>/site_ia.<형식>으로 내보냄. 예외는 결과의 error로 돌려줌
+    started = time.time()
+    target = os.path.join(out_dir, site_dir_name(url))
+    result = {'url': url, 'dir': target, 'status': 'error', 'error': None, 'pages': 0, 'version': None}
+    try:
+        crawler = SiteIACrawler()
+        if site:
+            outcome = crawler.crawl_site(url, max_depth=max_depth, max_pages=max_pages, concurrency=concurrency,
+                                         respect_robots=respect_robots, sitemaps=sitemaps)
+        else:
+            outcome = crawler.crawl(url)
+        if outcome is not True:
+            result['error'] = str(outcome)
+            return result
+
+        os.makedirs(target, exist_ok=True)
+        ia = crawler.to_ia()
+        for fmt in formats:
+            path = os.path.join(target, f"site_ia.{fmt}")
+            # 임시 파일에 다 쓴 뒤 교체해 중단되어도 반쯤 쓴 파일이 남지 않게 함
+            with span('export', fmt=fmt):
+                export(ia, fmt, path + ".tmp", crawler.base_url)
+            os.replace(path + ".tmp", path)
+        if crawler.pages:
+            with open(os.path.join(target, "pages.json"), 'w', encoding='utf-8') as f:
+                json.dump(crawler.pages, f, ensure_ascii=False, indent=2)
+
+        if screenshots:
+            counts = {'cached': 0, 'captured': 0, 'failed': 0}
+            for item in crawler.capture_all():
+                counts[item['status']] += 1
+            result['screenshots'] = counts
+        if snapshot:
+            saved = crawler.save_snapshot()
+            result['version'] = saved['version']
+            result['changes'] = len(saved['changes'])
+
+        result['status'] = 'ok'
+        result['pages'] = len(crawler.pages) or 1
+    except Exception as e:
+        logger.error(f"시드 크롤링 실패: {url} - {str(e)}")
+        result['error'] = str(e)
+    finally:
+        result['seconds'] = round(time.time() - started, 3)
+        result['finished_at'] = time.time()
+    return result
+
+
+def run_batch(seeds, out_dir, workers=2, resume=True, **options):
+    # 시드 목록을 워커 풀에서 처리하며 끝나는 순서대로 결과를 돌려주는 제너레이터.
+    # resume=True면 manifest에 성공으로 기록된 시드는 다시 크롤링하지 않음
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = Manifest(out_dir)
+    done = manifest.completed() if resume else set()
+    pending = []
+    for url in seeds:
+        if normalize_cache_url(url) in done:
+            yield {'url': url, 'status': 'skipped'}
+        else:
+            pending.append(url)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='ia-batch')
+    try:
+        futures = [executor.submit(crawl_seed, url, out_dir, **options) for url in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            manifest.append(result)
+            yield result
+    finally:
+        # Ctrl+C 등으로 중단되면 아직 시작하지 않은 시드는 버리고, 다음 실행에서 이어서 처리
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="사이트 IA 구조도 일괄 크롤러")
+    parser.add_argument("seeds", help="크롤링할 URL 목록 파일 (한 줄에 하나)")
+    parser.add_argument("-o", "--out", default="exports", help="내보내기 디렉터리 (기본: exports)")
+    parser.add_argument("-w", "--workers", type=int, default=2, help="동시에 처리할 사이트 수")
+    parser.add_argument("-f", "--formats", default=",".join(DEFAULT_FORMATS), help="내보낼 형식 (txt,csv,md,jsonl,parquet)")
+    parser.add_argument("--site", action="store_true", help="하위 페이지까지 사이트 전체 크롤링")
+    parser.add_argument("--max-depth", type=int, default=2)
+    parser.add_argument("--max-pages", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4, help="사이트 하나 안에서의 동시 요청 수")
+    parser.add_argument("--sitemaps", action="store_true", help="robots.txt/sitemap.xml의 URL로 크롤링 대상 보충 (--site와 함께)")
+    parser.add_argument("--ignore-robots", action="store_true", help="robots.txt의 Disallow/Crawl-delay를 따르지 않음")
+    parser.add_argument("--snapshot", action="store_true", help="IA 스냅샷을 저장하고 이전 버전과 비교")
+    parser.add_argument("--screenshots", action="store_true", help="모든 페이지 PC/모바일 스크린샷 캡처")
+    parser.add_argument("--no-resume", action="store_true", help="manifest를 무시하고 모든 시드를 다시 크롤링")
+    parser.add_argument("--metrics", help="Prometheus 텍스트 형식 지표를 저장할 파일")
+    parser.add_argument("--trace", help="Chrome trace(JSON)를 저장할 파일 (chrome://tracing, Perfetto)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    try:
+        for fmt in formats:
+            check_format(fmt)
+    except ValueError as e:
+        parser.error(str(e))
+    seeds = load_seeds(args.seeds)
+    failed = 0
+    try:
+        for i, result in enumerate(run_batch(
+            seeds,
+            args.out,
+            workers=args.workers,
+            resume=not args.no_resume,
+            formats=formats,
+            site=args.site,
+            max_depth=args.max_depth,
+            max_pages=args.max_pages,
+            concurrency=args.concurrency,
+            snapshot=args.snapshot,
+            screenshots=args.screenshots,
+            sitemaps=args.sitemaps,
+            respect_robots=not args.ignore_robots,
+        ), 1):
+            if result['status'] == 'error':
+                failed += 1
+                print(f"[{i}/{len(seeds)}] 실패 {result['url']}: {result['error']}", flush=True)
+            elif result['status'] == 'skipped':
+                print(f"[{i}/{len(seeds)}] 건너뜀 {result['url']} (이미 완료)", flush=True)
+            else:
+                print(f"[{i}/{len(seeds)}] 완료 {result['url']} - 페이지 {result['pages']}개, {result['seconds']}s -> {result['dir']}", flush=True)
+    except KeyboardInterrupt:
+        print("중단됨. 같은 명령으로 다시 실행하면 남은 시드부터 이어서 처리합니다.", file=sys.stderr)
+        return 130
+    finally:
+        metrics = get_metrics()
+        if args.metrics:
+            metrics.write_prometheus(args.metrics)
+        if args.trace:
+            metrics.write_trace(args.trace)
+        print(format_summary(metrics.summary()))
+        for name, value in metrics.counters().items():
+            print(f"{name} {value}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
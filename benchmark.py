@@ -0,0 +1,474 @@
+import argparse
+import functools
+import gc
+import hashlib
+import inspect
+import io
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from ia_crawler.crawler import SiteIACrawler
+from ia_crawler.dom import BACKENDS, get_dom
+from ia_crawler.exporters import EXPORTERS, BINARY_FORMATS
+from ia_crawler.link_store import json_default
+from ia_crawler.page_cache import PageCache
+from ia_crawler.site_crawl import SECTION_ATTRS, iter_links
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_DIR = os.environ.get("IA_BENCH_FIXTURES", "bench_fixtures")
+FIXTURE_SEED = 20240601  # 코퍼스가 항상 같은 바이트로 생성되도록 고정
+FIXTURE_VERSION = 1  # 생성기 출력이 바뀌는 수정(WORDS 외의 상수, 공용 함수 등)을 하면 올림
+FIXTURE_MANIFEST = "manifest.json"
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")  # 커밋해 두는 기준 결과
+DEFAULT_THRESHOLD = 0.10  # baseline 대비 p50이 10% 넘게 느려지면 회귀로 표시
+
+WORDS = ['회사소개', '제품', '서비스', '고객센터', '공지사항', '이벤트', '채용', '투자정보', '뉴스', '블로그', '쇼핑', '멤버십',
+         '혜택', '매장찾기', '자주묻는질문', '1:1문의', '이용약관', '개인정보처리방침', '사이트맵', '오시는길', '브랜드', '스토리',
+         '지속가능경영', '윤리경영', '인재상', '복지', '연구개발', '기술', '솔루션', '파트너', '문의하기', '다운로드']
+
+
+def _words(rng, n=2):
+    return ' '.join(rng.choice(WORDS) for _ in range(n))
+
+
+def portal_megamenu(rng):
+    # 국내 포털/대기업 스타일: GNB 12개 x 3단 메가메뉴, LNB, 배너/본문 링크, 패밀리 사이트가 있는 푸터
+    menus = []
+    for i in range(12):
+        columns = []
+        for c in range(3):
+            items = ''.join(
+                f'<li><a href="/menu{i}/col{c}/item{k}.do">{_words(rng)}</a></li>' for k in range(8)
+            )
+            columns.append(f'<div class="depth2-col"><strong>{_words(rng, 1)}</strong><ul class="depth3">{items}</ul></div>')
+        menus.append(
+            f'<li class="depth1"><a href="/menu{i}/index.do">{_words(rng, 1)}</a>'
+            f'<div class="mega-menu"><div class="inner">{"".join(columns)}</div></div></li>'
+        )
+    lnb = ''.join(
+        f'<li><a href="/menu0/lnb{k}.do">{_words(rng)}</a><ul>'
+        + ''.join(f'<li><a href="/menu0/lnb{k}/sub{j}.do">{_words(rng)}</a></li>' for j in range(4))
+        + '</ul></li>'
+        for k in range(8)
+    )
+    content = ''.join(
+        f'<div class="card"><a href="/news/{k}.do"><img src="/img/{k}.jpg" alt=""><p>{_words(rng, 5)}</p></a></div>'
+        for k in range(60)
+    )
+    family = ''.join(f'<option value="https://family{k}.example.co.kr">{_words(rng, 1)}</option>' for k in range(30))
+    footer_links = ''.join(f'<li><a href="/policy/{k}.do">{_words(rng)}</a></li>' for k in range(12))
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>포털</title>'
+        + ''.join(f'<script src="/js/lib{k}.js"></script>' for k in range(8))
+        + '<style>.mega-menu{display:none}</style></head><body>'
+        '<div id="skip"><a href="#content">본문 바로가기</a></div>'
+        '<header id="header"><h1><a href="/"><img src="/logo.png" alt="로고"></a></h1>'
+        f'<nav id="gnb" class="gnb"><ul class="gnb-list">{"".join(menus)}</ul></nav>'
+        '<div class="util"><a href="/login.do">로그인</a><a href="/join.do">회원가입</a><a href="/en/">ENG</a></div></header>'
+        f'<div id="container"><aside id="lnb" class="lnb"><ul>{lnb}</ul></aside>'
+        f'<main id="content"><section class="cards">{content}</section></main></div>'
+        f'<footer id="footer"><ul class="footer-menu">{footer_links}</ul>'
+        '<address>서울특별시 중구 세종대로 110 | 대표전화 1588-0000 | 사업자등록번호 000-00-00000</address>'
+        f'<select class="family-site">{family}</select><p class="copyright">Copyright © Example Corp. All rights reserved.</p></footer>'
+        '</body></html>'
+    )
+
+
+def spa_shell(rng):
+    # CSR SPA 셸: 정적 HTML에는 링크가 거의 없어 브라우저 경로로 넘어감
+    scripts = ''.join(f'<script defer src="/static/js/chunk-{rng.randrange(16 ** 8):08x}.js"></script>' for _ in range(12))
+    state = json.dumps({'menus': [{'title': _words(rng), 'path': f'/m/{k}'} for k in range(200)]}, ensure_ascii=False)
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>SPA</title>'
+        f'{scripts}</head><body><noscript>JavaScript를 활성화해 주세요.</noscript>'
+        f'<div id="root"></div><script>window.__INITIAL_STATE__={state}</script></body></html>'
+    )
+
+
+def corporate_footer(rng):
+    # 기업 사이트: GNB는 작고, 푸터에 사이트맵 전체(수백 개 링크)가 들어 있는 구조
+    gnb = ''.join(f'<li><a href="/{k}">{_words(rng, 1)}</a></li>' for k in range(6))
+    groups = []
+    for g in range(20):
+        links = ''.join(f'<li><a href="/sitemap/{g}/{k}">{_words(rng)}</a></li>' for k in range(15))
+        groups.append(f'<div class="footer-group"><h3>{_words(rng, 1)}</h3><ul>{links}</ul></div>')
+    body = ''.join(f'<p>{_words(rng, 30)}</p>' for _ in range(40))
+    sns = ''.join(f'<a href="https://sns{k}.example.com/corp" class="sns">SNS {k}</a>' for k in range(6))
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>기업</title></head><body>'
+        f'<div class="header"><div class="logo"><a href="/">Corp</a></div><nav class="navbar"><ul>{gnb}</ul></nav></div>'
+        f'<div class="contents">{body}</div>'
+        f'<div class="footer"><div class="sitemap">{"".join(groups)}</div><div class="sns-area">{sns}</div>'
+        '<p class="copyright">© Corp. All Rights Reserved. 개인정보처리방침 | 이용약관</p></div></body></html>'
+    )
+
+
+def sitemap_10k(rng):
+    # 10,000개 링크의 3단 사이트맵 페이지
+    sections = []
+    n = 0
+    for a in range(20):
+        subs = []
+        for b in range(25):
+            items = ''.join(f'<li><a href="/s/{a}/{b}/{c}">{_words(rng)} {n + c}</a></li>' for c in range(19))
+            n += 19
+            subs.append(f'<li><a href="/s/{a}/{b}">{_words(rng)}</a><ul>{items}</ul></li>')
+        n += 25
+        sections.append(f'<li><a href="/s/{a}">{_words(rng, 1)}</a><ul>{"".join(subs)}</ul></li>')
+    gnb = ''.join(f'<li><a href="/s/{a}">{_words(rng, 1)}</a></li>' for a in range(8))
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>사이트맵</title></head><body>'
+        f'<header><nav class="gnb"><ul>{gnb}</ul></nav></header>'
+        f'<main><h1>사이트맵</h1><ul class="sitemap">{"".join(sections)}</ul></main>'
+        '<footer><a href="/privacy">개인정보처리방침</a><a href="/terms">이용약관</a></footer></body></html>'
+    )
+
+
+FIXTURES = {
+    'portal_megamenu': portal_megamenu,
+    'spa_shell': spa_shell,
+    'corporate_footer': corporate_footer,
+    'sitemap_10k': sitemap_10k,
+}
+
+
+def generator_hash(name):
+    # 생성기 소스 + 시드 + FIXTURE_VERSION. 생성기를 고치면 값이 바뀌어 예전 코퍼스를 다시 만듦
+    source = inspect.getsource(FIXTURES[name]) + inspect.getsource(_words) + json.dumps(WORDS, ensure_ascii=False)
+    return hashlib.sha256(f"{FIXTURE_VERSION}:{FIXTURE_SEED}:{source}".encode('utf-8')).hexdigest()[:16]
+
+
+def _file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def build_fixtures(directory=FIXTURE_DIR):
+    # 고정 시드로 생성하므로 같은 커밋이면 항상 같은 코퍼스. 디렉터리의 manifest.json에 생성기 해시와 파일 해시를 기록해 두고,
+    # 생성기가 바뀌었거나 파일이 없어지거나 손으로 고쳐진 픽스처만 다시 생성
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, FIXTURE_MANIFEST)
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    paths = {}
+    for name, generate in FIXTURES.items():
+        path = os.path.join(directory, f"{name}.html")
+        entry = manifest.get(name, {})
+        if entry.get('generator') != generator_hash(name) or not os.path.exists(path) or _file_hash(path) != entry.get('sha256'):
+            html = generate(random.Random(f"{FIXTURE_SEED}:{name}"))
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            manifest[name] = {'generator': generator_hash(name), 'sha256': _file_hash(path)}
+            logger.info(f"픽스처 생성: {path}")
+        paths[name] = path
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return paths
+
+
+def fixture_hashes(paths):
+    return {name: _file_hash(path) for name, path in paths.items()}
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures(directory):
+    # 포트 0으로 띄워 빈 포트를 자동 할당. (server, base_url)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, name='bench-http', daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def peak_rss_mb():
+    # 리눅스는 KB, macOS는 바이트 단위
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _percentile(sorted_values, q):
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    index = (len(sorted_values) - 1) * q
+    low = int(index)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (index - low)
+
+
+def measure(name, fn, iterations, warmup=1, items=None, **labels):
+    # fn을 warmup회 돌린 뒤 iterations회 측정. items: 1회당 처리 단위 수(링크 수 등) -> items_per_s
+    for _ in range(warmup):
+        fn()
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    timings = []
+    try:
+        for i in range(iterations):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    timings.sort()
+    total = sum(timings)
+    result = {
+        'name': name,
+        **labels,
+        'n': iterations,
+        'mean_ms': round(statistics.fmean(timings) * 1000, 3),
+        'p50_ms': round(_percentile(timings, 0.50) * 1000, 3),
+        'p90_ms': round(_percentile(timings, 0.90) * 1000, 3),
+        'p99_ms': round(_percentile(timings, 0.99) * 1000, 3),
+        'min_ms': round(timings[0] * 1000, 3),
+        'max_ms': round(timings[-1] * 1000, 3),
+        'ops_per_s': round(iterations / total, 2) if total else None,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    if items:
+        result['items'] = items
+        result['items_per_s'] = round(items * iterations / total, 1) if total else None
+    logger.info(f"{result_key(result)}: p50 {result['p50_ms']}ms p90 {result['p90_ms']}ms ({iterations}회)")
+    return result
+
+
+def result_key(result):
+    return '/'.join(str(result[k]) for k in ('name', 'fixture', 'parser', 'format', 'path') if result.get(k) is not None)
+
+
+def _crawler(parser, page_cache=None):
+    return SiteIACrawler(parser=parser, page_cache=page_cache)
+
+
+def bench_parse_and_extract(paths, parsers, iterations):
+    results = []
+    parity = {}
+    for fixture, path in paths.items():
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        outputs = {}
+        for parser in parsers:
+            crawler = _crawler(parser)
+            soup = crawler.parse(html)
+            labels = {'fixture': fixture, 'parser': parser}
+            results.append(measure('parse', lambda: crawler.parse(html), iterations, **labels))
+            results.append(measure('find_gnb_element', lambda: crawler.find_gnb_element(soup), iterations, **labels))
+            results.append(measure('find_side_element', lambda: crawler.find_side_element(soup), iterations, **labels))
+            results.append(measure('find_footer_element', lambda: crawler.find_footer_element(soup), iterations, **labels))
+            link_count = sum(1 for _ in iter_links(crawler.extract_links(soup, section="Other")))
+            results.append(measure('extract_links', lambda: crawler.extract_links(soup, section="Other"), iterations, items=link_count, **labels))
+            outputs[parser] = json.dumps(crawler.extract_links(soup, section="Other"), ensure_ascii=False, sort_keys=True, default=json_default)
+        # 파서 백엔드끼리 추출 결과가 같은지 (같으면 속도 비교가 공정함)
+        parity[fixture] = len(set(outputs.values())) == 1
+    return results, parity
+
+
+def bench_exporters(paths, iterations):
+    # 가장 큰 트리(sitemap_10k)를 형식별로 메모리 스트림에 내보냄
+    crawler = _crawler('html.parser')
+    with open(paths['sitemap_10k'], encoding='utf-8') as f:
+        soup = crawler.parse(f.read())
+    ia = {attr: [] for attr in SECTION_ATTRS}
+    ia['other_links'] = crawler.extract_links(soup, section="Other")
+    links = sum(1 for _ in iter_links(ia['other_links']))
+    results = []
+    for fmt, exporter in EXPORTERS.items():
+        if fmt == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                continue
+        stream = io.BytesIO if fmt in BINARY_FORMATS else io.StringIO
+        results.append(measure('export', lambda: exporter(ia, stream(), 'http://bench'), iterations, items=links,
+                               fixture='sitemap_10k', format=fmt))
+    return results
+
+
+def bench_crawl(base_url, parsers, iterations, browser=False):
+    # 로컬 서버를 대상으로 한 crawl() 전체. 매 회 쿼리 문자열을 바꿔 페이지 캐시를 피함
+    results = []
+    errors = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        page_cache = PageCache(os.path.join(tmp, "bench_page_cache.sqlite3"))
+        counter = iter(range(10 ** 9))
+        for parser in parsers:
+            for fixture in ('portal_megamenu', 'corporate_footer', 'sitemap_10k'):
+                crawler = _crawler(parser, page_cache)
+
+                def run():
+                    url = f"{base_url}/{fixture}.html?bench={next(counter)}"
+                    if crawler.crawl(url) is not True or crawler.fetch_tier != 'http':
+                        raise RuntimeError(f"{fixture}: tier={crawler.fetch_tier} {crawler.fetch_reason}")
+                results.append(measure('crawl', run, iterations, fixture=fixture, parser=parser, path='http'))
+        if browser:
+            crawler = _crawler(parsers[0], page_cache)
+            try:
+                crawler.fetch_browser(f"{base_url}/spa_shell.html")
+            except Exception as e:
+                errors['browser'] = f"브라우저 경로 건너뜀: {str(e).splitlines()[0]}"
+            else:
+                def run_browser():
+                    url = f"{base_url}/spa_shell.html?bench={next(counter)}"
+                    if crawler.crawl(url) is not True:
+                        raise RuntimeError(crawler.fetch_reason)
+                results.append(measure('crawl', run_browser, max(1, iterations // 5), fixture='spa_shell', parser=parsers[0], path='browser'))
+    return results, errors
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmarks(iterations=20, parsers=None, only=None, browser=False, fixture_dir=FIXTURE_DIR):
+    parsers = parsers or [name for name in BACKENDS if get_dom(name).name == name]
+    only = set(only or ('parse', 'export', 'crawl'))
+    paths = build_fixtures(fixture_dir)
+    report = {
+        'meta': {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'iterations': iterations,
+            'parsers': parsers,
+            'fixtures': {name: os.path.getsize(path) for name, path in paths.items()},
+            'fixture_hashes': fixture_hashes(paths),
+        },
+        'results': [],
+        'errors': {},
+    }
+    if 'parse' in only:
+        results, parity = bench_parse_and_extract(paths, parsers, iterations)
+        report['results'].extend(results)
+        report['meta']['parser_parity'] = parity
+    if 'export' in only:
+        report['results'].extend(bench_exporters(paths, max(1, iterations // 4)))
+    if 'crawl' in only:
+        server, base_url = serve_fixtures(os.path.abspath(fixture_dir))
+        try:
+            results, errors = bench_crawl(base_url, parsers, iterations, browser=browser)
+            report['results'].extend(results)
+            report['errors'].update(errors)
+        finally:
+            server.shutdown()
+    report['meta']['peak_rss_mb'] = peak_rss_mb()
+    return report
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    # 같은 키(이름/픽스처/파서/형식/경로)끼리 p50 비교. ratio > 1 + threshold면 회귀.
+    # 픽스처 내용이 baseline과 다르면 시간 비교가 의미 없으므로 corpus-changed로 표시
+    old = {result_key(result): result for result in baseline.get('results', [])}
+    old_hashes = baseline.get('meta', {}).get('fixture_hashes', {})
+    new_hashes = report.get('meta', {}).get('fixture_hashes', {})
+    rows = []
+    for result in report['results']:
+        key = result_key(result)
+        before = old.get(key)
+        if before is None or not before.get('p50_ms'):
+            continue
+        ratio = result['p50_ms'] / before['p50_ms']
+        fixture = result.get('fixture')
+        if fixture in old_hashes and old_hashes[fixture] != new_hashes.get(fixture):
+            rows.append({'key': key, 'baseline_p50_ms': before['p50_ms'], 'p50_ms': result['p50_ms'], 'ratio': round(ratio, 3),
+                         'status': 'corpus-changed'})
+            continue
+        rows.append({
+            'key': key,
+            'baseline_p50_ms': before['p50_ms'],
+            'p50_ms': result['p50_ms'],
+            'ratio': round(ratio, 3),
+            'status': 'regression' if ratio > 1 + threshold else 'improved' if ratio < 1 - threshold else 'same',
+        })
+    return rows
+
+
+def format_report(report, comparison=None):
+    lines = [f"{'벤치마크':<48}{'p50(ms)':>10}{'p90(ms)':>10}{'p99(ms)':>10}{'ops/s':>10}{'RSS(MB)':>10}"]
+    for result in report['results']:
+        lines.append(
+            f"{result_key(result):<48}{result['p50_ms']:>10}{result['p90_ms']:>10}{result['p99_ms']:>10}"
+            f"{result['ops_per_s']:>10}{result['peak_rss_mb']:>10}"
+        )
+    for name, error in report.get('errors', {}).items():
+        lines.append(f"[{name}] {error}")
+    if comparison:
+        lines.append("")
+        lines.append(f"{'baseline 비교':<48}{'이전':>10}{'현재':>10}{'비율':>10}  상태")
+        for row in comparison:
+            lines.append(f"{row['key']:<48}{row['baseline_p50_ms']:>10}{row['p50_ms']:>10}{row['ratio']:>10}  {row['status']}")
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="사이트 IA 크롤러 벤치마크 (오프라인 픽스처 코퍼스)")
+    parser.add_argument("-n", "--iterations", type=int, default=20)
+    parser.add_argument("--parsers", help="쉼표로 구분한 파서 백엔드 (기본: 설치된 전부)")
+    parser.add_argument("--only", help="parse,export,crawl 중 일부만 실행")
+    parser.add_argument("--browser", action="store_true", help="Chromium 경로(crawl)도 측정")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR, help="픽스처 디렉터리 (없으면 생성)")
+    parser.add_argument("-o", "--out", default="bench_report.json", help="결과 JSON 파일")
+    parser.add_argument("--baseline", nargs="?", const=BASELINE_PATH,
+                        help=f"비교할 baseline JSON (경로 없이 쓰면 커밋된 {os.path.basename(BASELINE_PATH)})")
+    parser.add_argument("--save-baseline", help="이번 결과를 baseline으로 저장할 경로")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀로 볼 p50 증가율 (기본 0.10)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    report = run_benchmarks(
+        iterations=args.iterations,
+        parsers=args.parsers.split(",") if args.parsers else None,
+        only=args.only.split(",") if args.only else None,
+        browser=args.browser,
+        fixture_dir=args.fixtures,
+    )
+    comparison = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            comparison = compare(report, json.load(f), args.threshold)
+        report['comparison'] = comparison
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(format_report(report, comparison))
+    if args.fail_on_regression and comparison and any(row['status'] == 'regression' for row in comparison):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
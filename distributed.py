@@ -0,0 +1,248 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+from ia_crawler.crawler import SiteIACrawler
+from ia_crawler.exporters import check_format, export
+from ia_crawler.frontier import FRONTIER_URL, get_frontier
+from ia_crawler.http_fetch import get_http_fetcher
+from ia_crawler.metrics import count
+from ia_crawler.robots import RobotsPolicy, sitemap_seeds
+from ia_crawler.site_crawl import SECTION_ATTRS, SiteCrawlEngine, iter_links, url_key
+from ia_crawler.url_canon import UrlSeenSet
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 1.0
+
+
+def _same_host(url, host):
+    parsed = urlparse(url)
+    return parsed.scheme in ('http', 'https') and parsed.hostname == host
+
+
+def _heartbeat(frontier, crawl, key, worker, stop):
+    # 페이지 하나가 visibility timeout보다 오래 걸려도 임대를 빼앗기지 않도록 주기적으로 연장
+    while not stop.wait(frontier.visibility_timeout / 3):
+        frontier.extend(crawl, key, worker)
+
+
+def run_worker(frontier, crawl, worker=None, crawler_factory=SiteIACrawler, batch=1, idle_exit=True, respect_robots=True):
+    # 프런티어에서 URL을 임대해 크롤링하고, 같은 호스트 링크를 다음 깊이로 밀어 넣음.
+    # 대기 중/임대 중 항목이 모두 없어지면 종료(idle_exit=False면 계속 대기).
+    # robots.txt의 Disallow 링크는 넣지 않고, Crawl-delay는 프런티어에 둔 호스트별 다음 요청 시각으로
+    # 모든 워커(프로세스/노드)를 합쳐 지킴
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}"
+    info = frontier.info(crawl)
+    if info is None:
+        raise ValueError(f"알 수 없는 크롤링: {crawl}")
+    host = urlparse(info['seed']).hostname
+    robots = RobotsPolicy(info['seed'], get_http_fetcher()) if respect_robots else None
+    crawl_delay = robots.crawl_delay if robots is not None else 0.0
+
+    def allowed(url):
+        if not _same_host(url, host):
+            return False
+        if robots is not None and not robots.allowed(url):
+            count('robots_disallowed_total')
+            return False
+        return True
+    processed = 0
+    while True:
+        items = frontier.lease(crawl, worker, batch)
+        if not items:
+            if idle_exit and frontier.finished(crawl):
+                break
+            time.sleep(POLL_INTERVAL)
+            continue
+        for item in items:
+            stop = threading.Event()
+            threading.Thread(target=_heartbeat, args=(frontier, crawl, item['key'], worker, stop), daemon=True).start()
+            try:
+                crawler = crawler_factory()
+                if crawl_delay:
+                    frontier.wait_for_host(crawl, urlparse(item['url']).hostname, crawl_delay)
+                result = crawler.crawl(item['url'])
+                if result is not True:
+                    frontier.fail(crawl, item['key'], worker, str(result))
+                    continue
+                if item['depth'] < info['max_depth']:
+                    links = (link['url'] for attr in SECTION_ATTRS for link in iter_links(getattr(crawler, attr)))
+                    frontier.add(crawl, [(url, item['depth'] + 1) for url in links if allowed(url)])
+                frontier.complete(crawl, item['key'], worker, {
+                    'ia': crawler.to_ia(),
+                    'tier': crawler.fetch_tier,
+                    'hash': crawler.content_hash,
+                })
+                processed += 1
+            except Exception as e:
+                logger.error(f"분산 크롤링 페이지 실패: {item['url']} - {str(e)}")
+                frontier.fail(crawl, item['key'], worker, str(e))
+            finally:
+                stop.set()
+    logger.info(f"워커 종료: {worker} ({processed}페이지)")
+    return processed
+
+
+def _worker_process(frontier_url, crawl, batch, respect_robots):
+    logging.basicConfig(level=logging.INFO)
+    run_worker(get_frontier(frontier_url), crawl, batch=batch, respect_robots=respect_robots)
+
+
+def run_workers(frontier_url, crawl, processes=2, batch=1, respect_robots=True):
+    # 한 노드에서 워커 프로세스 여러 개 실행. 다른 노드에서도 같은 frontier_url/crawl로 실행하면 함께 처리
+    procs = [
+        multiprocessing.Process(target=_worker_process, args=(frontier_url, crawl, batch, respect_robots), name=f"ia-worker-{i}")
+        for i in range(max(1, processes))
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    return [proc.exitcode for proc in procs]
+
+
+def seed_sitemaps(frontier, crawl, respect_robots=True):
+    # 사이트맵의 URL을 깊이 1로 프런티어에 추가 (max_pages 안에서). 추가한 URL 수를 반환
+    info = frontier.info(crawl)
+    fetcher = get_http_fetcher()
+    robots = RobotsPolicy(info['seed'], fetcher) if respect_robots else None
+    added = 0
+    chunk = []
+    for url in sitemap_seeds(info['seed'], fetcher, robots, limit=info['max_pages']):
+        chunk.append((url, 1))
+        if len(chunk) >= 1000:
+            added += frontier.add(crawl, chunk)
+            chunk = []
+    if chunk:
+        added += frontier.add(crawl, chunk)
+    return added
+
+
+def collect(frontier, crawl):
+    # 완료된 페이지들의 IA를 시드 IA 아래에 병합해, crawl_site()와 같은 모양의 크롤러를 만듦
+    info = frontier.info(crawl)
+    seed = url_key(info['seed'])
+    pages = list(frontier.pages(crawl))
+    root = SiteIACrawler()
+    root.base_url = info['seed']
+    root.pages = {}
+
+    seed_page = next((page for page in pages if url_key(page['url']) == seed and page['state'] == 'done'), None)
+    if seed_page is None:
+        return root
+    root.load_ia(seed_page['result']['ia'])
+    root.fetch_tier = seed_page['result']['tier']
+    root.content_hash = seed_page['result']['hash']
+
+    engine = SiteCrawlEngine(None, max_depth=info['max_depth'], max_pages=info['max_pages'])
+    engine.host = urlparse(seed).hostname
+    engine.strings = root.strings
+    seen = UrlSeenSet()
+    seen.add(seed)
+    index = {seed: None}
+    for attr in SECTION_ATTRS:
+        for link in iter_links(getattr(root, attr)):
+            if seen.add(link['url']):
+                index[url_key(link['url'])] = link
+
+    pending = []
+    for page in pages:
+        key = url_key(page['url'])
+        if page['state'] != 'done':
+            root.pages[key] = {'depth': page['depth'], 'status': page['error']}
+            continue
+        root.pages[key] = {'depth': page['depth'], 'status': 'ok', 'tier': page['result']['tier'], 'hash': page['result']['hash']}
+        if key != seed:
+            pending.append((key, page))
+
+    # 링크를 준 페이지가 먼저 병합되어야 노드가 생기므로, 더 붙일 수 없을 때까지 반복.
+    # 끝까지 트리에 없는 페이지(사이트맵에서만 찾은 페이지)는 Other 최상위에 붙임
+    while pending:
+        deferred = [(key, page) for key, page in pending if key not in index]
+        ready = [(key, page) for key, page in pending if key in index]
+        if not ready:
+            for key, page in deferred:
+                if key not in index:
+                    index[key] = engine.add_orphan(root, page['url'])
+                    seen.add(page['url'])
+                ready.append((key, page))
+            deferred = []
+        for key, page in ready:
+            for attr in SECTION_ATTRS:
+                engine.merge(index[key], page['result']['ia'].get(attr, []), seen, nodes=index)
+        pending = deferred
+    return root
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="사이트 IA 분산 크롤러 (공유 프런티어)")
+    parser.add_argument("--frontier", default=FRONTIER_URL, help="sqlite:///경로 또는 redis://호스트:포트/DB")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    start = commands.add_parser("start", help="새 크롤링을 만들고 시드를 등록")
+    start.add_argument("url")
+    start.add_argument("--max-depth", type=int, default=2)
+    start.add_argument("--max-pages", type=int, default=100)
+    start.add_argument("--sitemaps", action="store_true", help="robots.txt/sitemap.xml의 URL도 프런티어에 추가")
+    start.add_argument("--ignore-robots", action="store_true", help="robots.txt를 따르지 않음")
+
+    worker = commands.add_parser("worker", help="워커 프로세스 실행")
+    worker.add_argument("crawl")
+    worker.add_argument("-p", "--processes", type=int, default=os.cpu_count() or 2)
+    worker.add_argument("--batch", type=int, default=1, help="한 번에 임대할 URL 수")
+    worker.add_argument("--ignore-robots", action="store_true", help="robots.txt를 따르지 않음")
+
+    status = commands.add_parser("status", help="진행 상황")
+    status.add_argument("crawl")
+
+    collect_cmd = commands.add_parser("collect", help="결과를 하나의 IA로 병합해 내보냄")
+    collect_cmd.add_argument("crawl")
+    collect_cmd.add_argument("-o", "--out", default="exports")
+    collect_cmd.add_argument("-f", "--formats", default="txt,csv,md")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    frontier = get_frontier(args.frontier)
+
+    if args.command == "start":
+        url = args.url if urlparse(args.url).scheme else "https://" + args.url
+        crawl = frontier.create(url, max_depth=args.max_depth, max_pages=args.max_pages)
+        if args.sitemaps:
+            logger.info(f"사이트맵에서 URL {seed_sitemaps(frontier, crawl, respect_robots=not args.ignore_robots)}개 추가")
+        print(crawl)
+    elif args.command == "worker":
+        exitcodes = run_workers(args.frontier, args.crawl, processes=args.processes, batch=args.batch,
+                                respect_robots=not args.ignore_robots)
+        print(f"워커 {len(exitcodes)}개 종료: {frontier.stats(args.crawl)}")
+        return 1 if any(exitcodes) else 0
+    elif args.command == "status":
+        print(f"{frontier.info(args.crawl)} {frontier.stats(args.crawl)}")
+    elif args.command == "collect":
+        formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+        try:
+            for fmt in formats:
+                check_format(fmt)
+        except ValueError as e:
+            parser.error(str(e))
+        crawler = collect(frontier, args.crawl)
+        os.makedirs(args.out, exist_ok=True)
+        for fmt in formats:
+            path = os.path.join(args.out, f"site_ia_{args.crawl}.{fmt}")
+            export(crawler.to_ia(), fmt, path, crawler.base_url)
+            print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
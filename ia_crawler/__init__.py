@@ -0,0 +1,23 @@
+# 사이트 IA 크롤러 코어 패키지. UI(app.py), CLI(batch.py, distributed.py), API(wsgi.py)가 이 패키지를 사용.
+# 하위 모듈은 처음 접근할 때 import하므로 `import ia_crawler`만으로는 무거운 의존성을 읽지 않음
+import importlib
+
+_EXPORTS = {
+    'SiteIACrawler': 'crawler',
+    'CACHE_DIR': 'crawler',
+    'SCREENSHOT_WIDTHS': 'crawler',
+    'get_job_queue': 'jobs',
+    'export': 'exporters',
+    'get_metrics': 'metrics',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
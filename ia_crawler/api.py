@@ -0,0 +1,270 @@
+import asyncio
+import inspect
+import io
+import json
+import logging
+import re
+from urllib.parse import parse_qs, urlparse
+
+from .exporters import BINARY_FORMATS, EXPORTERS, check_format
+from .jobs import ACTIVE_STATUSES, PARAM_BOUNDS, get_job_queue
+from .metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1024 * 1024
+HIDDEN_FIELDS = ('dedupe_key', 'owner')
+MAX_URLS = 10000
+BOOL_PARAMS = ('site', 'screenshots', 'sitemaps')
+EXPORT_TYPES = {
+    'txt': 'text/plain; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+    'md': 'text/markdown; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+STATUS_TEXT = {
+    200: 'OK',
+    202: 'Accepted',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    409: 'Conflict',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _json(status, data):
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    return status, [('Content-Type', 'application/json; charset=utf-8')], body
+
+
+def _http_url(value, name):
+    # 브라우저로 여는 URL이므로 http(s)만 허용 (file://, chrome:// 등 차단)
+    if not isinstance(value, str):
+        raise ApiError(400, f"{name}은 문자열이어야 합니다")
+    parsed = urlparse(value)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        raise ApiError(400, f"{name}은 http(s) URL이어야 합니다: {value[:200]}")
+    return value
+
+
+def _bounded_int(value, name):
+    low, high = PARAM_BOUNDS[name]
+    if type(value) is not int or not low <= value <= high:
+        raise ApiError(400, f"{name}은 {low}~{high} 범위의 정수여야 합니다")
+    return value
+
+
+def _validate(params):
+    # 시그니처 검사는 이름만 보므로 값의 타입/범위와 URL 스킴은 여기서 직접 검사
+    if 'url' in params:
+        url = params['url']
+        if isinstance(url, str) and url and not urlparse(url).scheme:
+            url = "https://" + url
+        params['url'] = _http_url(url, 'url')
+    if 'urls' in params:
+        urls = params['urls']
+        if not isinstance(urls, list) or not urls:
+            raise ApiError(400, "urls는 비어 있지 않은 URL 목록이어야 합니다")
+        if len(urls) > MAX_URLS:
+            raise ApiError(400, f"urls는 최대 {MAX_URLS}개까지 가능합니다")
+        params['urls'] = [_http_url(url, 'urls 항목') for url in urls]
+    if params.get('widths') is not None:
+        widths = params['widths']
+        if not isinstance(widths, list) or not widths:
+            raise ApiError(400, "widths는 비어 있지 않은 정수 목록이어야 합니다")
+        params['widths'] = [_bounded_int(width, 'widths') for width in widths]
+    for name in ('max_depth', 'max_pages', 'concurrency'):
+        if name in params:
+            _bounded_int(params[name], name)
+    for name in BOOL_PARAMS:
+        if name in params and not isinstance(params[name], bool):
+            raise ApiError(400, f"{name}은 true/false여야 합니다")
+    return params
+
+
+def _public(job, include_result=True):
+    job = {key: value for key, value in job.items() if key not in HIDDEN_FIELDS}
+    if not include_result:
+        job.pop('result', None)
+    return job
+
+
+class CrawlApi:
+    # 크롤링 작업용 JSON API. 같은 요청 처리(handle)를 WSGI(__call__)와 ASGI(asgi)로 노출.
+    #   GET  /health                    상태 확인
+    #   GET  /jobs?limit=20             최근 작업
+    #   POST /jobs                      {"kind": "crawl", "url": ..., "site": true, ...} -> 202 {"id": ...}
+    #                                   ("refresh": true면 최근에 끝난 같은 작업의 결과를 쓰지 않고 다시 실행)
+    #   GET  /jobs/<id>                 상태/진행률/결과 (?result=0이면 결과 제외)
+    #   POST /jobs/<id>/cancel          취소 (DELETE /jobs/<id>도 같음)
+    #   GET  /jobs/<id>/export/<형식>   txt, csv, md, jsonl, parquet 내려받기
+    #   GET  /metrics                   Prometheus 텍스트 형식 지표
+    # 작업 큐는 첫 요청 때 만들어 import만으로는 DB 파일이나 스레드가 생기지 않음
+    def __init__(self, queue=None):
+        self._queue = queue
+
+    @property
+    def queue(self):
+        if self._queue is None:
+            self._queue = get_job_queue()
+        return self._queue
+
+    def handle(self, method, path, query='', body=b''):
+        try:
+            return self._route(method, path.rstrip('/') or '/', parse_qs(query), body)
+        except ApiError as e:
+            return _json(e.status, {'error': str(e)})
+        except Exception as e:
+            logger.exception(f"API 요청 처리 실패: {method} {path}")
+            return _json(500, {'error': str(e)})
+
+    def _route(self, method, path, query, body):
+        if path == '/health':
+            return _json(200, {'status': 'ok'})
+        if path == '/metrics':
+            self._allow(method, 'GET')
+            return 200, [('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')], get_metrics().prometheus_text().encode('utf-8')
+        if path == '/jobs':
+            if method == 'POST':
+                return self._submit(body)
+            self._allow(method, 'GET')
+            try:
+                limit = int(query.get('limit', ['20'])[0])
+            except ValueError:
+                raise ApiError(400, "limit은 정수여야 합니다")
+            return _json(200, [_public(job, include_result=False) for job in self.queue.recent(limit, result=False)])
+
+        match = re.fullmatch(r'/jobs/([0-9a-f]+)(?:/(cancel|export/(\w+)))?', path)
+        if match is None:
+            raise ApiError(404, f"없는 경로: {path}")
+        job_id, action, fmt = match.groups()
+        # 결과는 조회/내보내기 때만 읽음
+        with_result = (action is None and query.get('result', ['1'])[0] != '0') or fmt is not None
+        job = self.queue.get(job_id, result=with_result)
+        if job is None:
+            raise ApiError(404, f"없는 작업: {job_id}")
+
+        if action == 'cancel' or (action is None and method == 'DELETE'):
+            self._allow(method, 'POST', 'DELETE')
+            self.queue.cancel(job_id)
+            return _json(202, _public(self.queue.get(job_id, result=False), include_result=False))
+        if action is None:
+            self._allow(method, 'GET')
+            return _json(200, _public(job, include_result=with_result))
+        self._allow(method, 'GET')
+        return self._export(job, fmt)
+
+    def _allow(self, method, *methods):
+        if method not in methods and not (method == 'HEAD' and 'GET' in methods):
+            raise ApiError(405, f"허용하지 않는 메서드: {method}")
+
+    def _submit(self, body):
+        if len(body) > MAX_BODY_BYTES:
+            raise ApiError(413, "요청 본문이 너무 큽니다")
+        try:
+            params = json.loads(body or b'{}')
+        except ValueError as e:
+            raise ApiError(400, f"JSON 형식 오류: {str(e)}")
+        if not isinstance(params, dict):
+            raise ApiError(400, "요청 본문은 JSON 객체여야 합니다")
+        kind = params.pop('kind', 'crawl')
+        refresh = params.pop('refresh', False)  # true면 RESULT_TTL 안의 이전 결과를 재사용하지 않음
+        if not isinstance(refresh, bool):
+            raise ApiError(400, "refresh는 true/false여야 합니다")
+        handler = self.queue.handlers.get(kind)
+        if handler is None:
+            raise ApiError(400, f"알 수 없는 작업 종류: {kind}")
+        try:
+            # 작업 함수 시그니처로 파라미터를 먼저 검사해 잘못된 요청이 실패한 작업으로 쌓이지 않게 함
+            inspect.signature(handler).bind(None, **params)
+        except TypeError as e:
+            raise ApiError(400, f"잘못된 파라미터: {str(e)}")
+        _validate(params)
+        job_id = self.queue.submit(kind, refresh=refresh, **params)
+        job = self.queue.get(job_id, result=False)
+        return _json(202, {'id': job_id, 'status': job['status']})
+
+    def _export(self, job, fmt):
+        try:
+            check_format(fmt)
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        if job['kind'] != 'crawl' or job['status'] != 'done':
+            status = 'queued/running' if job['status'] in ACTIVE_STATUSES else job['status']
+            raise ApiError(409, f"내보낼 결과가 없습니다 (kind={job['kind']}, status={status})")
+        result = job['result']
+        output = io.BytesIO() if fmt in BINARY_FORMATS else io.StringIO()
+        EXPORTERS[fmt](result['ia'], output, result['base_url'])
+        data = output.getvalue()
+        headers = [
+            ('Content-Type', EXPORT_TYPES.get(fmt, 'application/octet-stream')),
+            ('Content-Disposition', f'attachment; filename="site_ia_{job["id"]}.{fmt}"'),
+        ]
+        return 200, headers, data if isinstance(data, bytes) else data.encode('utf-8')
+
+    def __call__(self, environ, start_response):
+        # WSGI (gunicorn, uWSGI, wsgiref)
+        try:
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        body = environ['wsgi.input'].read(min(length, MAX_BODY_BYTES + 1)) if length else b''
+        status, headers, data = self.handle(environ['REQUEST_METHOD'], environ.get('PATH_INFO', '/'),
+                                            environ.get('QUERY_STRING', ''), body)
+        headers.append(('Content-Length', str(len(data))))
+        start_response(f"{status} {STATUS_TEXT.get(status, '')}", headers)
+        return [b''] if environ['REQUEST_METHOD'] == 'HEAD' else [data]
+
+    async def asgi(self, scope, receive, send):
+        # ASGI (uvicorn, hypercorn). SQLite 조회/작업 등록은 블로킹이므로 스레드에서 처리
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+        # 모든 청크의 길이를 더해 MAX_BODY_BYTES를 넘는 순간 나머지는 읽지 않고 413
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                await self._send_asgi(send, scope['method'], *_json(413, {'error': "요청 본문이 너무 큽니다"}))
+                return
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                break
+        status, headers, data = await asyncio.to_thread(
+            self.handle, scope['method'], scope['path'], scope.get('query_string', b'').decode('latin-1'), b''.join(chunks)
+        )
+        await self._send_asgi(send, scope['method'], status, headers, data)
+
+    @staticmethod
+    async def _send_asgi(send, method, status, headers, data):
+        headers.append(('Content-Length', str(len(data))))
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+        })
+        await send({'type': 'http.response.body', 'body': b'' if method == 'HEAD' else data})
+
+app = CrawlApi()
+asgi_app = app.asgi
@@ -0,0 +1,550 @@
+# selenium, PIL은 브라우저/스크린샷 경로에서만 필요하므로 해당 메서드 안에서 import
+# (HTTP만 쓰는 크롤링, 워커, CLI가 무거운 모듈을 읽지 않고 바로 시작하도록)
+from urllib.parse import urljoin, urlparse
+import re
+import unicodedata
+import io
+import logging
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .driver_pool import get_driver_pool
+from .load_profile import CRAWL, SCREENSHOT, apply_chrome_options, apply_load_profile
+from .site_crawl import SiteCrawlEngine, SECTION_ATTRS, iter_links, url_key
+from .robots import RobotsPolicy, sitemap_seeds
+from .http_fetch import get_http_fetcher
+from .section_classifier import classify_sections
+from .dom import get_dom, fallback_needed
+from .screenshot_cache import get_screenshot_cache, FULL, THUMB
+from .page_settle import wait_for_settle, dismiss_popups
+from .page_cache import get_page_cache, content_hash, ia_reusable
+from .ia_snapshot import get_snapshot_store, diff_ia, changed_pages
+from .exporters import EXPORTERS, BINARY_FORMATS
+from .metrics import span, count
+from .link_store import LinkNode, StringTable, from_dicts
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "screenshot_cache"
+SCREENSHOT_WIDTHS = (1920, 360)  # PC, 모바일
+
+SPA_ROOT_IDS = ['root', 'app', '__next', '__nuxt', '___gatsby']
+MIN_STATIC_LINKS = 10
+
+
+class shared_resource:
+    # 생성자에 넘기지 않은 공유 자원(드라이버 풀, 캐시, HTTP 수집기)은 처음 쓸 때 만듦.
+    # 크롤러를 만들기만 해서는 디렉터리/DB 파일 생성이나 이벤트 루프 스레드 같은 부작용이 없음
+    def __init__(self, factory):
+        self.factory = factory
+
+    def __set_name__(self, owner, name):
+        self.attr = '_' + name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = obj.__dict__.get(self.attr)
+        if value is None:
+            value = obj.__dict__[self.attr] = self.factory(obj)
+        return value
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.attr] = value
+
+
+@lru_cache(maxsize=65536)
+def normalize_link_text(text):
+    if text:
+        text = unicodedata.normalize('NFKC', text)
+        text = re.sub(r'[\xa0\u200b\u200c\u200d]', '', text)
+        text = ' '.join(text.split())
+    return text
+
+
+class SiteIACrawler:
+    # 크롤링은 이미지/폰트/트래커를 막은 드라이버, 스크린샷은 모든 리소스를 받는 별도 풀의 드라이버를 사용
+    driver_pool = shared_resource(lambda self: get_driver_pool(self.setup_driver, name=CRAWL))
+    screenshot_pool = shared_resource(lambda self: get_driver_pool(self.setup_screenshot_driver, name=SCREENSHOT))
+    http_fetcher = shared_resource(lambda self: get_http_fetcher())
+    screenshot_cache = shared_resource(lambda self: get_screenshot_cache(CACHE_DIR))
+    page_cache = shared_resource(lambda self: get_page_cache())
+
+    def __init__(self, driver_pool=None, http_fetcher=None, parser=None, screenshot_cache=None, page_cache=None, strings=None,
+                 screenshot_pool=None):
+        self.base_url = None
+        self.driver_pool = driver_pool
+        self.screenshot_pool = screenshot_pool
+        self.http_fetcher = http_fetcher
+        self.screenshot_cache = screenshot_cache
+        self.page_cache = page_cache
+        self.parser = get_dom(parser)  # 'html.parser' | 'lxml' | 'selectolax' (기본값: IA_PARSER 환경 변수)
+        self.dom = self.parser  # 마지막으로 파싱한 문서의 백엔드 (parse 참고)
+        self.strings = strings or StringTable()  # URL/링크 텍스트 인터닝 테이블. 사이트 크롤링 중에는 모든 페이지가 공유
+        self.fetch_tier = None
+        self.dom_nodes = 0
+        self.fetch_reason = None
+        self.content_hash = None
+        self.gnb_links = []  # 계층적 구조: [LinkNode('1뎁스', url, children=[...])], link['text'] 같은 dict 방식 접근 가능
+        self.side_links = []
+        self.footer_links = []
+        self.other_links = []
+        self.pages = {}
+
+    def setup_driver(self, profile=CRAWL):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        try:
+            options = webdriver.ChromeOptions()
+            options.add_argument("--headless")
+            options.add_argument("--disable-gpu")
+            options.add_argument("--no-sandbox")
+            options.add_argument("--disable-dev-shm-usage")
+            options.add_argument("--window-size=1920,1080")
+            options.add_argument("--disable-blink-features=AutomationControlled")
+            options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36")
+            
+            # Streamlit Cloud 환경에 맞게 설정
+            options.binary_location = "/usr/bin/chromium"
+            service = Service("/usr/lib/chromium/chromedriver")
+
+            apply_chrome_options(options, profile)
+            driver = webdriver.Chrome(service=service, options=options)
+            apply_load_profile(driver, profile)
+            return driver
+        except Exception as e:
+            logger.error(f"드라이버 설정 실패: {str(e)}")
+            raise
+
+    def setup_screenshot_driver(self):
+        return self.setup_driver(profile=SCREENSHOT)
+
+    def parse(self, html):
+        # lxml/lexbor가 html.parser와 다르게 고치는 마크업(닫히지 않은 <li>, 중첩 <a>, <p> 안의 블록 등)이면 이 문서만 html.parser로 파싱.
+        # 이후 섹션 분류/링크 추출은 self.dom으로 트리를 순회하므로 함께 바꿈
+        self.dom = self.parser
+        if self.parser.name != 'html.parser' and fallback_needed(html):
+            count('parser_fallbacks_total', parser=self.parser.name)
+            self.dom = get_dom('html.parser')
+        return self.dom.parse(html)
+
+    def find_gnb_element(self, soup):
+        return classify_sections(soup, self.dom)['gnb']
+
+    def find_side_element(self, soup):
+        return classify_sections(soup, self.dom)['side']
+
+    def find_footer_element(self, soup):
+        return classify_sections(soup, self.dom)['footer']
+
+    def find_first(self, node, names, recursive=True):
+        nodes = self.dom.iter(node) if recursive else self.dom.children(node)
+        return next((el for el in nodes if self.dom.tag(el) in names), None)
+
+    def extract_links(self, soup, element=None, section="Other", depth=1):
+        # 한 번의 전위 순회로 N뎁스 메뉴 트리를 만든다.
+        # <li>의 첫 <a>가 그 항목의 라벨이 되고, 같은 <li> 안의 나머지 링크와 하위 <li>는 라벨의 children으로 들어감
+        links = []
+        seen = set()
+        joined = {}
+        dom = self.dom
+
+        def process_link(link):
+            href = dom.attr(link, 'href', '#')
+            text = normalize_link_text(dom.text(link, strip=True))
+            if not text or href == '#' or href.startswith('javascript:'):
+                return None
+            joined_url = joined.get(href)
+            if joined_url is None:
+                url = urljoin(self.base_url, href)
+                joined_url = joined[href] = (url, url_key(url))
+            return (text,) + joined_url
+
+        def container(item):
+            # item: 가장 가까운 <li>의 상태 {'parent': 목록, 'depth': n, 'node': 라벨 링크, 'labelled': bool}
+            if item is None:
+                return links, depth
+            if item['node'] is not None:
+                return item['node']['children'], item['node']['depth'] + 1
+            return item['parent'], item['depth']
+
+        target = element if element is not None else soup
+        stack = [(child, None) for child in reversed(dom.children(target))]
+        while stack:
+            node, item = stack.pop()
+            tag = dom.tag(node)
+            if tag == 'li':
+                parent, level = container(item)
+                item = {'parent': parent, 'depth': level, 'node': None, 'labelled': False}
+            elif tag == 'a':
+                link_info = process_link(node)
+                if item is not None and not item['labelled']:
+                    parent, level = item['parent'], item['depth']
+                    item['labelled'] = True
+                else:
+                    parent, level = container(item)
+                if link_info and link_info[2] not in seen:  # 정규 URL 기준으로 중복 제거 (/a, /a/, /a#top은 한 번만)
+                    seen.add(link_info[2])
+                    link = LinkNode(self.strings, link_info[0], link_info[1], section, level)
+                    parent.append(link)
+                    if item is not None and item['node'] is None and parent is item['parent']:
+                        item['node'] = link
+            for child in reversed(dom.children(node)):
+                stack.append((child, item))
+        return links
+
+    def needs_browser(self, soup):
+        # 정적 HTML만으로 IA를 뽑을 수 없어 보이면 브라우저 렌더링이 필요한 이유를 반환
+        dom = self.dom
+        elements = list(dom.iter(soup))
+        self.dom_nodes = len(elements)
+        for root_id in SPA_ROOT_IDS:
+            root = next((el for el in elements if dom.attr(el, 'id') == root_id), None)
+            if root is not None and not dom.text(root, strip=True) and self.find_first(root, ('a',)) is None:
+                return f"SPA 셸 마커(#{root_id})가 비어 있음"
+        nav_containers = [el for el in elements if dom.tag(el) in ('nav', 'header')]
+        if nav_containers and not any(self.find_first(container, ('a',)) is not None for container in nav_containers):
+            return "내비게이션 컨테이너에 링크가 없음"
+        link_count = sum(1 for el in elements if dom.tag(el) == 'a' and dom.attr(el, 'href') is not None)
+        if link_count < MIN_STATIC_LINKS:
+            return f"<a> 태그가 {link_count}개뿐임 (기준 {MIN_STATIC_LINKS}개)"
+        return None
+
+    def fetch_browser(self, url):
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        with self.driver_pool.lease() as driver:
+            with span('navigate', url=url):
+                driver.get(url)
+                WebDriverWait(driver, 15, poll_frequency=0.1).until(
+                    lambda d: d.execute_script("return document.readyState") == "complete"
+                )
+
+            # 페이지 스크롤 (동적 콘텐츠 로드 유도) 후 DOM/네트워크가 잠잠해질 때까지 대기
+            with span('scroll', url=url):
+                wait_for_settle(driver, scroll=True)
+
+            # 최종 페이지 소스 가져오기
+            html = driver.page_source
+            count('fetch_bytes_total', len(html.encode('utf-8', 'surrogatepass')), tier='browser')
+            return html
+
+    def to_ia(self):
+        return {attr: getattr(self, attr) for attr in SECTION_ATTRS}
+
+    def load_ia(self, ia):
+        for attr in SECTION_ATTRS:
+            setattr(self, attr, from_dicts(self.strings, ia.get(attr, [])))
+
+    def crawl(self, url, force=False):
+        with span('crawl', url=url):
+            result = self._crawl(url, force)
+        count('pages_total', tier=self.fetch_tier if result is True else 'error')
+        if result is not True:
+            count('crawl_errors_total')
+        return result
+
+    def _crawl(self, url, force=False):
+        self.base_url = url
+        try:
+            logger.info(f"크롤링 시작: {url}")
+            # 먼저 HTTP로 가져오고, JS 렌더링이 필요해 보일 때만 브라우저로 전환
+            soup = None
+            reason = None
+            page = None
+            with span('page_cache_lookup'):
+                cached = self.page_cache.get(url)
+            try:
+                with span('http_fetch', url=url):
+                    page = self.http_fetcher.fetch(url, cached=cached)
+                unchanged = page['not_modified'] or (cached is not None and content_hash(page['text']) == cached['content_hash'])
+                if unchanged and not force and ia_reusable(cached):
+                    # 문서가 그대로면 브라우저 렌더링과 파싱을 모두 건너뛰고 저장된 IA를 사용.
+                    # 브라우저 tier IA는 JS가 그린 메뉴라 HTML만으로는 변경을 알 수 없어 BROWSER_IA_TTL 안에서만 재사용
+                    self.page_cache.mark_validated(url)
+                    count('page_cache_hits_total')
+                    self.load_ia(cached['ia'])
+                    self.content_hash = cached['content_hash']
+                    self.fetch_tier = "cache"
+                    self.fetch_reason = f"{'304 Not Modified' if page['not_modified'] else '본문 해시 동일'} (이전 tier={cached['tier']})"
+                    logger.info(f"[tier={self.fetch_tier}] {url} - {self.fetch_reason}")
+                    return True
+                with span('parse', parser=self.parser.name):
+                    soup = self.parse(page['text'])
+                with span('tier_check'):
+                    reason = self.needs_browser(soup)
+            except Exception as e:
+                reason = f"HTTP 요청 실패: {str(e)}"
+
+            if reason is None:
+                self.fetch_tier = "http"
+            else:
+                try:
+                    with span('browser_fetch', url=url):
+                        html = self.fetch_browser(url)
+                    with span('parse', parser=self.parser.name):
+                        soup = self.parse(html)
+                    self.dom_nodes = sum(1 for _ in self.dom.iter(soup))
+                    self.fetch_tier = "browser"
+                except Exception as e:
+                    if soup is None:
+                        raise
+                    logger.warning(f"브라우저 크롤링 실패, HTTP 결과 사용: {str(e)}")
+                    self.fetch_tier = "http"
+                    reason = f"{reason} / 브라우저 실패: {str(e)}"
+            self.fetch_reason = reason or "정적 HTML로 충분"
+            logger.info(f"[tier={self.fetch_tier}] {url} - {self.fetch_reason}")
+
+            count('dom_nodes_total', self.dom_nodes)
+
+            # GNB 및 Top Menu 추출
+            with span('sections'):
+                sections = classify_sections(soup, self.dom)
+            with span('extract'):
+                self.gnb_links = self.extract_links(soup, sections['gnb'], "GNB", depth=1) if sections['gnb'] is not None else []
+                self.side_links = self.extract_links(soup, sections['side'], "Side Menu") if sections['side'] is not None else []
+                self.footer_links = self.extract_links(soup, sections['footer'], "Footer") if sections['footer'] is not None else []
+
+                all_links = self.extract_links(soup, section="Other")
+                seen_keys = set(url_key(link['url']) for link in iter_links(self.gnb_links + self.side_links + self.footer_links))
+                self.other_links = [link for link in all_links if url_key(link['url']) not in seen_keys]
+            for attr in SECTION_ATTRS:
+                count('links_total', sum(1 for _ in iter_links(getattr(self, attr))), section=attr)
+
+            if page is not None:
+                self.content_hash = content_hash(page['text'])
+                with span('page_cache_store'):
+                    self.page_cache.put(url, page['text'], page['headers'], self.fetch_tier, self.to_ia())
+
+            logger.info(f"크롤링 완료: {url}")
+            return True
+        except Exception as e:
+            logger.error(f"크롤링 중 오류 발생: {str(e)}")
+            return str(e)
+
+    def save_snapshot(self, store=None):
+        # 현재 IA를 새 버전으로 저장하고, 직전 버전 대비 메뉴 구조 변경과 본문이 바뀐 페이지를 반환
+        store = store or get_snapshot_store()
+        previous = store.get(self.base_url)
+        pages = self.pages or {
+            url_key(self.base_url): {'depth': 0, 'status': 'ok', 'tier': self.fetch_tier, 'hash': self.content_hash}
+        }
+        ia = self.to_ia()
+        version = store.save(self.base_url, ia, pages)
+        if previous is None:
+            return {'version': version, 'previous': None, 'changes': [], 'changed_pages': []}
+        return {
+            'version': version,
+            'previous': previous['version'],
+            'changes': diff_ia(previous['ia'], ia),
+            'changed_pages': changed_pages(previous['pages'], pages),
+        }
+
+    def crawl_site(self, url, max_depth=2, max_pages=100, concurrency=4, per_host_limit=2, per_host_delay=0.0, progress=None, cancel=None,
+                   respect_robots=True, sitemaps=False):
+        # 시드 페이지를 크롤링한 뒤 같은 호스트의 하위 페이지를 BFS로 수집해 하나의 IA 트리로 병합.
+        # respect_robots: robots.txt의 Disallow/Crawl-delay를 따름, sitemaps: 링크로 찾은 페이지가 모자라면 사이트맵 URL로 채움
+        result = self.crawl(url)
+        if result is not True:
+            return result
+        robots = RobotsPolicy(self.base_url, self.http_fetcher) if respect_robots else None
+        if robots is not None and robots.crawl_delay > per_host_delay:
+            logger.info(f"robots.txt Crawl-delay 적용: {robots.crawl_delay}s")
+            per_host_delay = robots.crawl_delay
+        engine = SiteCrawlEngine(
+            lambda: type(self)(driver_pool=self.driver_pool, http_fetcher=self.http_fetcher, parser=self.parser.name,
+                               screenshot_cache=self._screenshot_cache, page_cache=self.page_cache, strings=self.strings,
+                               screenshot_pool=self._screenshot_pool),
+            max_depth=max_depth,
+            max_pages=max_pages,
+            concurrency=concurrency,
+            per_host_limit=per_host_limit,
+            per_host_delay=per_host_delay,
+            progress=progress,
+            cancel=cancel,
+            robots=robots,
+            seeds=sitemap_seeds(self.base_url, self.http_fetcher, robots) if sitemaps else None,
+        )
+        try:
+            self.pages = engine.run(self)
+            return True
+        except Exception as e:
+            logger.error(f"사이트 크롤링 중 오류 발생: {str(e)}")
+            return str(e)
+
+    def export(self, fmt, fp=None):
+        # fp(파일/스트림)가 있으면 그대로 흘려 쓰고, 없으면 문자열(parquet는 bytes)로 반환
+        if fp is not None:
+            with span('export', fmt=fmt):
+                EXPORTERS[fmt](self.to_ia(), fp, self.base_url)
+            return fp
+        output = io.BytesIO() if fmt in BINARY_FORMATS else io.StringIO()
+        with span('export', fmt=fmt):
+            EXPORTERS[fmt](self.to_ia(), output, self.base_url)
+        return output.getvalue()
+
+    def generate_txt(self):
+        return self.export('txt')
+
+    def generate_csv(self):
+        return self.export('csv')
+
+    def generate_md(self):
+        return self.export('md')
+
+    def generate_jsonl(self):
+        return self.export('jsonl')
+
+    def generate_parquet(self):
+        return self.export('parquet')
+
+    def handle_popup(self, driver):
+        try:
+            # 선택자마다 대기하지 않고 페이지 안에서 한 번에 조회
+            result = dismiss_popups(driver)
+            if result.get('action') == 'clicked':
+                logger.info(f"팝업 닫기 버튼 클릭 성공 ({result.get('selector')})")
+            else:
+                logger.info(f"닫기 버튼을 찾지 못해 팝업 요소 숨김 처리 ({result.get('count', 0)}개)")
+            return True
+        except Exception as e:
+            logger.warning(f"팝업 처리 중 오류: {str(e)}")
+            return False
+
+    def render_screenshot(self, url, width):
+        # 브라우저로 캡처해 전체 이미지와 썸네일을 캐시에 저장하고 {variant: 바이트}를 돌려줌. 실패하면 예외를 그대로 올림
+        from selenium.webdriver.support.ui import WebDriverWait
+        from .screenshot_tiles import TILED, capture_full_page, make_thumbnail
+
+        with self.screenshot_pool.lease() as driver, span('screenshot', url=url, width=width):
+            logger.info(f"스크린샷 캡처 시작: {url} (width: {width})")
+            with span('navigate', url=url):
+                driver.set_window_size(width, 1080)
+                driver.get(url)
+
+                WebDriverWait(driver, 10, poll_frequency=0.1).until(
+                    lambda d: d.execute_script("return document.readyState") == "complete"
+                )
+
+            with span('popup'):
+                self.handle_popup(driver)
+
+            driver.execute_script("document.body.style.overflow = 'hidden';")
+
+            with span('scroll', url=url):
+                settle = wait_for_settle(driver, scroll=True)
+            last_height = settle.get('height') or driver.execute_script("return Math.max(document.body.scrollHeight, document.documentElement.scrollHeight);")
+
+            if TILED and hasattr(driver, 'execute_cdp_cmd'):
+                # 창 크기는 그대로 두고 뷰포트 크기 타일로 캡처해 WebP로 이어 붙임
+                with span('capture', url=url, width=width, tiled=True):
+                    full, thumb = capture_full_page(driver, width, last_height)
+            else:
+                # CDP를 쓸 수 없는 드라이버: 창을 전체 높이로 늘려 PNG 한 장으로 캡처
+                with span('settle', url=url):
+                    driver.set_window_size(width, last_height)
+                    wait_for_settle(driver, timeout=2)
+
+                with span('capture', url=url, width=width, tiled=False):
+                    full = driver.get_screenshot_as_png()
+                    thumb = make_thumbnail(full)
+            logger.info(f"스크린샷 캡처 완료: {url} ({len(full)} bytes, 썸네일 {len(thumb)} bytes)")
+
+            self.screenshot_cache.put(url, width, full, variant=FULL)
+            self.screenshot_cache.put(url, width, thumb, variant=THUMB)
+
+            return {FULL: full, THUMB: thumb}
+
+    def failure_image(self, url, width):
+        from PIL import Image, ImageDraw
+
+        img = Image.new('RGB', (width, 400), color = (240, 240, 240))
+        d = ImageDraw.Draw(img)
+        d.text((20, 20), f"스크린샷 캡처 실패: {url}", fill=(0, 0, 0))
+        d.text((20, 50), "Streamlit Cloud 환경에서 스크린샷 기능이 제한됩니다.", fill=(0, 0, 0))
+        img_bytes = io.BytesIO()
+        img.save(img_bytes, format='PNG')
+        png = img_bytes.getvalue()
+
+        # 일시적인 실패가 계속 캐시되지 않도록 짧은 TTL의 negative 항목으로 저장
+        for variant in (FULL, THUMB):
+            self.screenshot_cache.put(url, width, png, negative=True, variant=variant)
+        return png
+
+    def cached_screenshot(self, url, width, variant=THUMB):
+        cached = self.screenshot_cache.get(url, width, variant)
+        if cached is None and variant == THUMB:
+            # 썸네일 없이 전체 이미지만 있는 이전 캐시 항목: 전체 이미지에서 썸네일을 만들어 저장
+            full = self.screenshot_cache.get(url, width, FULL)
+            if full is not None:
+                from .screenshot_tiles import make_thumbnail
+                cached = make_thumbnail(full)
+                self.screenshot_cache.put(url, width, cached, variant=THUMB)
+        return cached
+
+    def capture_screenshot(self, url, width, variant=THUMB):
+        # 기본은 썸네일. 전체 이미지는 variant=FULL로 필요할 때만 요청
+        cached = self.cached_screenshot(url, width, variant)
+        if cached is not None:
+            logger.info(f"캐시에서 스크린샷 로드: {url} (width: {width}, {variant})")
+            count('screenshot_cache_hits_total')
+            return cached
+        count('screenshot_cache_misses_total')
+
+        try:
+            return self.render_screenshot(url, width)[variant]
+        except Exception as e:
+            logger.error(f"스크린샷 캡처 실패: {url} - {str(e)}")
+            count('screenshot_failures_total')
+            # 실패 시 대체 이미지 생성
+            return self.failure_image(url, width)
+
+    def iter_ia_urls(self):
+        urls = []
+        seen = set()
+        for link in iter_links(self.gnb_links + self.side_links + self.footer_links + self.other_links):
+            url = link['url']
+            if url not in seen and urlparse(url).scheme in ('http', 'https'):
+                seen.add(url)
+                urls.append(url)
+        return urls
+
+    def capture_all(self, urls=None, widths=SCREENSHOT_WIDTHS, concurrency=None):
+        # IA의 모든 URL을 PC/모바일 너비로 병렬 캡처하며, 끝나는 순서대로 진행 상황을 yield
+        urls = self.iter_ia_urls() if urls is None else urls
+        jobs = [(url, width) for url in urls for width in widths]
+        total = len(jobs)
+        done = 0
+        pending = []
+        for url, width in jobs:
+            if self.cached_screenshot(url, width) is not None:
+                count('screenshot_cache_hits_total')
+                done += 1
+                yield {'url': url, 'width': width, 'status': 'cached', 'done': done, 'total': total}
+            else:
+                count('screenshot_cache_misses_total')
+                pending.append((url, width))
+
+        def capture(job):
+            url, width = job
+            try:
+                self.render_screenshot(url, width)
+                return url, width, 'captured'
+            except Exception as e:
+                logger.error(f"스크린샷 캡처 실패: {url} - {str(e)}")
+                count('screenshot_failures_total')
+                self.failure_image(url, width)
+                return url, width, 'failed'
+
+        workers = concurrency or self.screenshot_pool.max_size
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = [executor.submit(capture, job) for job in pending]
+            try:
+                for future in as_completed(futures):
+                    url, width, status = future.result()
+                    done += 1
+                    yield {'url': url, 'width': width, 'status': status, 'done': done, 'total': total}
+            finally:
+                # 호출한 쪽이 중간에 반복을 멈추면(작업 취소 등) 아직 시작하지 않은 캡처는 버림
+                for future in futures:
+                    future.cancel()
@@ -0,0 +1,365 @@
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARSER = os.environ.get("IA_PARSER", "html.parser")
+
+# BeautifulSoup.get_text()가 건너뛰는 문자열 컨테이너 (Script, Stylesheet, TemplateString 등)
+SKIP_TEXT_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+
+# html.parser는 태그를 적힌 그대로 중첩하지만 lxml(libxml2)/lexbor는 각자의 규칙으로 암시적 종료 태그를 넣어 트리를 고침.
+#   <ul><li>A<li>B</ul>         html.parser: B가 A의 <li> 안(하위 메뉴)   lxml/lexbor: A와 B가 형제
+#   <a>A<a>A1</a></a>           html.parser: A1이 A 안(텍스트 'AA1')      lxml/lexbor: 두 링크가 형제(텍스트 'A')
+#   <p class="gnb"><ul>..</ul>  html.parser: 메뉴가 <p> 안                lxml/lexbor: <p>가 먼저 닫혀 메뉴가 형제
+# 이런 문서에서는 추출한 메뉴 계층과 링크 텍스트가 백엔드마다 달라지므로, 원문의 태그를 html.parser처럼 쌓아 가며
+# 빠른 백엔드가 트리를 고치는 지점이 하나라도 보이면 기존 결과와 같도록 html.parser로 파싱 (fallback_needed, SiteIACrawler.parse)
+_ATTRS = r'[^>"\']*(?:(?:"[^"]*"|\'[^\']*\')[^>"\']*)*'
+_MARKUP_RE = re.compile(
+    r'<!--.*?-->|<[!?][^>]*>'
+    r'|<(script|style)\b' + _ATTRS + r'>.*?</\1\s*>'
+    r'|<(iframe|noembed|noframes|textarea|title|xmp)\b' + _ATTRS + r'>(.*?)</\2\s*>'
+    r'|<(/?)([a-zA-Z][^\s/>]*)(' + _ATTRS + r')>',
+    re.I | re.S)
+_TAG_LIKE_RE = re.compile(r'<[a-zA-Z/!?]')
+VOID_TAGS = frozenset(['area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'meta', 'param', 'source', 'track', 'wbr'])
+LIST_TAGS = frozenset(['ul', 'ol', 'menu'])
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+# HTML5는 본문을 태그로 보지 않지만 html.parser(3.11)는 <script>/<style>만 그렇게 다루므로 본문에 태그가 있으면 결과가 다름
+RAW_TEXT_TAGS = frozenset(['iframe', 'noembed', 'noframes', 'plaintext', 'textarea', 'title', 'xmp'])
+DOCUMENT_TAGS = frozenset(['html', 'head', 'body'])
+HEAD_TAGS = frozenset(['base', 'link', 'meta', 'noscript', 'script', 'style', 'template', 'title', *DOCUMENT_TAGS])
+# 중간 요소를 닫는 종료 태그 뒤에 HTML5가 다시 열어 주는(또는 adoption agency로 옮기는) 서식 요소
+FORMATTING_TAGS = frozenset(['a', 'b', 'big', 'code', 'em', 'font', 'i', 'nobr', 's', 'small', 'strike', 'strong', 'tt', 'u'])
+# HTML5 'special' 요소. 일반 요소(span, label 등)의 종료 태그는 그 위에 열린 special 요소를 닫지 못하고 무시됨
+SPECIAL_TAGS = frozenset([
+    'address', 'applet', 'article', 'aside', 'blockquote', 'body', 'button', 'caption', 'center', 'colgroup', 'dd', 'details',
+    'dir', 'div', 'dl', 'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form', 'head', 'header', 'hgroup', 'html', 'iframe',
+    'li', 'listing', 'main', 'marquee', 'menu', 'nav', 'noembed', 'noframes', 'noscript', 'object', 'ol', 'p', 'plaintext',
+    'pre', 'script', 'search', 'section', 'select', 'style', 'summary', 'table', 'tbody', 'td', 'template', 'textarea', 'tfoot',
+    'th', 'thead', 'title', 'tr', 'ul', 'xmp', *HEADING_TAGS])
+# 이 요소 너머의 종료 태그는 HTML5 scope 밖이라 무시됨 (html.parser는 그대로 닫음)
+SCOPE_TAGS = frozenset(['applet', 'button', 'caption', 'html', 'marquee', 'math', 'object', 'ol', 'select', 'svg', 'table', 'td', 'template', 'th', 'ul'])
+# 열린 <p>를 먼저 닫는 시작 태그
+P_CLOSING_TAGS = frozenset([
+    'address', 'article', 'aside', 'blockquote', 'center', 'details', 'dialog', 'dir', 'div', 'dl', 'dd', 'dt', 'fieldset',
+    'figcaption', 'figure', 'footer', 'form', 'header', 'hgroup', 'hr', 'li', 'listing', 'main', 'menu', 'nav', 'ol', 'p',
+    'plaintext', 'pre', 'search', 'section', 'summary', 'table', 'ul', 'xmp', *HEADING_TAGS])
+# 이미 열려 있으면 HTML5가 앞의 것을 닫거나 새 태그를 무시하는 요소
+UNIQUE_TAGS = frozenset(['a', 'button', 'form', 'nobr', 'select'])
+# 테이블 요소는 정해진 부모 아래에서만 그대로 유지되고, 테이블 안의 다른 요소/텍스트는 테이블 밖으로 옮겨짐(foster parenting)
+TABLE_TAGS = frozenset(['table', 'tbody', 'thead', 'tfoot', 'tr'])
+TABLE_PARENTS = {
+    'caption': ('table',), 'colgroup': ('table',), 'tbody': ('table',), 'thead': ('table',), 'tfoot': ('table',),
+    'tr': ('table', 'tbody', 'thead', 'tfoot'), 'td': ('tr',), 'th': ('tr',), 'col': ('table', 'colgroup'),
+}
+# <svg>/<math> 안에서 이 태그가 나오면 HTML5는 외부 콘텐츠를 닫고 HTML로 돌아감
+FOREIGN_BREAKOUT_TAGS = frozenset([
+    'b', 'big', 'blockquote', 'body', 'br', 'center', 'code', 'dd', 'div', 'dl', 'dt', 'em', 'embed', 'font', 'head', 'hr', 'i',
+    'img', 'li', 'listing', 'menu', 'meta', 'nobr', 'ol', 'p', 'pre', 'ruby', 's', 'small', 'span', 'strike', 'strong', 'sub',
+    'sup', 'table', 'tt', 'u', 'ul', 'var', *HEADING_TAGS])
+# libxml2(lxml)는 HTML5와 별개로, 현재 노드가 아래 태그면 새 태그를 열기 전에 닫음 (htmlStartClose)
+_LIBXML2_BLOCKS = ('address', 'dir', 'listing', 'menu', 'pre')
+LIBXML2_AUTO_CLOSE = {
+    'address': ('ul',), 'menu': ('ul',), 'pre': ('ul',), 'center': ('b', 'font', 'i'),
+    'dd': ('dt', *_LIBXML2_BLOCKS), 'dl': ('dt', *_LIBXML2_BLOCKS), 'dt': ('dd', *_LIBXML2_BLOCKS), 'ul': _LIBXML2_BLOCKS,
+    'fieldset': ('a', 'legend', *_LIBXML2_BLOCKS, *HEADING_TAGS),
+    'form': ('dl', 'ol', 'ul', *_LIBXML2_BLOCKS, *HEADING_TAGS),
+    'li': ('dl', *_LIBXML2_BLOCKS, *HEADING_TAGS),
+    'p': ('b', 'big', 'i', 's', 'small', 'strike', 'tt', 'u', *HEADING_TAGS),
+    'table': ('a', *_LIBXML2_BLOCKS, *HEADING_TAGS), 'title': ('p',),
+}
+# libxml2는 <body> 아래 254단계보다 깊은 요소를 트리에 넣지 않음
+LIBXML2_MAX_DEPTH = 254
+# 열려 있는 동안에는 모든 시작 태그를 검사해야 하는 요소
+_GUARD_TAGS = frozenset(['p', 'select', 'svg', 'math', *TABLE_TAGS])
+_CHECKED_TAGS = frozenset([*P_CLOSING_TAGS, *TABLE_PARENTS, *LIBXML2_AUTO_CLOSE, *RAW_TEXT_TAGS, 'dd', 'dt', 'li', 'option', 'optgroup'])
+
+
+def _restructures(stack, open_tags, name, attrs):
+    # html.parser가 stack 위에 name을 그대로 여는 자리에서 lxml/lexbor가 다른 트리를 만드는지
+    top = stack[-1] if stack else None
+    if attrs.endswith('/') and name not in VOID_TAGS:
+        # <div/>: html.parser는 빈 요소로 닫지만 HTML5는 슬래시를 무시하고 연다 (외부 콘텐츠 안은 둘 다 닫음)
+        return not (open_tags.get('svg') or open_tags.get('math'))
+    if open_tags.get('svg') or open_tags.get('math'):
+        return name in FOREIGN_BREAKOUT_TAGS
+    if top in TABLE_TAGS:
+        return top not in TABLE_PARENTS.get(name, ()) and name != 'template'
+    if name in TABLE_PARENTS:
+        return top not in TABLE_PARENTS[name]
+    if open_tags.get('select'):
+        return name != 'option' or top == 'option'
+    if top in LIBXML2_AUTO_CLOSE.get(name, ()):
+        return True
+    if (name in P_CLOSING_TAGS and open_tags.get('p')) or (name in UNIQUE_TAGS and open_tags.get(name)):
+        return True
+    if name in HEADING_TAGS:
+        return top in HEADING_TAGS
+    if name in ('option', 'optgroup'):
+        return top == 'option'
+    if name == 'li':
+        return next((tag for tag in reversed(stack) if tag == 'li' or tag in LIST_TAGS), None) == 'li'
+    if name in ('dd', 'dt'):
+        return next((tag for tag in reversed(stack) if tag in ('dd', 'dt', 'dl')), None) in ('dd', 'dt')
+    return False
+
+
+def fallback_needed(html):
+    # 태그를 html.parser처럼 스택에 쌓으며(종료 태그는 가장 가까운 같은 태그까지 닫음) lxml/lexbor가 트리를 고칠 지점을 찾음.
+    # 주석/스크립트/스타일 본문은 건너뛰고, 텍스트는 테이블 바로 아래나 </body> 뒤처럼 위치가 바뀌는 경우만 확인
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', 'replace')
+    stack = []
+    open_tags = {}
+    guards = 0  # 열려 있는 _GUARD_TAGS 수
+    end = 0
+    body_started = body_ended = False
+    for match in _MARKUP_RE.finditer(html):
+        if not body_started or body_ended or (stack and stack[-1] in TABLE_TAGS):
+            if html[end:match.start()].strip():
+                if body_ended or (stack and stack[-1] in TABLE_TAGS):
+                    return True
+                body_started = True
+        end = match.end()
+        raw, closing, name, attrs = match.group(2, 4, 5, 6)
+        attrs = attrs.rstrip() if attrs else ''
+        if raw is not None:
+            if body_ended or _TAG_LIKE_RE.search(match.group(3)):
+                return True
+            name, closing = raw.lower(), ''
+        elif name is None:
+            if body_ended and match.group(1):
+                return True
+            continue
+        name = name.lower()
+        if body_ended and name not in ('body', 'html'):
+            return True
+        if raw is None and name in RAW_TEXT_TAGS:
+            # 닫히지 않은 <textarea> 등은 HTML5에서 문서 끝까지 텍스트가 됨
+            return True
+        if closing:
+            if name in ('body', 'html'):
+                # HTML5는 </body> 뒤의 내용도 <body>에 넣지만 html.parser는 문서 최상위에 둠
+                body_ended = True
+            elif open_tags.get(name):
+                index = len(stack) - 1 - stack[::-1].index(name)
+                if index < len(stack) - 1 and (name in FORMATTING_TAGS or any(
+                        tag in FORMATTING_TAGS or tag in SCOPE_TAGS or (tag in SPECIAL_TAGS and name not in SPECIAL_TAGS)
+                        for tag in stack[index + 1:])):
+                    return True
+                for tag in stack[index:]:
+                    open_tags[tag] -= 1
+                    guards -= tag in _GUARD_TAGS
+                del stack[index:]
+            continue
+        if name in DOCUMENT_TAGS:
+            # 두 번째 <body> 등은 HTML5가 기존 요소에 속성만 합침
+            if body_started or any(tag != 'html' for tag in stack):
+                return True
+        elif not body_started and name not in HEAD_TAGS:
+            body_started = True
+        if (guards or name in _CHECKED_TAGS or (name in UNIQUE_TAGS and open_tags.get(name)) or attrs.endswith('/')) \
+                and _restructures(stack, open_tags, name, attrs):
+            return True
+        if name not in VOID_TAGS and raw is None and not attrs.endswith('/'):
+            stack.append(name)
+            open_tags[name] = open_tags.get(name, 0) + 1
+            guards += name in _GUARD_TAGS
+            if len(stack) > LIBXML2_MAX_DEPTH:
+                return True
+    return bool((body_ended or (stack and stack[-1] in TABLE_TAGS)) and html[end:].strip())
+
+
+def _join(strings, strip):
+    # get_text(strip=True)와 같은 규칙: 문자열 조각마다 strip 후 빈 조각은 버리고 구분자 없이 연결
+    if strip:
+        return ''.join(s for s in (piece.strip() for piece in strings) if s)
+    return ''.join(strings)
+
+
+class SoupDom:
+    # 기존 BeautifulSoup(html.parser) 트리. 다른 백엔드를 쓸 수 없을 때의 기본값
+    name = 'html.parser'
+
+    def __init__(self):
+        from bs4 import BeautifulSoup, Tag
+        self._soup = BeautifulSoup
+        self._tag = Tag
+
+    def parse(self, html):
+        return self._soup(html, "html.parser")
+
+    def tag(self, node):
+        return node.name
+
+    def children(self, node):
+        tag = self._tag
+        return [child for child in node.contents if isinstance(child, tag)]
+
+    def iter(self, node):
+        for descendant in node.descendants:
+            if isinstance(descendant, self._tag):
+                yield descendant
+
+    def attr(self, node, name, default=None):
+        value = node.get(name, default)
+        if isinstance(value, list):
+            return ' '.join(value)
+        return value
+
+    def classes(self, node):
+        classes = node.get('class') or []
+        if isinstance(classes, str):
+            classes = classes.split()
+        return classes
+
+    def text(self, node, strip=False):
+        return node.get_text(strip=strip)
+
+
+class LxmlDom:
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        self._html = lxml.html
+        self._etree = etree
+
+    def parse(self, html):
+        try:
+            root = self._html.document_fromstring(html)
+        except ValueError:
+            # 인코딩 선언이 있는 유니코드 문자열은 바이트로 다시 파싱
+            root = self._html.document_fromstring(html.encode('utf-8'))
+        except self._etree.ParserError:
+            root = self._html.document_fromstring('<html></html>')
+        return root.getroottree()
+
+    def tag(self, node):
+        return node.tag
+
+    def children(self, node):
+        if isinstance(node, self._etree._ElementTree):
+            return [node.getroot()]
+        return [child for child in node if isinstance(child.tag, str)]
+
+    def iter(self, node):
+        if isinstance(node, self._etree._ElementTree):
+            elements = node.getroot().iter()
+        else:
+            elements = node.iter()
+            next(elements)
+        for element in elements:
+            if isinstance(element.tag, str):
+                yield element
+
+    def attr(self, node, name, default=None):
+        return node.get(name, default)
+
+    def classes(self, node):
+        return (node.get('class') or '').split()
+
+    def _strings(self, node, out):
+        if node.text:
+            out.append(node.text)
+        for child in node:
+            if isinstance(child.tag, str) and child.tag not in SKIP_TEXT_TAGS:
+                self._strings(child, out)
+            if child.tail:
+                out.append(child.tail)
+        return out
+
+    def text(self, node, strip=False):
+        if isinstance(node, self._etree._ElementTree):
+            node = node.getroot()
+        return _join(self._strings(node, []), strip)
+
+
+class SelectolaxDom:
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def parse(self, html):
+        return self._parser(html)
+
+    def _node(self, node):
+        return node.root if isinstance(node, self._parser) else node
+
+    def tag(self, node):
+        return node.tag
+
+    def children(self, node):
+        if isinstance(node, self._parser):
+            return [node.root] if node.root is not None else []
+        return [child for child in node.iter(include_text=False) if child.is_element_node]
+
+    def iter(self, node):
+        if isinstance(node, self._parser):
+            if node.root is None:
+                return
+            nodes = node.root.traverse(include_text=False)
+        else:
+            nodes = node.traverse(include_text=False)
+            next(nodes)
+        for element in nodes:
+            if element.is_element_node:
+                yield element
+
+    def attr(self, node, name, default=None):
+        attributes = node.attributes
+        if name not in attributes:
+            return default
+        # 값 없는 속성(<a href>)은 BeautifulSoup과 같이 빈 문자열로
+        value = attributes[name]
+        return '' if value is None else value
+
+    def classes(self, node):
+        return (node.attributes.get('class') or '').split()
+
+    def _strings(self, node, out):
+        for child in node.iter(include_text=True):
+            if child.is_text_node:
+                out.append(child.text_content or '')
+            elif child.is_element_node and child.tag not in SKIP_TEXT_TAGS:
+                self._strings(child, out)
+        return out
+
+    def text(self, node, strip=False):
+        node = self._node(node)
+        if node is None:
+            return ''
+        return _join(self._strings(node, []), strip)
+
+
+BACKENDS = {
+    'html.parser': SoupDom,
+    'lxml': LxmlDom,
+    'selectolax': SelectolaxDom,
+}
+
+_instances = {}
+
+
+def get_dom(name=None):
+    # 요청한 파서를 쓸 수 없으면(미설치 등) html.parser로 대체
+    name = name or DEFAULT_PARSER
+    dom = _instances.get(name)
+    if dom is not None:
+        return dom
+    try:
+        dom = BACKENDS[name]()
+    except KeyError:
+        logger.warning(f"알 수 없는 파서 '{name}', html.parser 사용")
+        return get_dom('html.parser')
+    except ImportError as e:
+        logger.warning(f"파서 '{name}'를 불러오지 못해 html.parser 사용: {str(e)}")
+        return get_dom('html.parser')
+    _instances[name] = dom
+    return dom
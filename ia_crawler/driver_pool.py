@@ -0,0 +1,204 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from .metrics import span, count
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = int(os.environ.get("IA_DRIVER_POOL_SIZE", "2"))
+DEFAULT_MAX_USES = int(os.environ.get("IA_DRIVER_MAX_USES", "50"))
+DEFAULT_ACQUIRE_TIMEOUT = 120
+DEFAULT_WINDOW_SIZE = (1920, 1080)
+
+
+class DriverPool:
+    # 미리 띄워 둔 Chromium 인스턴스를 작업 단위로 대여/반납하는 고정 크기 풀
+    def __init__(self, factory, max_size=DEFAULT_POOL_SIZE, max_uses=DEFAULT_MAX_USES,
+                 acquire_timeout=DEFAULT_ACQUIRE_TIMEOUT, window_size=DEFAULT_WINDOW_SIZE):
+        self.factory = factory
+        self.max_size = max(1, max_size)
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        self.window_size = window_size
+        self._cond = threading.Condition()
+        self._idle = []  # LIFO: 가장 최근에 반납된(가장 따뜻한) 드라이버부터 재사용
+        self._uses = {}  # id(driver) -> 누적 사용 횟수
+        self._size = 0
+        self._closed = False
+        self._stats = {
+            'leases': 0,
+            'waits': 0,
+            'wait_seconds': 0.0,
+            'cold_starts': 0,
+            'recycles': 0,
+            'crashes': 0,
+        }
+
+    def _create(self):
+        started = time.monotonic()
+        with span('driver_start'):
+            driver = self.factory()
+        count('driver_starts_total')
+        with self._cond:
+            self._uses[id(driver)] = 0
+            self._stats['cold_starts'] += 1
+        logger.info(f"드라이버 콜드 스타트: {time.monotonic() - started:.2f}s")
+        return driver
+
+    def _is_alive(self, driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, driver):
+        # 다음 작업에 이전 세션 상태(쿠키, 스토리지, 창 크기)가 새지 않도록 초기화
+        driver.execute_script("""
+            try { window.localStorage.clear(); } catch (e) {}
+            try { window.sessionStorage.clear(); } catch (e) {}
+        """)
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception:
+            driver.delete_all_cookies()
+        driver.get("about:blank")
+        driver.set_window_size(*self.window_size)
+
+    def _discard(self, driver, reason):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"드라이버 종료 중 오류: {str(e)}")
+        with self._cond:
+            self._uses.pop(id(driver), None)
+            self._size -= 1
+            self._stats['recycles'] += 1
+            if reason == 'crash':
+                self._stats['crashes'] += 1
+            self._cond.notify()
+        logger.info(f"드라이버 폐기 ({reason})")
+
+    def acquire(self):
+        deadline = time.monotonic() + self.acquire_timeout
+        wait_started = None
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("드라이버 풀이 이미 종료되었습니다")
+                if self._idle:
+                    driver = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                    driver = None
+                else:
+                    if wait_started is None:
+                        wait_started = time.monotonic()
+                        self._stats['waits'] += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"드라이버 대여 대기 시간 초과 ({self.acquire_timeout}s)")
+                    self._cond.wait(remaining)
+                    continue
+
+            if driver is None:
+                try:
+                    driver = self._create()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_alive(driver):
+                self._discard(driver, 'crash')
+                continue
+
+            with self._cond:
+                self._stats['leases'] += 1
+                if wait_started is not None:
+                    self._stats['wait_seconds'] += time.monotonic() - wait_started
+            return driver
+
+    def release(self, driver, failed=False):
+        with self._cond:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+            closed = self._closed
+
+        if closed:
+            self._discard(driver, 'shutdown')
+            return
+        if failed and not self._is_alive(driver):
+            self._discard(driver, 'crash')
+            return
+        if self.max_uses and uses >= self.max_uses:
+            self._discard(driver, f'max_uses={self.max_uses}')
+            return
+        try:
+            self._reset(driver)
+        except Exception as e:
+            logger.warning(f"드라이버 초기화 실패: {str(e)}")
+            self._discard(driver, 'reset_failed')
+            return
+
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self):
+        driver = self.acquire()
+        failed = True
+        try:
+            yield driver
+            failed = False
+        finally:
+            self.release(driver, failed=failed)
+
+    def metrics(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats['size'] = self._size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._size - len(self._idle)
+            stats['max_size'] = self.max_size
+        return stats
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver, 'shutdown')
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_driver_pool(factory, name='default', **kwargs):
+    # Streamlit 재실행 간에도 모듈 캐시에 남아 있는 풀을 재사용
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = DriverPool(factory, **kwargs)
+            _pools[name] = pool
+        return pool
+
+
+def pool_metrics():
+    with _pools_lock:
+        return {name: pool.metrics() for name, pool in _pools.items()}
+
+
+@atexit.register
+def shutdown_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
@@ -0,0 +1,132 @@
+import csv
+import importlib.util
+import json
+
+# (속성, 제목, 빈 섹션 라벨, CSV/JSON 섹션 이름)
+SECTIONS = [
+    ('gnb_links', '📌 GNB 메뉴', 'GNB', 'GNB'),
+    ('side_links', '📌 Side Menu', 'Side Menu', 'Side Menu'),
+    ('footer_links', '📌 Footer 메뉴', 'Footer', 'Footer'),
+    ('other_links', '📌 기타 링크', '기타', 'Other'),
+]
+PARQUET_BATCH_SIZE = 10000
+
+
+def iter_records(links, parent=None):
+    # 전위 순회로 (링크, 중첩 수준, 부모 URL)을 하나씩 만들어 냄. 트리 깊이에 상관없이 스택 하나로 처리
+    stack = [(link, 0, parent) for link in reversed(links)]
+    while stack:
+        link, level, parent_url = stack.pop()
+        yield link, level, parent_url
+        stack.extend((child, level + 1, link['url']) for child in reversed(link.get('children', [])))
+
+
+def write_txt(ia, fp, base_url=None):
+    fp.write(f"사이트 IA 구조도 ({base_url})\n")
+    fp.write("=" * 50 + "\n\n")
+    for i, (attr, title, label, _) in enumerate(SECTIONS):
+        fp.write(f"{title}\n")
+        empty = True
+        for link, level, _ in iter_records(ia.get(attr, [])):
+            empty = False
+            fp.write(f"{'│   ' * level}├── {link['text']} - {link['url']}\n")
+        if empty:
+            fp.write(f"├── {label} 데이터 없음\n")
+        if i < len(SECTIONS) - 1:
+            fp.write("\n")
+
+
+def write_csv(ia, fp, base_url=None):
+    fp.write('\ufeff')
+    writer = csv.writer(fp, lineterminator='\n')
+    writer.writerow(['섹션', '텍스트', 'URL', '뎁스'])
+    for attr, _, _, section in SECTIONS:
+        for link, _, _ in iter_records(ia.get(attr, [])):
+            writer.writerow([section, link['text'], link['url'], link['depth']])
+
+
+def write_md(ia, fp, base_url=None):
+    fp.write(f"# 사이트 IA 구조도 ({base_url})\n\n")
+    for i, (attr, title, label, _) in enumerate(SECTIONS):
+        fp.write(f"{'' if i == 0 else chr(10)}## {title}\n\n")
+        empty = True
+        for link, level, _ in iter_records(ia.get(attr, [])):
+            empty = False
+            fp.write(f"{'  ' * level}- [{link['text']}]({link['url']})\n")
+        if empty:
+            fp.write(f"{label} 데이터 없음\n" + ("\n" if i < len(SECTIONS) - 1 else ""))
+
+
+def write_jsonl(ia, fp, base_url=None):
+    for attr, _, _, section in SECTIONS:
+        for link, _, parent in iter_records(ia.get(attr, [])):
+            record = {'section': section, 'text': link['text'], 'url': link['url'], 'depth': link['depth'], 'parent': parent}
+            fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def write_parquet(ia, fp, base_url=None):
+    # 레코드를 PARQUET_BATCH_SIZE개씩 row group으로 내보내 메모리 사용량을 일정하게 유지
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ('section', pa.string()),
+        ('text', pa.string()),
+        ('url', pa.string()),
+        ('depth', pa.int32()),
+        ('parent', pa.string()),
+    ])
+    columns = {name: [] for name in schema.names}
+
+    def flush(writer):
+        writer.write_table(pa.table(columns, schema=schema))
+        for values in columns.values():
+            values.clear()
+
+    with pq.ParquetWriter(fp, schema, compression='zstd') as writer:
+        for attr, _, _, section in SECTIONS:
+            for link, _, parent in iter_records(ia.get(attr, [])):
+                columns['section'].append(section)
+                columns['text'].append(link['text'])
+                columns['url'].append(link['url'])
+                columns['depth'].append(link['depth'])
+                columns['parent'].append(parent)
+                if len(columns['url']) >= PARQUET_BATCH_SIZE:
+                    flush(writer)
+        if columns['url']:
+            flush(writer)
+
+
+EXPORTERS = {
+    'txt': write_txt,
+    'csv': write_csv,
+    'md': write_md,
+    'jsonl': write_jsonl,
+    'parquet': write_parquet,
+}
+BINARY_FORMATS = {'parquet'}
+# 형식별 선택 의존성 (import 이름, pip 패키지)
+FORMAT_REQUIREMENTS = {'parquet': ('pyarrow', 'pyarrow')}
+
+
+def check_format(fmt):
+    # 알 수 없는 형식이거나 필요한 패키지가 없으면 ValueError. CLI/API가 크롤링이나 내보내기 전에 확인
+    if fmt not in EXPORTERS:
+        raise ValueError(f"지원하지 않는 형식: {fmt} (가능: {', '.join(EXPORTERS)})")
+    requirement = FORMAT_REQUIREMENTS.get(fmt)
+    if requirement is not None and importlib.util.find_spec(requirement[0]) is None:
+        raise ValueError(f"{fmt} 형식으로 내보내려면 {requirement[1]} 패키지가 필요합니다: pip install {requirement[1]}")
+    return fmt
+
+
+def export(ia, fmt, path, base_url=None):
+    # 파일로 바로 스트리밍. ia는 gnb_links/side_links/footer_links/other_links 키를 가진 dict (SiteIACrawler.to_ia())
+    exporter = EXPORTERS[fmt]
+    if fmt in BINARY_FORMATS:
+        with open(path, 'wb') as fp:
+            exporter(ia, fp, base_url)
+    else:
+        with open(path, 'w', encoding='utf-8', newline='') as fp:
+            exporter(ia, fp, base_url)
+    return path
+
@@ -0,0 +1,368 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from .link_store import json_default
+from .site_crawl import url_key
+
+logger = logging.getLogger(__name__)
+
+FRONTIER_URL = os.environ.get("IA_FRONTIER", "sqlite:///ia_frontier.sqlite3")
+VISIBILITY_TIMEOUT = float(os.environ.get("IA_FRONTIER_VISIBILITY", "120"))  # 이 시간 안에 완료/연장하지 않은 임대는 다른 워커가 가져감
+MAX_ATTEMPTS = 3
+EXPIRED_ERROR = "임대 기한 초과 {attempts}회 (워커 중단 또는 응답 없음)"
+
+# Redis 프런티어의 상태 변경은 모두 Lua 스크립트 하나로 처리해, 워커가 중간에 죽거나 여러 워커가 동시에 실행해도
+# seen/queue/leases/items가 서로 어긋나지 않게 함 (예: seen에만 있고 queue에 없는 URL, queue에서 꺼냈지만 임대 기록이 없는 항목)
+
+# KEYS: info, seen, items, queue / ARGV: (key, url, depth)... -> 새로 추가한 개수. seen이 info의 max_pages에 차면 중단
+REDIS_ADD = """
+local max_pages = tonumber(redis.call('HGET', KEYS[1], 'max_pages'))
+local added = 0
+for i = 1, #ARGV, 3 do
+    if redis.call('SCARD', KEYS[2]) >= max_pages then break end
+    if redis.call('SADD', KEYS[2], ARGV[i]) == 1 then
+        local depth = tonumber(ARGV[i + 2])
+        local seq = redis.call('HINCRBY', KEYS[1], 'seq', 1)
+        redis.call('HSET', KEYS[3], ARGV[i], cjson.encode({url = ARGV[i + 1], depth = depth, seq = seq, attempts = 0}))
+        redis.call('ZADD', KEYS[4], depth * 1e9 + seq, ARGV[i])
+        added = added + 1
+    end
+end
+return added
+"""
+# 기한이 지난 임대를 되돌리거나(max_attempts번 임대한 항목은 실패로 확정) 한 뒤 queue 앞에서 n개 임대
+# KEYS: queue, leases, items, failed / ARGV: 현재 시각, 임대 기한, n, worker, max_attempts, 실패 메시지 -> 항목 JSON 목록
+REDIS_LEASE = """
+local now, max_attempts = tonumber(ARGV[1]), tonumber(ARGV[5])
+for _, key in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], 0, now)) do
+    redis.call('ZREM', KEYS[2], key)
+    local item = cjson.decode(redis.call('HGET', KEYS[3], key))
+    if item['attempts'] >= max_attempts then
+        redis.call('HSET', KEYS[4], key, (string.gsub(ARGV[6], '{attempts}', item['attempts'])))
+    else
+        redis.call('ZADD', KEYS[1], item['depth'] * 1e9 + item['seq'], key)
+    end
+end
+local leased = {}
+for i, key in ipairs(redis.call('ZRANGE', KEYS[1], 0, tonumber(ARGV[3]) - 1)) do
+    local item = cjson.decode(redis.call('HGET', KEYS[3], key))
+    item['attempts'] = item['attempts'] + 1
+    item['worker'] = ARGV[4]
+    item['key'] = key
+    local encoded = cjson.encode(item)
+    redis.call('ZREM', KEYS[1], key)
+    redis.call('HSET', KEYS[3], key, encoded)
+    redis.call('ZADD', KEYS[2], ARGV[2], key)
+    leased[i] = encoded
+end
+return leased
+"""
+# 임대한 워커만 연장/완료/실패 처리하도록 소유자 확인과 변경을 한 번에
+# KEYS: items, leases / ARGV: key, worker, 기한
+REDIS_EXTEND = """
+local item = redis.call('HGET', KEYS[1], ARGV[1])
+if not item or cjson.decode(item)['worker'] ~= ARGV[2] then return 0 end
+return redis.call('ZADD', KEYS[2], 'XX', 'CH', ARGV[3], ARGV[1])
+"""
+# KEYS: items, leases, results / ARGV: key, worker, 결과 JSON
+REDIS_COMPLETE = """
+local item = redis.call('HGET', KEYS[1], ARGV[1])
+if not item or cjson.decode(item)['worker'] ~= ARGV[2] or redis.call('ZREM', KEYS[2], ARGV[1]) == 0 then return 0 end
+return redis.call('HSET', KEYS[3], ARGV[1], ARGV[3])
+"""
+# KEYS: items, leases, queue, failed / ARGV: key, worker, max_attempts, 오류
+REDIS_FAIL = """
+local item = redis.call('HGET', KEYS[1], ARGV[1])
+if not item then return 0 end
+item = cjson.decode(item)
+if item['worker'] ~= ARGV[2] or redis.call('ZREM', KEYS[2], ARGV[1]) == 0 then return 0 end
+if item['attempts'] >= tonumber(ARGV[3]) then
+    redis.call('HSET', KEYS[4], ARGV[1], ARGV[4])
+else
+    redis.call('ZADD', KEYS[3], item['depth'] * 1e9 + item['seq'], ARGV[1])
+end
+return 1
+"""
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawls (
+    crawl TEXT PRIMARY KEY,
+    seed TEXT NOT NULL,
+    max_depth INTEGER NOT NULL,
+    max_pages INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS frontier (
+    crawl TEXT NOT NULL,
+    key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    lease_until REAL,
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    PRIMARY KEY (crawl, key)
+);
+CREATE INDEX IF NOT EXISTS frontier_state ON frontier (crawl, state, seq);
+CREATE TABLE IF NOT EXISTS hosts (
+    crawl TEXT NOT NULL,
+    host TEXT NOT NULL,
+    next_at REAL NOT NULL,
+    PRIMARY KEY (crawl, host)
+);
+"""
+
+
+class SQLiteFrontier:
+    # 공유 프런티어 + 중복 제거 집합. (crawl, url_key) 기본 키가 곧 dedup 집합 역할.
+    # 같은 호스트의 여러 프로세스, 또는 공유 파일시스템을 쓰는 노드들이 함께 사용
+    def __init__(self, path, visibility_timeout=VISIBILITY_TIMEOUT, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        self._conn().executescript(SQLITE_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, fn):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def create(self, seed, max_depth=2, max_pages=100):
+        crawl = uuid.uuid4().hex[:12]
+        self._conn().execute(
+            "INSERT INTO crawls (crawl, seed, max_depth, max_pages, created_at) VALUES (?, ?, ?, ?, ?)",
+            (crawl, seed, max_depth, max_pages, time.time()),
+        )
+        self.add(crawl, [(seed, 0)])
+        return crawl
+
+    def info(self, crawl):
+        row = self._conn().execute("SELECT seed, max_depth, max_pages FROM crawls WHERE crawl = ?", (crawl,)).fetchone()
+        if row is None:
+            return None
+        return {'crawl': crawl, 'seed': row[0], 'max_depth': row[1], 'max_pages': row[2]}
+
+    def add(self, crawl, items):
+        # items: (url, depth). 이미 본 URL과 max_pages를 넘는 URL은 버림. 새로 추가한 개수 반환
+        def insert(conn):
+            max_pages = conn.execute("SELECT max_pages FROM crawls WHERE crawl = ?", (crawl,)).fetchone()[0]
+            count, seq = conn.execute("SELECT COUNT(*), COALESCE(MAX(seq), 0) FROM frontier WHERE crawl = ?", (crawl,)).fetchone()
+            added = 0
+            for url, depth in items:
+                if count >= max_pages:
+                    break
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO frontier (crawl, key, seq, url, depth, state) VALUES (?, ?, ?, ?, ?, 'pending')",
+                    (crawl, url_key(url), seq + 1, url, depth),
+                )
+                if cursor.rowcount:
+                    count += 1
+                    seq += 1
+                    added += 1
+            return added
+        return self._transaction(insert)
+
+    def lease(self, crawl, worker, n=1):
+        # 대기 중이거나 임대 기한이 지난 항목을 BFS 순서(깊이, 발견 순)로 n개 임대.
+        # 기한이 지난 항목이 이미 max_attempts번 임대됐다면(워커를 죽이거나 멈추게 하는 페이지) 다시 내주지 않고 실패로 확정
+        def take(conn):
+            now = time.time()
+            for key, attempts in conn.execute(
+                "SELECT key, attempts FROM frontier WHERE crawl = ? AND state = 'leased' AND lease_until < ? AND attempts >= ?",
+                (crawl, now, self.max_attempts),
+            ).fetchall():
+                conn.execute(
+                    "UPDATE frontier SET state = 'failed', error = ?, lease_until = NULL WHERE crawl = ? AND key = ?",
+                    (EXPIRED_ERROR.format(attempts=attempts), crawl, key),
+                )
+            rows = conn.execute(
+                "SELECT key, url, depth, attempts FROM frontier WHERE crawl = ? AND "
+                "(state = 'pending' OR (state = 'leased' AND lease_until < ?)) ORDER BY depth, seq LIMIT ?",
+                (crawl, now, n),
+            ).fetchall()
+            for key, _, _, _ in rows:
+                conn.execute(
+                    "UPDATE frontier SET state = 'leased', lease_until = ?, worker = ?, attempts = attempts + 1 WHERE crawl = ? AND key = ?",
+                    (now + self.visibility_timeout, worker, crawl, key),
+                )
+            return [{'key': key, 'url': url, 'depth': depth, 'attempts': attempts + 1} for key, url, depth, attempts in rows]
+        return self._transaction(take)
+
+    def extend(self, crawl, key, worker):
+        self._conn().execute(
+            "UPDATE frontier SET lease_until = ? WHERE crawl = ? AND key = ? AND worker = ? AND state = 'leased'",
+            (time.time() + self.visibility_timeout, crawl, key, worker),
+        )
+
+    def complete(self, crawl, key, worker, result):
+        self._conn().execute(
+            "UPDATE frontier SET state = 'done', result = ?, lease_until = NULL WHERE crawl = ? AND key = ? AND worker = ? AND state = 'leased'",
+            (json.dumps(result, ensure_ascii=False, default=json_default), crawl, key, worker),
+        )
+
+    def fail(self, crawl, key, worker, error):
+        # max_attempts 전까지는 다시 대기열로, 그 뒤에는 실패로 확정
+        self._conn().execute(
+            "UPDATE frontier SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, error = ?, lease_until = NULL "
+            "WHERE crawl = ? AND key = ? AND worker = ? AND state = 'leased'",
+            (self.max_attempts, error, crawl, key, worker),
+        )
+
+    def wait_for_host(self, crawl, host, min_interval):
+        # 모든 워커가 공유하는 호스트별 다음 요청 가능 시각. 자기 차례를 예약한 뒤 그때까지 대기
+        def reserve(conn):
+            now = time.time()
+            row = conn.execute("SELECT next_at FROM hosts WHERE crawl = ? AND host = ?", (crawl, host)).fetchone()
+            start = max(row[0] if row else 0.0, now)
+            conn.execute("INSERT OR REPLACE INTO hosts (crawl, host, next_at) VALUES (?, ?, ?)", (crawl, host, start + min_interval))
+            return start - now
+        delay = self._transaction(reserve)
+        if delay > 0:
+            time.sleep(delay)
+
+    def stats(self, crawl):
+        rows = self._conn().execute("SELECT state, COUNT(*) FROM frontier WHERE crawl = ? GROUP BY state", (crawl,)).fetchall()
+        stats = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        stats.update(dict(rows))
+        return stats
+
+    def finished(self, crawl):
+        stats = self.stats(crawl)
+        return stats['pending'] == 0 and stats['leased'] == 0
+
+    def pages(self, crawl):
+        # 완료/실패 항목을 (깊이, 발견 순)으로
+        rows = self._conn().execute(
+            "SELECT url, depth, state, result, error FROM frontier WHERE crawl = ? AND state IN ('done', 'failed') ORDER BY depth, seq",
+            (crawl,),
+        ).fetchall()
+        for url, depth, state, result, error in rows:
+            yield {'url': url, 'depth': depth, 'state': state, 'result': json.loads(result) if result else None, 'error': error}
+
+
+class RedisFrontier:
+    # 같은 의미의 Redis 구현. 키: ia:<crawl>:{info,seen,queue,leases,items,results,failed}, ia:<crawl>:host:<호스트>
+    # queue는 (깊이, 발견 순) 점수의 sorted set, leases는 임대 기한 점수의 sorted set
+    def __init__(self, url, visibility_timeout=VISIBILITY_TIMEOUT, max_attempts=MAX_ATTEMPTS, client=None):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise ImportError("Redis 프런티어를 쓰려면 redis 패키지가 필요합니다: pip install redis")
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.redis = client
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self._add = client.register_script(REDIS_ADD)
+        self._lease = client.register_script(REDIS_LEASE)
+        self._extend = client.register_script(REDIS_EXTEND)
+        self._complete = client.register_script(REDIS_COMPLETE)
+        self._fail = client.register_script(REDIS_FAIL)
+
+    def _key(self, crawl, name):
+        return f"ia:{crawl}:{name}"
+
+    def create(self, seed, max_depth=2, max_pages=100):
+        crawl = uuid.uuid4().hex[:12]
+        self.redis.hset(self._key(crawl, 'info'), mapping={'seed': seed, 'max_depth': max_depth, 'max_pages': max_pages, 'created_at': time.time()})
+        self.add(crawl, [(seed, 0)])
+        return crawl
+
+    def info(self, crawl):
+        info = self.redis.hgetall(self._key(crawl, 'info'))
+        if not info:
+            return None
+        return {'crawl': crawl, 'seed': info['seed'], 'max_depth': int(info['max_depth']), 'max_pages': int(info['max_pages'])}
+
+    def add(self, crawl, items):
+        # seen 집합의 SADD가 1인 항목만 큐에 넣으므로 여러 워커가 같은 링크를 동시에 밀어 넣어도 한 번만 들어감
+        args = []
+        for url, depth in items:
+            args.extend((url_key(url), url, depth))
+        if not args:
+            return 0
+        return self._add(keys=[self._key(crawl, name) for name in ('info', 'seen', 'items', 'queue')], args=args)
+
+    def lease(self, crawl, worker, n=1):
+        leased = self._lease(
+            keys=[self._key(crawl, name) for name in ('queue', 'leases', 'items', 'failed')],
+            args=[time.time(), time.time() + self.visibility_timeout, n, worker, self.max_attempts, EXPIRED_ERROR],
+        )
+        return [{'key': item['key'], 'url': item['url'], 'depth': item['depth'], 'attempts': item['attempts']}
+                for item in map(json.loads, leased)]
+
+    def extend(self, crawl, key, worker):
+        # 아직 이 워커의 임대일 때만 연장. 기한이 지나 다른 워커가 가져간 항목은 건드리지 않음 (complete/fail도 같음)
+        self._extend(keys=[self._key(crawl, 'items'), self._key(crawl, 'leases')],
+                     args=[key, worker, time.time() + self.visibility_timeout])
+
+    def complete(self, crawl, key, worker, result):
+        self._complete(keys=[self._key(crawl, name) for name in ('items', 'leases', 'results')],
+                       args=[key, worker, json.dumps(result, ensure_ascii=False, default=json_default)])
+
+    def fail(self, crawl, key, worker, error):
+        self._fail(keys=[self._key(crawl, name) for name in ('items', 'leases', 'queue', 'failed')],
+                   args=[key, worker, self.max_attempts, error])
+
+    def wait_for_host(self, crawl, host, min_interval):
+        # 호스트 키를 SET NX PX로 잡은 워커만 요청. 키가 min_interval 뒤 만료될 때까지 다른 워커는 대기
+        key = self._key(crawl, f'host:{host}')
+        interval_ms = max(1, int(min_interval * 1000))
+        while not self.redis.set(key, 1, nx=True, px=interval_ms):
+            time.sleep(max(self.redis.pttl(key), 10) / 1000)
+
+    def stats(self, crawl):
+        pipe = self.redis.pipeline()
+        pipe.zcard(self._key(crawl, 'queue'))
+        pipe.zcard(self._key(crawl, 'leases'))
+        pipe.hlen(self._key(crawl, 'results'))
+        pipe.hlen(self._key(crawl, 'failed'))
+        pending, leased, done, failed = pipe.execute()
+        return {'pending': pending, 'leased': leased, 'done': done, 'failed': failed}
+
+    def finished(self, crawl):
+        stats = self.stats(crawl)
+        return stats['pending'] == 0 and stats['leased'] == 0
+
+    def pages(self, crawl):
+        items = {key: json.loads(value) for key, value in self.redis.hgetall(self._key(crawl, 'items')).items()}
+        results = self.redis.hgetall(self._key(crawl, 'results'))
+        failed = self.redis.hgetall(self._key(crawl, 'failed'))
+        for key, item in sorted(items.items(), key=lambda pair: (pair[1]['depth'], pair[1]['seq'])):
+            if key in results:
+                yield {'url': item['url'], 'depth': item['depth'], 'state': 'done', 'result': json.loads(results[key]), 'error': None}
+            elif key in failed:
+                yield {'url': item['url'], 'depth': item['depth'], 'state': 'failed', 'result': None, 'error': failed[key]}
+
+
+def get_frontier(url=FRONTIER_URL, **kw):
+    # sqlite:///경로 또는 redis://호스트:포트/DB
+    if url.startswith('redis://') or url.startswith('rediss://'):
+        return RedisFrontier(url, **kw)
+    if url.startswith('sqlite:///'):
+        url = url[len('sqlite:///'):]
+    return SQLiteFrontier(url, **kw)
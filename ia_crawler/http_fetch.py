@@ -0,0 +1,213 @@
+import asyncio
+import atexit
+import codecs
+import io
+import logging
+import re
+import threading
+
+from .metrics import count
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
+
+
+# 브라우저가 <meta charset>을 찾는 범위보다 조금 넉넉하게 문서 앞부분만 검사
+META_SNIFF_BYTES = 4096
+META_CHARSET_RE = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)', re.I)
+BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+# WHATWG Encoding 표준처럼 레거시 라벨은 상위 호환 인코딩으로 읽음 (euc-kr 문서의 확장 한글, latin-1 문서의 cp1252 문자)
+CHARSET_ALIASES = {
+    'euc-kr': 'cp949', 'euc_kr': 'cp949', 'ks_c_5601-1987': 'cp949', 'ksc5601': 'cp949', 'windows-949': 'cp949',
+    'iso-8859-1': 'cp1252', 'latin1': 'cp1252', 'us-ascii': 'cp1252', 'ascii': 'cp1252',
+    'gb2312': 'gb18030', 'gbk': 'gb18030',
+    'shift_jis': 'cp932', 'sjis': 'cp932',
+}
+
+
+def _codec(charset):
+    # 알 수 없는 라벨이면 None
+    if not charset:
+        return None
+    if isinstance(charset, bytes):
+        charset = charset.decode('ascii', 'ignore')
+    charset = charset.strip().strip('"\'').lower()
+    charset = CHARSET_ALIASES.get(charset, charset)
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        return None
+
+
+def decode_html(body, charset=None):
+    # 브라우저와 같은 순서로 인코딩 결정: BOM, Content-Type의 charset, 문서 앞부분의 <meta charset>/http-equiv, 내용 추정.
+    # aiohttp의 get_encoding()은 헤더에 charset이 없으면 UTF-8로 읽어 meta로만 선언한 EUC-KR 페이지가 깨짐
+    for bom, encoding in BOMS:
+        if body.startswith(bom):
+            return body.decode(encoding, errors='replace')
+    for candidate in (charset, *META_CHARSET_RE.findall(body[:META_SNIFF_BYTES])[:1]):
+        encoding = _codec(candidate)
+        if encoding is not None:
+            return body.decode(encoding, errors='replace')
+    try:
+        return body.decode('utf-8')
+    except UnicodeDecodeError:
+        from bs4 import UnicodeDammit
+        dammit = UnicodeDammit(body, ['cp949'])
+        if dammit.unicode_markup is not None:
+            return dammit.unicode_markup
+        return body.decode('utf-8', errors='replace')
+
+
+def accept_encoding():
+    try:
+        import brotli  # noqa: F401  aiohttp가 br 응답을 풀 수 있을 때만 광고
+        return 'gzip, deflate, br'
+    except ImportError:
+        return 'gzip, deflate'
+
+
+class AsyncHttpFetcher:
+    # 백그라운드 이벤트 루프 하나에서 keep-alive 커넥션 풀을 공유하는 HTTP 수집기
+    def __init__(self, limit=100, limit_per_host=8, timeout=15):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self._session = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='http-fetch', daemon=True)
+        self._thread.start()
+
+    async def _get_session(self):
+        if self._session is None:
+            import aiohttp  # 첫 요청 때 로드: 수집기를 만들기만 하는 CLI/워커의 시작 시간을 줄임
+
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={
+                    'User-Agent': USER_AGENT,
+                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                    'Accept-Encoding': accept_encoding(),
+                },
+            )
+        return self._session
+
+    def _conditional_headers(self, cached):
+        headers = {}
+        if cached is None or cached.get('text') is None:
+            return headers
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    async def fetch_async(self, url, cached=None):
+        # cached: 이전 응답(page_cache 항목). 검증자가 있으면 조건부 요청으로 보내고 304면 저장된 본문을 돌려줌
+        session = await self._get_session()
+        headers = self._conditional_headers(cached)
+        async with session.get(url, headers=headers) as response:
+            count('http_requests_total', status=response.status)
+            if response.status == 304 and headers:
+                return {
+                    'url': str(response.url),
+                    'status': 304,
+                    'headers': cached['headers'],
+                    'text': cached['text'],
+                    'not_modified': True,
+                }
+            response.raise_for_status()
+            body = await response.read()
+            count('fetch_bytes_total', len(body), tier='http')
+            text = decode_html(body, response.charset)
+            return {
+                'url': str(response.url),
+                'status': response.status,
+                'headers': dict(response.headers),
+                'text': text,
+                'not_modified': False,
+            }
+
+    def fetch(self, url, cached=None):
+        # 동기 코드(스레드 풀 워커 포함)에서 호출하는 진입점
+        future = asyncio.run_coroutine_threadsafe(self.fetch_async(url, cached), self._loop)
+        return future.result(self.timeout + 5)
+
+    def open_stream(self, url):
+        # 본문을 한 번에 읽지 않고 조금씩 읽는 파일 객체를 돌려줌 (사이트맵처럼 큰 응답을 스트리밍 파싱할 때 사용)
+        async def _open():
+            import aiohttp
+
+            session = await self._get_session()
+            # 전체 시간 제한 대신 읽기 간격으로만 제한해 큰 본문도 끝까지 받음
+            response = await session.get(url, timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout))
+            count('http_requests_total', status=response.status)
+            if response.status >= 400:
+                response.release()
+                response.raise_for_status()
+            return response
+        response = asyncio.run_coroutine_threadsafe(_open(), self._loop).result(self.timeout + 5)
+        return io.BufferedReader(HttpStream(self, response))
+
+    def close(self):
+        async def _close():
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+        if self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(_close(), self._loop).result(5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+
+
+class HttpStream(io.RawIOBase):
+    # 이벤트 루프의 aiohttp 응답 본문을 동기 코드에서 읽기 위한 어댑터
+    def __init__(self, fetcher, response):
+        self._fetcher = fetcher
+        self._response = response
+        self.url = str(response.url)
+        self.headers = dict(response.headers)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        future = asyncio.run_coroutine_threadsafe(self._response.content.read(len(buffer)), self._fetcher._loop)
+        data = future.result(self._fetcher.timeout + 5)
+        count('fetch_bytes_total', len(data), tier='http')
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._fetcher._loop.call_soon_threadsafe(self._response.release)
+        super().close()
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_http_fetcher():
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = AsyncHttpFetcher()
+        return _fetcher
+
+
+@atexit.register
+def close_http_fetcher():
+    global _fetcher
+    with _fetcher_lock:
+        fetcher, _fetcher = _fetcher, None
+    if fetcher is not None:
+        fetcher.close()
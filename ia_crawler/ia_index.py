@@ -0,0 +1,83 @@
+import threading
+
+from .exporters import SECTIONS
+
+SEARCH_CACHE_SIZE = 16
+
+
+class IaIndex:
+    # 결과 화면용 IA 행 인덱스. 트리를 한 번만 전위 순서의 평평한 행 배열로 펼쳐 두고,
+    # 화면에서는 펼친 행의 자식만 나열하거나 검색 결과만 골라 한 페이지씩 잘라 씀.
+    # 행 번호로 링크 하나를 가리키며, 한 섹션의 행은 spans[섹션]의 연속 구간에 있음
+    def __init__(self, ia):
+        self.rows = []       # (섹션 속성, 깊이, 텍스트, URL, 부모 행 번호 또는 None)
+        self.children = {}   # 부모 행 번호 -> 자식 행 번호 목록
+        self.roots = {}      # 섹션 속성 -> 최상위 행 번호 목록
+        self.spans = {}      # 섹션 속성 -> (시작 행, 끝 행)
+        self._haystack = []
+        self._searches = {}  # (섹션, 검색어) -> 행 목록. 오래 안 쓴 순서
+        self._searches_lock = threading.Lock()  # 캐시된 인덱스는 여러 세션(스레드)이 함께 씀
+        for attr, *_ in SECTIONS:
+            start = len(self.rows)
+            self.roots[attr] = self._add(attr, ia.get(attr, []))
+            self.spans[attr] = (start, len(self.rows))
+
+    def _add(self, attr, links):
+        roots = []
+        stack = [(link, 0, None) for link in reversed(links)]
+        while stack:
+            link, depth, parent = stack.pop()
+            row = len(self.rows)
+            self.rows.append((attr, depth, link['text'], link['url'], parent))
+            self._haystack.append(f"{link['text']}\n{link['url']}".casefold())
+            (roots if parent is None else self.children.setdefault(parent, [])).append(row)
+            stack.extend((child, depth + 1, row) for child in reversed(link.get('children', [])))
+        return roots
+
+    def size(self, attr):
+        start, end = self.spans[attr]
+        return end - start
+
+    def get(self, row):
+        attr, depth, text, url, parent = self.rows[row]
+        return {'section': attr, 'depth': depth, 'text': text, 'url': url, 'parent': parent,
+                'children': len(self.children.get(row, ()))}
+
+    def visible(self, attr, expanded=()):
+        # 최상위 행과 펼친 행의 자식만 화면 순서대로 나열. 접힌 하위 트리는 건너뜀
+        rows = []
+        stack = list(reversed(self.roots[attr]))
+        while stack:
+            row = stack.pop()
+            rows.append(row)
+            if row in expanded:
+                stack.extend(reversed(self.children.get(row, ())))
+        return rows
+
+    def ancestors(self, row):
+        # 최상위부터 바로 위 부모까지
+        path = []
+        parent = self.rows[row][4]
+        while parent is not None:
+            path.append(parent)
+            parent = self.rows[parent][4]
+        return path[::-1]
+
+    def search(self, attr, query):
+        # 텍스트/URL 부분 일치(대소문자 무시). 재실행마다 같은 검색어로 섹션 전체를 다시 훑지 않도록 최근 결과를 보관.
+        # 훑는 동안은 잠금을 잡지 않으므로 두 세션이 같은 검색어를 동시에 계산할 수는 있지만 결과는 같음
+        needle = query.casefold()
+        key = (attr, needle)
+        with self._searches_lock:
+            rows = self._searches.pop(key, None)
+            if rows is not None:
+                self._searches[key] = rows
+                return rows
+        start, end = self.spans[attr]
+        rows = [row for row in range(start, end) if needle in self._haystack[row]]
+        with self._searches_lock:
+            self._searches.pop(key, None)
+            while len(self._searches) >= SEARCH_CACHE_SIZE:
+                self._searches.pop(next(iter(self._searches)))
+            self._searches[key] = rows
+        return rows
@@ -0,0 +1,158 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from .link_store import json_default
+from .page_cache import normalize_cache_url
+from .site_crawl import SECTION_ATTRS
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = os.environ.get("IA_SNAPSHOTS", "ia_snapshots.sqlite3")
+# 사이트별 보관 한도. 0이면 제한 없음. 최신 버전은 항상 남김
+SNAPSHOT_KEEP = int(os.environ.get("IA_SNAPSHOT_KEEP", "50"))  # 최근 N개 버전
+SNAPSHOT_MAX_AGE = float(os.environ.get("IA_SNAPSHOT_MAX_AGE_DAYS", "0")) * 86400  # 이보다 오래된 버전
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    site TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    ia TEXT NOT NULL,
+    pages TEXT NOT NULL,
+    PRIMARY KEY (site, version)
+)
+"""
+
+
+class SnapshotStore:
+    # 사이트별 IA 트리(gnb/side/footer/other)와 페이지 해시를 버전으로 쌓아 두는 저장소
+    def __init__(self, path=SNAPSHOT_PATH, keep=SNAPSHOT_KEEP, max_age=SNAPSHOT_MAX_AGE):
+        self.path = path
+        self.keep = keep
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save(self, site, ia, pages=None):
+        site = normalize_cache_url(site)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            # 다른 프로세스가 같은 사이트를 동시에 저장해도 같은 버전 번호를 고르지 않도록 읽기 전에 쓰기 잠금
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT MAX(version) FROM snapshots WHERE site = ?", (site,)).fetchone()
+            version = (row[0] or 0) + 1
+            conn.execute(
+                "INSERT INTO snapshots (site, version, created_at, ia, pages) VALUES (?, ?, ?, ?, ?)",
+                (site, version, now, json.dumps(ia, ensure_ascii=False, default=json_default), json.dumps(pages or {}, ensure_ascii=False)),
+            )
+            if self.keep > 0:
+                conn.execute("DELETE FROM snapshots WHERE site = ? AND version <= ?", (site, version - self.keep))
+            if self.max_age > 0:
+                conn.execute("DELETE FROM snapshots WHERE site = ? AND version < ? AND created_at < ?", (site, version, now - self.max_age))
+        return version
+
+    def get(self, site, version=None):
+        # version이 없으면 최신 스냅샷
+        site = normalize_cache_url(site)
+        with self._connect() as conn:
+            if version is None:
+                row = conn.execute(
+                    "SELECT version, created_at, ia, pages FROM snapshots WHERE site = ? ORDER BY version DESC LIMIT 1", (site,)
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT version, created_at, ia, pages FROM snapshots WHERE site = ? AND version = ?", (site, version)
+                ).fetchone()
+        if row is None:
+            return None
+        return {'site': site, 'version': row[0], 'created_at': row[1], 'ia': json.loads(row[2]), 'pages': json.loads(row[3])}
+
+    def versions(self, site):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT version, created_at FROM snapshots WHERE site = ? ORDER BY version", (normalize_cache_url(site),)
+            ).fetchall()
+        return [{'version': version, 'created_at': created_at} for version, created_at in rows]
+
+
+def _index_ia(ia):
+    # url -> (섹션, 부모 url, 텍스트, 뎁스). 같은 URL이 여러 곳에 있으면 처음 나온 위치 기준
+    index = {}
+    for attr in SECTION_ATTRS:
+        stack = [(link, None) for link in reversed(ia.get(attr, []))]
+        while stack:
+            link, parent = stack.pop()
+            key = normalize_cache_url(link['url'])
+            if key not in index:
+                index[key] = {
+                    'section': link.get('section', attr),
+                    'parent': parent,
+                    'text': link['text'],
+                    'url': link['url'],
+                    'depth': link.get('depth'),
+                }
+            stack.extend((child, key) for child in reversed(link.get('children', [])))
+    return index
+
+
+def diff_ia(old_ia, new_ia):
+    # 메뉴 항목은 URL로 식별: 새로 생김(added), 사라짐(removed), 섹션/부모 변경(moved), 텍스트 변경(renamed)
+    old, new = _index_ia(old_ia), _index_ia(new_ia)
+    changes = []
+    for key, item in new.items():
+        before = old.get(key)
+        if before is None:
+            changes.append({'type': 'added', 'url': item['url'], 'text': item['text'], 'section': item['section'], 'parent': item['parent']})
+            continue
+        if (before['section'], before['parent']) != (item['section'], item['parent']):
+            changes.append({
+                'type': 'moved',
+                'url': item['url'],
+                'text': item['text'],
+                'section': item['section'],
+                'parent': item['parent'],
+                'old_section': before['section'],
+                'old_parent': before['parent'],
+            })
+        if before['text'] != item['text']:
+            changes.append({'type': 'renamed', 'url': item['url'], 'text': item['text'], 'old_text': before['text'], 'section': item['section']})
+    for key, item in old.items():
+        if key not in new:
+            changes.append({'type': 'removed', 'url': item['url'], 'text': item['text'], 'section': item['section'], 'parent': item['parent']})
+    return changes
+
+
+def changed_pages(old_pages, new_pages):
+    # 두 스냅샷 사이에 본문 해시가 달라진 페이지
+    return [
+        url for url, page in new_pages.items()
+        if url in old_pages and page.get('hash') and old_pages[url].get('hash') != page.get('hash')
+    ]
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_snapshot_store(path=SNAPSHOT_PATH):
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = SnapshotStore(path)
+            _stores[path] = store
+        return store
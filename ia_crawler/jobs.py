@@ -0,0 +1,369 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .crawler import SiteIACrawler, SCREENSHOT_WIDTHS
+from .link_store import json_default
+from .page_cache import normalize_cache_url
+
+logger = logging.getLogger(__name__)
+
+JOBS_PATH = os.environ.get("IA_JOBS", "ia_jobs.sqlite3")
+JOB_WORKERS = int(os.environ.get("IA_JOB_WORKERS", "2"))
+RESULT_TTL = float(os.environ.get("IA_JOB_RESULT_TTL", "600"))  # 같은 요청이면 이 시간(초) 안에 끝난 결과를 재사용
+PROGRESS_INTERVAL = 0.5
+HEARTBEAT_INTERVAL = 10.0  # 실행 중인 프로세스가 자기 작업의 updated_at을 갱신하는 주기
+STALE_AFTER = float(os.environ.get("IA_JOB_STALE_AFTER", "60"))  # 이 시간 동안 갱신이 없는 queued/running 작업은 주인이 없는 것으로 봄
+STALE_ERROR = '작업을 실행하던 프로세스가 응답하지 않음'
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    dedupe_key TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    owner INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, status);
+"""
+
+COLUMNS = ['id', 'kind', 'dedupe_key', 'params', 'status', 'progress', 'message', 'result', 'error',
+           'cancel_requested', 'owner', 'created_at', 'started_at', 'finished_at', 'updated_at']
+
+
+def _columns(result=True):
+    # result=False면 결과 JSON을 읽지 않음 (상태 확인/목록처럼 큰 결과가 필요 없는 조회용)
+    return ', '.join(COLUMNS if result else ['NULL' if column == 'result' else column for column in COLUMNS])
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def dedupe_key(kind, params):
+    # 같은 종류 + 같은 파라미터(URL은 정규화)면 같은 작업
+    params = dict(params)
+    if params.get('url'):
+        params['url'] = normalize_cache_url(params['url'])
+    return f"{kind}:{json.dumps(params, sort_keys=True, ensure_ascii=False)}"
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    # 작업 상태/진행률/결과를 SQLite에 보관. 세션이나 프로세스가 바뀌어도 job id로 조회 가능
+    def __init__(self, path=JOBS_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _row(self, row):
+        if row is None:
+            return None
+        job = dict(zip(COLUMNS, row))
+        job['params'] = json.loads(job['params'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        return job
+
+    def get(self, job_id, result=True):
+        row = self._conn().execute(f"SELECT {_columns(result)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row(row)
+
+    def create_or_reuse(self, kind, params, key, result_ttl=RESULT_TTL, refresh=False):
+        # 진행 중이거나 result_ttl 안에 끝난 같은 작업이 있으면 그 id를 돌려줌. (id, 새로 만들었는지)
+        # refresh면 끝난 결과는 재사용하지 않고 진행 중인 작업만 공유.
+        # STALE_AFTER 동안 heartbeat가 없는 진행 중 작업은 (다른 호스트에서 죽은 프로세스 등) 실패로 바꾸고 새로 만듦
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, updated_at = ? "
+                "WHERE dedupe_key = ? AND status IN ('queued', 'running') AND updated_at < ?",
+                (STALE_ERROR, now, now, key, now - STALE_AFTER),
+            )
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE dedupe_key = ? AND (status IN ('queued', 'running') "
+                "OR (status = 'done' AND finished_at >= ?)) ORDER BY created_at DESC LIMIT 1",
+                (key, float('inf') if refresh else now - result_ttl),
+            ).fetchone()
+            if row is not None:
+                conn.execute("COMMIT")
+                return row[0], False
+            job_id = uuid.uuid4().hex[:12]
+            conn.execute(
+                "INSERT INTO jobs (id, kind, dedupe_key, params, status, owner, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, key, json.dumps(params, ensure_ascii=False), os.getpid(), now, now),
+            )
+            conn.execute("COMMIT")
+            return job_id, True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def update(self, job_id, **fields):
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'], ensure_ascii=False, default=json_default)
+        fields['updated_at'] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self._conn().execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def request_cancel(self, job_id):
+        self._conn().execute(
+            "UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+            (time.time(), job_id),
+        )
+
+    def heartbeat(self, owner=None):
+        # 이 프로세스가 맡은 진행 중 작업이 살아 있음을 기록 (create_or_reuse/fail_orphans의 stale 판정 기준)
+        self._conn().execute(
+            "UPDATE jobs SET updated_at = ? WHERE owner = ? AND status IN ('queued', 'running')",
+            (time.time(), owner or os.getpid()),
+        )
+
+    def cancel_requested(self, job_id):
+        row = self._conn().execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def recent(self, limit=20, result=True):
+        rows = self._conn().execute(
+            f"SELECT {_columns(result)} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def fail_orphans(self):
+        # 실행하던 프로세스가 죽어 영원히 queued/running으로 남은 작업 정리.
+        # PID는 이 호스트에서만 의미가 있으므로 heartbeat가 끊긴 작업도 함께 정리
+        stale = time.time() - STALE_AFTER
+        rows = self._conn().execute("SELECT id, owner, updated_at FROM jobs WHERE status IN ('queued', 'running')").fetchall()
+        orphans = []
+        for job_id, owner, updated_at in rows:
+            if owner == os.getpid():
+                continue
+            if not _pid_alive(owner or 0):
+                orphans.append((job_id, '작업을 실행하던 프로세스가 종료됨'))
+            elif (updated_at or 0) < stale:
+                orphans.append((job_id, STALE_ERROR))
+        for job_id, error in orphans:
+            self.update(job_id, status='failed', error=error, finished_at=time.time())
+        return len(orphans)
+
+
+class JobContext:
+    # 작업 함수에 넘겨주는 진행률 보고/취소 확인 창구
+    def __init__(self, store, job_id, cancel_event):
+        self.store = store
+        self.job_id = job_id
+        self.cancel_event = cancel_event
+        self._last_report = 0.0
+
+    def progress(self, fraction, message=None, force=False):
+        # DB 쓰기를 줄이기 위해 PROGRESS_INTERVAL마다 한 번만 기록. 다른 프로세스에서 온 취소 요청도 이때 확인
+        now = time.monotonic()
+        if not force and now - self._last_report < PROGRESS_INTERVAL:
+            return
+        self._last_report = now
+        self.store.update(self.job_id, progress=max(0.0, min(float(fraction), 1.0)), message=message)
+        if self.store.cancel_requested(self.job_id):
+            self.cancel_event.set()
+
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check(self):
+        if self.cancelled():
+            raise JobCancelled()
+
+
+class JobQueue:
+    # 백그라운드 스레드 풀에서 작업을 실행. handlers: 작업 종류 -> fn(ctx, **params), 반환값은 JSON으로 저장
+    def __init__(self, handlers, store=None, workers=JOB_WORKERS, result_ttl=RESULT_TTL):
+        self.handlers = handlers
+        self.store = store or JobStore()
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='ia-job')
+        self._events = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        cleaned = self.store.fail_orphans()
+        if cleaned:
+            logger.info(f"중단된 작업 {cleaned}개를 실패로 표시")
+        threading.Thread(target=self._heartbeat, name='ia-job-heartbeat', daemon=True).start()
+
+    def _heartbeat(self):
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                self.store.heartbeat()
+            except Exception as e:
+                logger.warning(f"작업 heartbeat 기록 실패: {str(e)}")
+
+    def submit(self, kind, refresh=False, **params):
+        # refresh=True면 RESULT_TTL 안의 기존 결과를 쓰지 않고 다시 실행
+        if kind not in self.handlers:
+            raise ValueError(f"알 수 없는 작업 종류: {kind}")
+        with self._lock:
+            job_id, created = self.store.create_or_reuse(kind, params, dedupe_key(kind, params), self.result_ttl, refresh)
+            if created:
+                self._events[job_id] = threading.Event()
+                self._executor.submit(self._run, job_id)
+                logger.info(f"작업 등록: {job_id} {kind} {params.get('url', '')}")
+            else:
+                logger.info(f"기존 작업 재사용: {job_id} {kind} {params.get('url', '')}")
+        return job_id
+
+    def _run(self, job_id):
+        job = self.store.get(job_id)
+        event = self._events[job_id]
+        if job['cancel_requested'] or event.is_set():
+            self.store.update(job_id, status='cancelled', finished_at=time.time())
+            return
+        self.store.update(job_id, status='running', started_at=time.time())
+        ctx = JobContext(self.store, job_id, event)
+        try:
+            result = self.handlers[job['kind']](ctx, **job['params'])
+            ctx.check()
+            self.store.update(job_id, status='done', progress=1.0, result=result, finished_at=time.time())
+            logger.info(f"작업 완료: {job_id}")
+        except JobCancelled:
+            self.store.update(job_id, status='cancelled', finished_at=time.time())
+            logger.info(f"작업 취소됨: {job_id}")
+        except Exception as e:
+            logger.error(f"작업 실패: {job_id} - {str(e)}")
+            self.store.update(job_id, status='failed', error=str(e), finished_at=time.time())
+        finally:
+            with self._lock:
+                self._events.pop(job_id, None)
+
+    def get(self, job_id, result=True):
+        return self.store.get(job_id, result)
+
+    def cancel(self, job_id):
+        self.store.request_cancel(job_id)
+        with self._lock:
+            event = self._events.get(job_id)
+        if event is not None:
+            event.set()
+
+    def recent(self, limit=20, result=True):
+        return self.store.recent(limit, result)
+
+    def shutdown(self):
+        self._stop.set()
+        with self._lock:
+            for event in self._events.values():
+                event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 작업 파라미터 허용 범위. UI 입력(app.py)과 API 검증(api.py)이 같이 사용
+PARAM_BOUNDS = {
+    'max_depth': (1, 10),
+    'max_pages': (1, 10000),
+    'concurrency': (1, 32),
+    'widths': (320, 3840),
+}
+
+
+def run_crawl_job(ctx, url, site=False, max_depth=2, max_pages=100, concurrency=4, screenshots=False, sitemaps=False):
+    # 크롤링(+선택적으로 스크린샷 일괄 캡처, 스냅샷 저장)을 수행하고 화면을 다시 그리는 데 필요한 결과를 반환
+    crawler = SiteIACrawler()
+    crawl_share = 0.7 if screenshots else 1.0
+    ctx.progress(0.0, "크롤링 중...", force=True)
+    if site:
+        result = crawler.crawl_site(
+            url,
+            max_depth=max_depth,
+            max_pages=max_pages,
+            concurrency=concurrency,
+            progress=lambda done, total, page_url: ctx.progress(min(done / total, 1.0) * crawl_share, f"크롤링 {done}/{total} - {page_url}"),
+            cancel=ctx.cancel_event,
+            sitemaps=sitemaps,
+        )
+    else:
+        result = crawler.crawl(url)
+    ctx.check()
+    if result is not True:
+        raise RuntimeError(result)
+
+    counts = None
+    if screenshots:
+        counts = {'cached': 0, 'captured': 0, 'failed': 0}
+        for item in crawler.capture_all():
+            counts[item['status']] += 1
+            ctx.progress(crawl_share + (1 - crawl_share) * item['done'] / item['total'],
+                         f"스크린샷 {item['done']}/{item['total']} - {item['url']} ({item['width']}px)")
+            ctx.check()
+
+    snapshot = crawler.save_snapshot()
+    return {
+        'base_url': crawler.base_url,
+        'ia': crawler.to_ia(),
+        'pages': crawler.pages,
+        'fetch_tier': crawler.fetch_tier,
+        'screenshots': counts,
+        'snapshot': snapshot,
+    }
+
+
+def run_screenshot_job(ctx, urls, widths=None):
+    crawler = SiteIACrawler()
+    counts = {'cached': 0, 'captured': 0, 'failed': 0}
+    for item in crawler.capture_all(urls, widths=tuple(widths or SCREENSHOT_WIDTHS)):
+        counts[item['status']] += 1
+        ctx.progress(item['done'] / item['total'], f"스크린샷 {item['done']}/{item['total']} - {item['url']} ({item['width']}px)")
+        ctx.check()
+    return counts
+
+
+JOB_HANDLERS = {
+    'crawl': run_crawl_job,
+    'screenshots': run_screenshot_job,
+}
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    # Streamlit 재실행/세션 사이에서 공유되는 프로세스 단위 큐
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue(JOB_HANDLERS)
+        return _queue
@@ -0,0 +1,159 @@
+import threading
+from enum import Enum
+
+
+class Section(str, Enum):
+    # str을 상속해 기존 문자열 비교("GNB" == link['section'])와 JSON 직렬화가 그대로 동작
+    GNB = "GNB"
+    SIDE = "Side Menu"
+    FOOTER = "Footer"
+    OTHER = "Other"
+
+
+class StringTable:
+    # 문자열 <-> 정수 ID. 같은 URL/텍스트는 테이블에 한 번만 저장하고 노드는 ID만 가짐
+    def __init__(self):
+        self._ids = {}
+        self._strings = []
+        self._lock = threading.Lock()
+
+    def intern(self, value):
+        string_id = self._ids.get(value)
+        if string_id is None:
+            with self._lock:
+                string_id = self._ids.get(value)
+                if string_id is None:
+                    string_id = len(self._strings)
+                    self._strings.append(value)
+                    self._ids[value] = string_id
+        return string_id
+
+    def lookup(self, value):
+        # 추가하지 않고 ID만 조회 (없으면 None)
+        return self._ids.get(value)
+
+    def __getitem__(self, string_id):
+        return self._strings[string_id]
+
+    def __len__(self):
+        return len(self._strings)
+
+
+class LinkNode:
+    # IA 트리의 링크 하나. dict 대신 slot만 쓰고, URL/텍스트는 StringTable ID로, 섹션은 Section으로 저장.
+    # children은 자식이 생길 때만 리스트를 만듦. 기존 코드가 쓰던 link['url'], link.get('children', []),
+    # setdefault('children', []) 같은 dict 방식 접근을 그대로 지원
+    __slots__ = ('table', 'url_id', 'text_id', 'section', 'depth', 'children')
+
+    KEYS = ('text', 'url', 'section', 'depth', 'children')
+
+    def __init__(self, table, text, url, section, depth, children=None):
+        self.table = table
+        self.text_id = table.intern(text)
+        self.url_id = table.intern(url)
+        self.section = Section(section)
+        self.depth = depth
+        self.children = children or None
+
+    @property
+    def url(self):
+        return self.table[self.url_id]
+
+    @property
+    def text(self):
+        return self.table[self.text_id]
+
+    def __getitem__(self, key):
+        if key == 'url':
+            return self.table[self.url_id]
+        if key == 'text':
+            return self.table[self.text_id]
+        if key == 'section':
+            return self.section
+        if key == 'depth':
+            return self.depth
+        if key == 'children':
+            if self.children is None:
+                self.children = []
+            return self.children
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'url':
+            self.url_id = self.table.intern(value)
+        elif key == 'text':
+            self.text_id = self.table.intern(value)
+        elif key == 'section':
+            self.section = Section(value)
+        elif key == 'depth':
+            self.depth = value
+        elif key == 'children':
+            self.children = value
+        else:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key == 'children':
+            return self.children if self.children is not None else default
+        if key in self.KEYS:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key == 'children' and self.children is None:
+            self.children = default
+        return self[key]
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def keys(self):
+        return self.KEYS
+
+    def items(self):
+        return [(key, self[key]) for key in self.KEYS]
+
+    def to_dict(self):
+        return {
+            'text': self.table[self.text_id],
+            'url': self.table[self.url_id],
+            'section': self.section.value,
+            'depth': self.depth,
+            'children': [child.to_dict() for child in self.children or ()],
+        }
+
+    def __eq__(self, other):
+        if isinstance(other, (LinkNode, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, LinkNode) else other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"LinkNode({self.text!r}, {self.url!r}, {self.section.value!r}, depth={self.depth})"
+
+
+def from_dicts(table, links):
+    # JSON(페이지 캐시/스냅샷/작업 결과)에서 읽은 dict 트리를 LinkNode 트리로 변환. 이미 노드면 그대로 둠
+    result = []
+    stack = [(link, result) for link in reversed(links)]
+    while stack:
+        link, siblings = stack.pop()
+        if isinstance(link, LinkNode):
+            siblings.append(link)
+            continue
+        node = LinkNode(table, link['text'], link['url'], link.get('section', Section.OTHER), link.get('depth', 1))
+        siblings.append(node)
+        children = link.get('children') or ()
+        if children:
+            node.children = []
+            # 형제 순서를 유지하도록 역순으로 push
+            stack.extend((child, node.children) for child in reversed(children))
+    return result
+
+
+def json_default(obj):
+    # json.dumps(..., default=json_default)로 LinkNode가 섞인 IA를 직렬화
+    if isinstance(obj, LinkNode):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
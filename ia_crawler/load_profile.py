@@ -0,0 +1,98 @@
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+CRAWL = "crawl"  # 링크 추출용: DOM만 있으면 되므로 이미지/폰트/미디어/트래커를 받지 않음
+SCREENSHOT = "screenshot"  # 스크린샷용: 보이는 그대로 렌더링해야 하므로 아무것도 막지 않음
+
+# 리소스 종류별 확장자. setBlockedURLs의 *는 URL 어디와도 매칭되므로 패턴은 경로 끝의 확장자에만 고정함
+# (*.gif, *.gif?*). '*.gif*'처럼 쓰면 m.gift..., movie, app.icons.js 같은 문서/스크립트/XHR까지 막힘
+RESOURCE_EXTENSIONS = {
+    'image': ('png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp'),
+    'font': ('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'media': ('mp4', 'webm', 'mov', 'm3u8', 'mp3', 'ogg', 'wav'),
+    'stylesheet': ('css',),
+}
+
+
+def _extension_patterns(extensions):
+    # 쿼리스트링 없는 URL과 있는 URL을 각각 매칭
+    return tuple(pattern for ext in extensions for pattern in (f'*.{ext}', f'*.{ext}?*'))
+
+
+RESOURCE_PATTERNS = {kind: _extension_patterns(extensions) for kind, extensions in RESOURCE_EXTENSIONS.items()}
+
+DEFAULT_BLOCKED_TYPES = ('image', 'font', 'media')
+
+# 광고/분석 스크립트 도메인 (하위 도메인 포함)
+DEFAULT_BLOCKED_DOMAINS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'doubleclick.net',
+    'adservice.google.com',
+    'connect.facebook.net',
+    'analytics.tiktok.com',
+    'hotjar.com',
+    'clarity.ms',
+    'criteo.com',
+    'criteo.net',
+    'scorecardresearch.com',
+    'amplitude.com',
+    'mixpanel.com',
+    'segment.io',
+    'wcs.naver.net',
+    'acecounter.com',
+    'adfit.kakao.com',
+)
+
+
+def _env_list(name, default):
+    # 설정하지 않으면 기본값, 빈 문자열이면 차단 안 함, "+a,b"처럼 +로 시작하면 기본값에 추가
+    value = os.environ.get(name)
+    if value is None:
+        return tuple(default)
+    items = tuple(item.strip().lower() for item in value.lstrip('+').split(',') if item.strip())
+    return tuple(default) + items if value.startswith('+') else items
+
+
+BLOCKED_TYPES = _env_list("IA_CRAWL_BLOCK_TYPES", DEFAULT_BLOCKED_TYPES)
+BLOCKED_DOMAINS = _env_list("IA_CRAWL_BLOCK_DOMAINS", DEFAULT_BLOCKED_DOMAINS)
+
+
+def blocked_url_patterns(types=BLOCKED_TYPES, domains=BLOCKED_DOMAINS):
+    patterns = []
+    for kind in types:
+        if kind not in RESOURCE_PATTERNS:
+            raise ValueError(f"지원하지 않는 리소스 종류: {kind} (가능: {', '.join(RESOURCE_PATTERNS)})")
+        patterns.extend(RESOURCE_PATTERNS[kind])
+    for domain in domains:
+        patterns.append(f"*://{domain}/*")
+        patterns.append(f"*://*.{domain}/*")
+    return patterns
+
+
+def apply_chrome_options(options, profile):
+    # 이미지는 확장자 없는 URL도 많아 브라우저 설정으로 종류 자체를 끔
+    if profile == CRAWL and 'image' in BLOCKED_TYPES:
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+
+def apply_load_profile(driver, profile):
+    # 드라이버를 만든 직후 한 번 호출. 차단 목록은 탭(CDP 세션)에 남아 이후 모든 탐색에 적용됨
+    if profile != CRAWL:
+        return []
+    patterns = blocked_url_patterns()
+    if not patterns:
+        return patterns
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        # CDP를 지원하지 않는 드라이버면 차단 없이 그대로 사용
+        logger.warning(f"리소스 차단 설정 실패: {str(e)}")
+        return []
+    logger.info(f"크롤링 로드 프로필 적용: 차단 패턴 {len(patterns)}개 ({', '.join(BLOCKED_TYPES) or '종류 없음'})")
+    return patterns
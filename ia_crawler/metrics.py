@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+TRACE_EVENTS = int(os.environ.get("IA_TRACE_EVENTS", "100000"))  # 메모리 상한. 넘으면 오래된 이벤트부터 버림
+METRIC_PREFIX = "ia_"
+
+HELP = {
+    'phase_seconds': "단계별 소요 시간(초)",
+    'pages_total': "크롤링한 페이지 수 (tier별)",
+    'crawl_errors_total': "크롤링 실패 수",
+    'fetch_bytes_total': "가져온 HTML 바이트 수 (tier별, 압축 해제 후)",
+    'http_requests_total': "HTTP 요청 수 (상태 코드별)",
+    'dom_nodes_total': "파싱한 DOM 요소 수",
+    'parser_fallbacks_total': "잘못 중첩된 마크업이라 html.parser로 대신 파싱한 문서 수 (요청한 파서별)",
+    'links_total': "추출한 링크 수 (섹션별)",
+    'page_cache_hits_total': "페이지 캐시 재사용 수 (304 또는 본문 해시 동일)",
+    'screenshot_cache_hits_total': "스크린샷 캐시 적중 수",
+    'screenshot_cache_misses_total': "스크린샷 캐시 미스 수",
+    'screenshot_failures_total': "스크린샷 캡처 실패 수",
+    'driver_starts_total': "새로 띄운 브라우저 드라이버 수",
+}
+
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+class Metrics:
+    # 카운터 + 단계별 소요 시간 + Chrome trace 이벤트를 모으는 프로세스 단위 수집기
+    def __init__(self, max_events=TRACE_EVENTS):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._phases = {}  # phase -> [count, sum, max]
+        self._events = deque(maxlen=max_events)
+        self._threads = {}
+        self._origin = time.perf_counter()
+        self.pid = os.getpid()
+
+    def count(self, name, value=1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def record(self, phase, started, seconds, args=None):
+        tid = threading.get_ident()
+        event = {
+            'name': phase,
+            'cat': 'ia',
+            'ph': 'X',
+            'ts': round((started - self._origin) * 1e6, 1),
+            'dur': round(seconds * 1e6, 1),
+            'pid': self.pid,
+            'tid': tid,
+        }
+        if args:
+            event['args'] = args
+        with self._lock:
+            stat = self._phases.setdefault(phase, [0, 0.0, 0.0])
+            stat[0] += 1
+            stat[1] += seconds
+            stat[2] = max(stat[2], seconds)
+            self._events.append(event)
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+
+    @contextmanager
+    def span(self, phase, **args):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, started, time.perf_counter() - started, args)
+
+    def summary(self):
+        # 단계별 호출 수/합계/평균/최대, 합계가 큰 순
+        with self._lock:
+            phases = {phase: list(stat) for phase, stat in self._phases.items()}
+        return [
+            {'phase': phase, 'count': n, 'total_s': round(total, 3), 'mean_ms': round(total / n * 1000, 1), 'max_ms': round(peak * 1000, 1)}
+            for phase, (n, total, peak) in sorted(phases.items(), key=lambda item: -item[1][1])
+        ]
+
+    def counters(self):
+        with self._lock:
+            return {f"{name}{_format_labels(labels)}": value for (name, labels), value in sorted(self._counters.items())}
+
+    def prometheus_text(self):
+        with self._lock:
+            counters = dict(self._counters)
+            phases = {phase: list(stat) for phase, stat in self._phases.items()}
+        lines = []
+        by_name = {}
+        for (name, labels), value in sorted(counters.items()):
+            by_name.setdefault(name, []).append((labels, value))
+        for name, samples in by_name.items():
+            metric = METRIC_PREFIX + name
+            if name in HELP:
+                lines.append(f"# HELP {metric} {HELP[name]}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f"{metric}{_format_labels(labels)} {value}" for labels, value in samples)
+        if phases:
+            metric = METRIC_PREFIX + "phase_seconds"
+            lines.append(f"# HELP {metric} {HELP['phase_seconds']}")
+            lines.append(f"# TYPE {metric} summary")
+            for phase, (n, total, _) in sorted(phases.items()):
+                lines.append(f'{metric}_sum{{phase="{phase}"}} {total:.6f}')
+                lines.append(f'{metric}_count{{phase="{phase}"}} {n}')
+            metric = METRIC_PREFIX + "phase_max_seconds"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.extend(f'{metric}{{phase="{phase}"}} {peak:.6f}' for phase, (_, _, peak) in sorted(phases.items()))
+        return "\n".join(lines) + "\n"
+
+    def chrome_trace(self):
+        # chrome://tracing, Perfetto에서 열 수 있는 Trace Event 형식
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        metadata = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in threads.items()
+        ]
+        return {'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}
+
+    def write_prometheus(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        return path
+
+    def write_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._phases.clear()
+            self._events.clear()
+
+
+_metrics = Metrics()
+
+
+def get_metrics():
+    return _metrics
+
+
+def span(phase, **args):
+    return _metrics.span(phase, **args)
+
+
+def count(name, value=1, **labels):
+    _metrics.count(name, value, **labels)
+
+
+def format_summary(rows):
+    # CLI용 고정폭 표
+    lines = [f"{'단계':<20}{'횟수':>8}{'합계(s)':>12}{'평균(ms)':>12}{'최대(ms)':>12}"]
+    lines.extend(f"{row['phase']:<20}{row['count']:>8}{row['total_s']:>12}{row['mean_ms']:>12}{row['max_ms']:>12}" for row in rows)
+    return "\n".join(lines)
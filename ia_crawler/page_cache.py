@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from .link_store import json_default
+from .url_canon import canonicalize
+
+logger = logging.getLogger(__name__)
+
+PAGE_CACHE_PATH = os.environ.get("IA_PAGE_CACHE", "page_cache.sqlite3")
+# 브라우저 tier로 추출한 IA의 재사용 기한(초). SPA는 HTML 셸이 그대로여도 JS가 그리는 메뉴가 바뀌므로
+# 본문 해시/304만 믿지 않고 이 시간이 지나면 다시 렌더링. 0이면 재사용하지 않음
+BROWSER_IA_TTL = float(os.environ.get("IA_PAGE_CACHE_BROWSER_TTL", "3600"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    headers TEXT,
+    body BLOB,
+    content_hash TEXT,
+    tier TEXT,
+    ia TEXT,
+    fetched_at REAL,
+    validated_at REAL
+)
+"""
+
+
+def normalize_cache_url(url):
+    # 크롤링 중복 판정과 같은 정규 URL을 키로 써서 /a, /a/, /a?utm_source=x가 한 항목을 공유
+    return canonicalize(url)
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def ia_reusable(entry, now=None, browser_ttl=None):
+    # 문서가 그대로일 때(304 또는 본문 해시 동일) 저장된 IA를 그대로 써도 되는지
+    if entry is None or entry['ia'] is None:
+        return False
+    if entry['tier'] != 'browser':
+        return True
+    browser_ttl = BROWSER_IA_TTL if browser_ttl is None else browser_ttl
+    return (now or time.time()) - (entry['fetched_at'] or 0) < browser_ttl
+
+
+class PageCache:
+    # 재크롤링용 응답 캐시: 본문, 헤더, 검증자(ETag/Last-Modified), 본문 해시, 추출한 IA를 URL별로 보관
+    def __init__(self, path=PAGE_CACHE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {'lookups': 0, 'hits': 0, 'stores': 0}
+        self._conn().execute(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, url):
+        self._count('lookups')
+        row = self._conn().execute(
+            "SELECT etag, last_modified, headers, body, content_hash, tier, ia, fetched_at, validated_at FROM pages WHERE url = ?",
+            (normalize_cache_url(url),),
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, headers, body, digest, tier, ia, fetched_at, validated_at = row
+        return {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': json.loads(headers) if headers else {},
+            'text': zlib.decompress(body).decode('utf-8', 'surrogatepass') if body is not None else None,
+            'content_hash': digest,
+            'tier': tier,
+            'ia': json.loads(ia) if ia else None,
+            'fetched_at': fetched_at,
+            'validated_at': validated_at,
+        }
+
+    def put(self, url, text, headers=None, tier=None, ia=None):
+        headers = headers or {}
+        now = time.time()
+        self._conn().execute(
+            "INSERT OR REPLACE INTO pages (url, etag, last_modified, headers, body, content_hash, tier, ia, fetched_at, validated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                normalize_cache_url(url),
+                headers.get('ETag') or headers.get('etag'),
+                headers.get('Last-Modified') or headers.get('last-modified'),
+                json.dumps(headers),
+                zlib.compress(text.encode('utf-8', 'surrogatepass')),
+                content_hash(text),
+                tier,
+                json.dumps(ia, ensure_ascii=False, default=json_default) if ia is not None else None,
+                now,
+                now,
+            ),
+        )
+        self._count('stores')
+
+    def mark_validated(self, url):
+        # 304 또는 본문 해시가 같아 저장된 결과를 재사용한 경우
+        self._conn().execute("UPDATE pages SET validated_at = ? WHERE url = ?", (time.time(), normalize_cache_url(url)))
+        self._count('hits')
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['entries'] = self._conn().execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        return stats
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_page_cache(path=PAGE_CACHE_PATH):
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = PageCache(path)
+            _caches[path] = cache
+        return cache
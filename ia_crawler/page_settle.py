@@ -0,0 +1,100 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUIET_MS = 500
+DEFAULT_TIMEOUT = 5.0
+
+# DOM 변경(MutationObserver), 리소스 로딩(Resource Timing), scrollHeight가 quiet_ms 동안 멈추면 완료.
+# 속성 변경은 캐러셀/애니메이션이 계속 만들어 내므로 보지 않음. timeout_ms가 지나면 무조건 반환
+SETTLE_SCRIPT = """
+var quietMs = arguments[0], timeoutMs = arguments[1], scroll = arguments[2];
+var done = arguments[arguments.length - 1];
+var start = performance.now(), lastChange = start, mutations = 0;
+var lastHeight = -1, lastResources = -1;
+var observer = new MutationObserver(function (records) {
+    mutations += records.length;
+    lastChange = performance.now();
+});
+observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+function pageHeight() {
+    return Math.max(document.body ? document.body.scrollHeight : 0, document.documentElement.scrollHeight);
+}
+function check() {
+    var now = performance.now();
+    var height = pageHeight();
+    var resources = performance.getEntriesByType('resource').length;
+    if (height !== lastHeight || resources !== lastResources) {
+        lastHeight = height;
+        lastResources = resources;
+        lastChange = now;
+        if (scroll) { window.scrollTo(0, height); }
+    }
+    var settled = document.readyState === 'complete' && now - lastChange >= quietMs;
+    if (settled || now - start >= timeoutMs) {
+        observer.disconnect();
+        if (scroll) { window.scrollTo(0, 0); }
+        done({settled: settled, elapsed: now - start, height: height, mutations: mutations, resources: resources});
+    } else {
+        setTimeout(check, 50);
+    }
+}
+check();
+"""
+
+# 닫기 버튼 후보를 순서대로 한 번에 조회해 보이는 첫 버튼을 클릭, 없으면 팝업 요소를 숨김
+POPUP_SCRIPT = """
+var closeSelectors = arguments[0], popupSelector = arguments[1];
+function clickable(el) {
+    if (el.disabled) { return false; }
+    var rect = el.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && style.pointerEvents !== 'none';
+}
+for (var i = 0; i < closeSelectors.length; i++) {
+    var candidates = document.querySelectorAll(closeSelectors[i]);
+    for (var j = 0; j < candidates.length; j++) {
+        if (clickable(candidates[j])) {
+            try {
+                candidates[j].click();
+                return {action: 'clicked', selector: closeSelectors[i]};
+            } catch (e) {}
+        }
+    }
+}
+var popups = document.querySelectorAll(popupSelector);
+popups.forEach(function (el) { el.style.display = 'none'; });
+return {action: 'hidden', count: popups.length};
+"""
+
+CLOSE_BUTTON_SELECTORS = [
+    'button.close',
+    'a.close',
+    '[class*="close"]',
+    '[id*="close"]',
+    'button[aria-label="Close"]',
+    'button[aria-label="close"]',
+    'div.close-btn',
+    '.btn-close',
+    '.modal-close'
+]
+POPUP_SELECTOR = '.modal, .popup, .overlay, [id*="popup"], [class*="popup"], [id*="modal"], [class*="modal"], [id*="overlay"], [class*="overlay"]'
+
+
+def wait_for_settle(driver, timeout=DEFAULT_TIMEOUT, quiet_ms=DEFAULT_QUIET_MS, scroll=False):
+    # scroll=True면 높이가 늘어날 때마다 맨 아래로 스크롤해 지연 로딩 콘텐츠를 불러옴
+    started = time.monotonic()
+    driver.set_script_timeout(timeout + 2)
+    try:
+        result = driver.execute_async_script(SETTLE_SCRIPT, quiet_ms, int(timeout * 1000), scroll)
+    except Exception as e:
+        logger.warning(f"페이지 안정화 감지 실패: {str(e)}")
+        result = {'settled': False, 'height': None}
+    logger.info(f"페이지 안정화: settled={result.get('settled')} {time.monotonic() - started:.2f}s height={result.get('height')}")
+    return result
+
+
+def dismiss_popups(driver):
+    return driver.execute_script(POPUP_SCRIPT, CLOSE_BUTTON_SELECTORS, POPUP_SELECTOR)
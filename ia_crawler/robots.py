@@ -0,0 +1,215 @@
+import gzip
+import io
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+from itertools import islice
+from urllib.parse import unquote, urlparse
+
+from .metrics import count
+from .url_canon import UrlSeenSet
+
+logger = logging.getLogger(__name__)
+
+ROBOTS_AGENT = os.environ.get("IA_ROBOTS_AGENT", "*")
+ROBOTS_MAX_BYTES = 500 * 1024  # 이보다 긴 robots.txt는 앞부분만 사용 (Google과 같은 기준)
+MAX_CRAWL_DELAY = float(os.environ.get("IA_MAX_CRAWL_DELAY", "30"))
+MAX_SITEMAP_DEPTH = 3  # sitemap index 안의 sitemap index를 따라가는 최대 단계
+MAX_SITEMAPS = int(os.environ.get("IA_MAX_SITEMAPS", "1000"))
+
+
+class RobotsPolicy:
+    # 사이트의 robots.txt. 읽지 못하면 401/403은 전체 금지, 그 밖의 오류(404 등)는 전체 허용
+    def __init__(self, base_url, fetcher, agent=ROBOTS_AGENT):
+        parsed = urlparse(base_url)
+        self.origin = f"{parsed.scheme}://{parsed.netloc}"
+        self.robots_url = f"{self.origin}/robots.txt"
+        self.agent = agent
+        self.disallow_all = False
+        self.group = {}  # 이 agent에 적용되는 그룹 (parse_robots 참고)
+        self.rules = []  # (정규식, 패턴 길이, 허용 여부)
+        self.sitemap_urls = []
+        self.load(fetcher)
+
+    def load(self, fetcher):
+        try:
+            with fetcher.open_stream(self.robots_url) as stream:
+                lines = list(io.TextIOWrapper(io.BytesIO(stream.read(ROBOTS_MAX_BYTES)), encoding='utf-8', errors='replace'))
+        except Exception as e:
+            status = getattr(e, 'status', None)
+            self.disallow_all = status in (401, 403)
+            logger.info(f"robots.txt 없음 ({status or str(e)}): {'전체 금지' if self.disallow_all else '전체 허용'}")
+            return
+        groups, self.sitemap_urls = parse_robots(lines)
+        self.group = select_group(groups, self.agent) or {}
+        self.rules = [(_rule_re(pattern), len(pattern), allow) for pattern, allow in self.group.get('rules', [])]
+
+    def allowed(self, url):
+        # RFC 9309: 경로(+쿼리)에 맞는 규칙 중 패턴이 가장 긴 것을 따르고, 길이가 같으면 Allow가 우선
+        if self.disallow_all:
+            return False
+        parsed = urlparse(url)
+        path = unquote(parsed.path or '/') + (f"?{unquote(parsed.query)}" if parsed.query else '')
+        if path == '/robots.txt':
+            return True
+        best_length, allowed = -1, True
+        for pattern, length, allow in self.rules:
+            if (length > best_length or (length == best_length and allow)) and pattern.match(path):
+                best_length, allowed = length, allow
+        return allowed
+
+    @property
+    def crawl_delay(self):
+        # Crawl-delay, 없으면 Request-rate(요청 수/초)로 계산한 간격. 지나치게 긴 값은 MAX_CRAWL_DELAY로 제한
+        delay = self.group.get('delay', self.group.get('rate', 0))
+        return min(float(delay), MAX_CRAWL_DELAY)
+
+    @property
+    def sitemaps(self):
+        # robots.txt에 Sitemap: 선언이 없으면 관례적인 위치를 시도
+        return self.sitemap_urls or [f"{self.origin}/sitemap.xml"]
+
+
+def parse_robots(lines):
+    # user-agent(소문자) -> {'rules': [(패턴, 허용 여부)], 'delay': Crawl-delay 초, 'rate': Request-rate 간격 초}, Sitemap URL 목록.
+    # 연속한 User-agent 줄은 한 그룹을 공유하고, 같은 agent의 그룹이 여러 번 나오면 합침.
+    # urllib.robotparser는 정수 Crawl-delay와 앞에서부터 첫 일치 규칙만 다루므로 직접 파싱
+    groups = {}
+    sitemaps = []
+    agents, in_rules = [], False
+    for line in lines:
+        line = line.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        field, value = (part.strip() for part in line.split(':', 1))
+        field = field.lower()
+        if field == 'user-agent':
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(groups.setdefault(value.lower(), {'rules': []}))
+        elif field == 'sitemap':
+            if value:
+                sitemaps.append(value)
+        elif field in ('allow', 'disallow'):
+            in_rules = True
+            if value:  # 빈 Disallow는 전체 허용과 같음
+                for group in agents:
+                    group['rules'].append((unquote(value), field == 'allow'))
+        elif field == 'crawl-delay':
+            in_rules = True
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for group in agents:
+                group.setdefault('delay', delay)
+        elif field == 'request-rate':
+            in_rules = True
+            requests, _, seconds = value.partition('/')
+            try:
+                delay = int(seconds) / int(requests)
+            except (ValueError, ZeroDivisionError):
+                continue
+            for group in agents:
+                group.setdefault('rate', delay)
+    return groups, sitemaps
+
+
+def select_group(groups, agent):
+    # agent 문자열에 이름이 들어 있는 그룹 중 가장 구체적인(긴) 것, 없으면 '*' 그룹
+    agent = agent.lower()
+    names = [name for name in groups if name != '*' and name in agent]
+    return groups[max(names, key=len)] if names else groups.get('*')
+
+
+def _rule_re(pattern):
+    # '*'는 임의의 문자열, 끝의 '$'는 경로 끝
+    anchored = pattern.endswith('$')
+    body = '.*'.join(re.escape(part) for part in (pattern[:-1] if anchored else pattern).split('*'))
+    return re.compile(body + ('$' if anchored else ''), re.S)
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_sitemap(stream):
+    # sitemap(.xml / .xml.gz / 텍스트)을 스트리밍 파싱해 ('url' | 'sitemap', loc)를 차례로 돌려줌.
+    # 처리한 항목은 바로 트리에서 떼어 내므로 URL 5만 개짜리 파일도 메모리를 거의 쓰지 않음
+    head = stream.peek(2)[:2]
+    if head == b'\x1f\x8b':
+        stream = io.BufferedReader(gzip.GzipFile(fileobj=stream))
+    if stream.peek(1)[:1].strip() not in (b'<', b'\xef', b''):
+        # 한 줄에 URL 하나인 텍스트 사이트맵
+        for line in io.TextIOWrapper(stream, encoding='utf-8', errors='replace'):
+            line = line.strip()
+            if line:
+                yield 'url', line
+        return
+    root = None
+    loc = None
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            continue
+        name = _local_name(elem.tag)
+        if name == 'loc':
+            loc = (elem.text or '').strip()
+        elif name in ('url', 'sitemap'):
+            if loc:
+                yield name, loc
+            loc = None
+            root.clear()
+
+
+def iter_sitemap_urls(fetcher, sitemaps, max_depth=MAX_SITEMAP_DEPTH):
+    # sitemap index를 따라가며(최대 max_depth 단계) 페이지 URL을 돌려주는 제너레이터.
+    # 하위 sitemap은 현재 파일을 다 읽은 뒤 차례로 열어 동시에 열린 응답은 항상 하나
+    queue = [(url, 0) for url in sitemaps]
+    visited = set()
+    while queue and len(visited) < MAX_SITEMAPS:
+        url, depth = queue.pop(0)
+        if url in visited:
+            continue
+        visited.add(url)
+        children = []
+        try:
+            with fetcher.open_stream(url) as stream:
+                for kind, loc in parse_sitemap(stream):
+                    if kind == 'url':
+                        yield loc
+                    elif depth < max_depth:
+                        children.append((loc, depth + 1))
+            count('sitemaps_total', status='ok')
+        except Exception as e:
+            count('sitemaps_total', status='error')
+            logger.warning(f"사이트맵 읽기 실패: {url} - {str(e)}")
+        queue.extend(children)
+
+
+def sitemap_seeds(base_url, fetcher, policy=None, limit=None):
+    # 시드와 같은 호스트이고 robots.txt가 허용하는 사이트맵 URL을 중복 없이 돌려줌
+    parsed = urlparse(base_url)
+    host = parsed.hostname
+    sitemaps = policy.sitemaps if policy is not None else [f"{parsed.scheme}://{parsed.netloc}/sitemap.xml"]
+    seen = UrlSeenSet()
+
+    def seeds():
+        for url in iter_sitemap_urls(fetcher, sitemaps):
+            parsed = urlparse(url)
+            if parsed.scheme not in ('http', 'https') or parsed.hostname != host:
+                continue
+            if policy is not None and not policy.allowed(url):
+                count('robots_disallowed_total')
+                continue
+            if seen.add(url):
+                yield url
+    return islice(seeds(), limit)
+
+
+def link_text(url):
+    # 사이트맵에만 있는 페이지는 링크 텍스트가 없으므로 경로를 대신 씀
+    parsed = urlparse(url)
+    return unquote(parsed.path.rstrip('/') or '/') + (f"?{parsed.query}" if parsed.query else '')
@@ -0,0 +1,355 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = int(os.environ.get("IA_SCREENSHOT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+DEFAULT_TTL = int(os.environ.get("IA_SCREENSHOT_CACHE_TTL", str(7 * 24 * 3600)))
+DEFAULT_NEGATIVE_TTL = int(os.environ.get("IA_SCREENSHOT_CACHE_NEGATIVE_TTL", "60"))
+INDEX_DB = "index.sqlite3"
+LEGACY_INDEX_FILE = "index.json"  # 이전 버전의 JSON 인덱스. 처음 열 때 INDEX_DB로 옮긴 뒤 삭제
+LEGACY_BLOB_RE = re.compile(r'^[0-9a-f]{32}\.png$')  # 인덱스 없이 md5(url_width).png로 저장하던 최초 버전
+EVICT_BATCH = 64
+FULL = "full"
+THUMB = "thumb"
+VARIANTS = (FULL, THUMB)
+IMAGE_EXTENSIONS = ('.png', '.webp')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT,
+    width INTEGER,
+    variant TEXT,
+    digest TEXT NOT NULL,
+    created_at REAL,
+    expires_at REAL,
+    last_access REAL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    negative INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires_at);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access);
+CREATE INDEX IF NOT EXISTS entries_lfu ON entries (hits, last_access);
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    ext TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    refs INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (name, value) VALUES ('bytes', 0);
+"""
+
+
+def image_extension(data):
+    # blob 파일 확장자는 내용(매직 바이트)으로 결정
+    return '.webp' if data[:4] == b'RIFF' and data[8:12] == b'WEBP' else '.png'
+
+
+def _atomic_write(path, data):
+    # 같은 디렉터리에 임시 파일로 쓴 뒤 rename: 다른 워커가 쓰다 만 파일을 읽지 않도록
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class ScreenshotCache:
+    # 내용 해시로 이미지(PNG/WebP)를 저장하고, (url, width, variant) -> 해시 인덱스를 SQLite에 두는 용량 제한 캐시.
+    # variant: full(전체 페이지), thumb(목록/미리보기용 썸네일)
+    # blob마다 참조 수를, 전체 용량은 meta 테이블에 누적해 두므로 put 한 번의 비용은 항목 수와 무관하고,
+    # 참조가 0이 된 blob 파일은 그 항목을 지우거나 밀어낼 때만 삭제
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL,
+                 negative_ttl=DEFAULT_NEGATIVE_TTL, policy='lru'):
+        if policy not in ('lru', 'lfu'):
+            raise ValueError(f"지원하지 않는 캐시 정책: {policy}")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.policy = policy
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, INDEX_DB)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending = {}  # key -> [last_access, hits 증가분]: 다음 쓰기 트랜잭션 때 반영
+        self._stats = {'hits': 0, 'misses': 0, 'negative_hits': 0, 'writes': 0, 'evictions': 0, 'expirations': 0,
+                       'migrated': 0}
+        self._conn().executescript(SCHEMA)
+        self._migrate()
+
+    @staticmethod
+    def make_key(url, width, variant=FULL):
+        # full은 최초 버전의 파일 이름(md5(url_width))과 같은 키라서 _migrate가 옛 PNG를 이 키로 옮김
+        name = f"{url}_{width}" if variant == FULL else f"{url}_{width}_{variant}"
+        return hashlib.md5(name.encode()).hexdigest()
+
+    def _blob_path(self, digest, ext='.png'):
+        return os.path.join(self.directory, f"{digest}{ext}")
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE: 같은 디렉터리를 쓰는 다른 프로세스/스레드와 쓰기를 직렬화.
+        # 파일 삭제는 COMMIT 뒤로 미룸: 롤백되면 인덱스는 그대로인데 blob만 사라지는 일이 없도록
+        conn = self._conn()
+        self._local.unlinks = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            self._local.unlinks = []
+            raise
+        conn.execute("COMMIT")
+        unlinks, self._local.unlinks = self._local.unlinks, []
+        for digest, path in unlinks:
+            # 그사이 다른 워커가 같은 내용을 다시 저장했으면 남겨 둠
+            if digest is None or not conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone():
+                _unlink(path)
+
+    def _add_bytes(self, conn, delta):
+        conn.execute("UPDATE meta SET value = value + ? WHERE name = 'bytes'", (delta,))
+
+    def _retain(self, conn, digest, data):
+        # blob 참조 수 +1. 처음 보는 내용이면 파일을 쓰고 전체 용량에 더함
+        ext = image_extension(data)
+        path = self._blob_path(digest, ext)
+        if conn.execute("UPDATE blobs SET refs = refs + 1 WHERE digest = ?", (digest,)).rowcount:
+            if not os.path.exists(path):
+                _atomic_write(path, data)
+            return
+        _atomic_write(path, data)
+        conn.execute("INSERT INTO blobs (digest, ext, size, refs) VALUES (?, ?, ?, 1)", (digest, ext, len(data)))
+        self._add_bytes(conn, len(data))
+
+    def _release(self, conn, digest):
+        # blob 참조 수 -1. 더 이상 참조가 없으면 행을 지우고(파일은 COMMIT 뒤에) 줄어든 용량을 반환
+        conn.execute("UPDATE blobs SET refs = refs - 1 WHERE digest = ?", (digest,))
+        row = conn.execute("SELECT ext, size FROM blobs WHERE digest = ? AND refs <= 0", (digest,)).fetchone()
+        if row is None:
+            return 0
+        ext, size = row
+        conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+        self._add_bytes(conn, -size)
+        self._local.unlinks.append((digest, self._blob_path(digest, ext)))
+        return size
+
+    def _remove(self, conn, key, digest):
+        conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        return self._release(conn, digest)
+
+    def _apply_pending(self, conn):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if pending:
+            conn.executemany(
+                "UPDATE entries SET last_access = MAX(last_access, ?), hits = hits + ? WHERE key = ?",
+                [(last_access, hits, key) for key, (last_access, hits) in pending.items()],
+            )
+
+    def _evict(self, conn, now):
+        expired = conn.execute(
+            "SELECT key, digest FROM entries WHERE expires_at <= ?", (now,)
+        ).fetchall()
+        for key, digest in expired:
+            self._remove(conn, key, digest)
+        total = conn.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+        order = "hits, last_access" if self.policy == 'lfu' else "last_access"
+        evicted = 0
+        while total > self.max_bytes:
+            rows = conn.execute(f"SELECT key, digest FROM entries ORDER BY {order} LIMIT ?", (EVICT_BATCH,)).fetchall()
+            if not rows:
+                break
+            for key, digest in rows:
+                if total <= self.max_bytes:
+                    break
+                total -= self._remove(conn, key, digest)
+                evicted += 1
+        with self._lock:
+            self._stats['expirations'] += len(expired)
+            self._stats['evictions'] += evicted
+
+    def _migrate(self):
+        # 이전 형식(index.json, 인덱스 없는 md5.png)이 남아 있으면 한 번만 INDEX_DB로 옮김
+        legacy_index = os.path.join(self.directory, LEGACY_INDEX_FILE)
+        legacy_blobs = [name for name in os.listdir(self.directory) if LEGACY_BLOB_RE.match(name)]
+        if not legacy_blobs and not os.path.exists(legacy_index):
+            return
+        now = time.time()
+        migrated = 0
+        with self._transaction() as conn:
+            try:
+                with open(legacy_index, 'rb') as f:
+                    entries = json.loads(f.read().decode('utf-8'))
+            except FileNotFoundError:
+                entries = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"이전 스크린샷 캐시 인덱스를 읽지 못해 건너뜀: {str(e)}")
+                entries = {}
+            for key, entry in entries.items():
+                expires_at = entry.get('expires_at')
+                if expires_at is not None and expires_at <= now:
+                    continue
+                try:
+                    with open(self._blob_path(entry['digest'], entry.get('ext', '.png')), 'rb') as f:
+                        data = f.read()
+                except (OSError, KeyError):
+                    continue
+                migrated += self._import(conn, key, data, entry)
+
+            for name in legacy_blobs:
+                path = os.path.join(self.directory, name)
+                try:
+                    mtime = os.stat(path).st_mtime
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                except OSError:
+                    continue
+                if not self.ttl or mtime + self.ttl > now:
+                    key = name[:-len('.png')]
+                    migrated += self._import(conn, key, data, {
+                        'created_at': mtime,
+                        'expires_at': mtime + self.ttl if self.ttl else None,
+                        'last_access': mtime,
+                    })
+                self._local.unlinks.append((None, path))
+            self._local.unlinks.append((None, legacy_index))
+            self._evict(conn, now)
+        with self._lock:
+            self._stats['migrated'] += migrated
+        logger.info(f"이전 스크린샷 캐시 항목 {migrated}개를 {INDEX_DB}로 옮김")
+
+    def _import(self, conn, key, data, entry):
+        if conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone():
+            return 0
+        digest = hashlib.sha256(data).hexdigest()
+        self._retain(conn, digest, data)
+        conn.execute(
+            "INSERT INTO entries (key, url, width, variant, digest, created_at, expires_at, last_access, hits, negative) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, entry.get('url'), entry.get('width'), entry.get('variant', FULL), digest, entry.get('created_at'),
+             entry.get('expires_at'), entry.get('last_access'), entry.get('hits', 0), int(bool(entry.get('negative')))),
+        )
+        return 1
+
+    def get(self, url, width, variant=FULL):
+        key = self.make_key(url, width, variant)
+        now = time.time()
+        row = self._conn().execute(
+            "SELECT e.digest, b.ext, e.expires_at, e.negative FROM entries e JOIN blobs b ON b.digest = e.digest WHERE e.key = ?",
+            (key,),
+        ).fetchone()
+        if row is None or (row[2] is not None and row[2] <= now):
+            with self._lock:
+                self._stats['misses'] += 1
+                if row is not None:
+                    self._stats['expirations'] += 1
+            return None
+        digest, ext, _, negative = row
+        try:
+            with open(self._blob_path(digest, ext), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self._stats['misses'] += 1
+            return None
+        with self._lock:
+            pending = self._pending.setdefault(key, [now, 0])
+            pending[0] = now
+            pending[1] += 1
+            self._stats['hits'] += 1
+            if negative:
+                self._stats['negative_hits'] += 1
+        return data
+
+    def put(self, url, width, data, negative=False, variant=FULL):
+        # negative: 캡처 실패 대체 이미지. 짧은 TTL로만 보관하고 TTL이 0이면 저장하지 않음
+        ttl = self.negative_ttl if negative else self.ttl
+        if negative and not ttl:
+            return
+        key = self.make_key(url, width, variant)
+        digest = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        with self._transaction() as conn:
+            self._apply_pending(conn)
+            previous = conn.execute("SELECT digest FROM entries WHERE key = ?", (key,)).fetchone()
+            # 새 blob을 먼저 참조해야 같은 내용으로 덮어쓸 때 파일이 지워지지 않음
+            self._retain(conn, digest, data)
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, url, width, variant, digest, created_at, expires_at, last_access, hits, negative) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?)",
+                (key, url, width, variant, digest, now, now + ttl if ttl else None, now, int(negative)),
+            )
+            if previous is not None:
+                self._release(conn, previous[0])
+            self._evict(conn, now)
+        with self._lock:
+            self._pending.pop(key, None)
+            self._stats['writes'] += 1
+
+    def flush(self):
+        # 조회 기록(last_access/hits)을 반영하고 만료/용량 초과 항목을 정리
+        with self._transaction() as conn:
+            self._apply_pending(conn)
+            self._evict(conn, time.time())
+
+    def stats(self):
+        conn = self._conn()
+        entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        total = conn.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+        with self._lock:
+            stats = dict(self._stats)
+        stats['entries'] = entries
+        stats['bytes'] = total
+        stats['max_bytes'] = self.max_bytes
+        stats['policy'] = self.policy
+        return stats
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_screenshot_cache(directory, **kwargs):
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = ScreenshotCache(directory, **kwargs)
+            _caches[directory] = cache
+        return cache
@@ -0,0 +1,132 @@
+import base64
+import io
+import logging
+import os
+import struct
+import zlib
+
+from PIL import Image
+
+from .metrics import span
+
+logger = logging.getLogger(__name__)
+
+TILED = os.environ.get("IA_SCREENSHOT_TILED", "1") != "0"  # 0이면 창 크기를 전체 높이로 늘리는 이전 방식
+TILE_HEIGHT = int(os.environ.get("IA_SCREENSHOT_TILE_HEIGHT", "1080"))
+MAX_HEIGHT = int(os.environ.get("IA_SCREENSHOT_MAX_HEIGHT", "30000"))  # 무한 스크롤 페이지 등은 여기서 자름
+WEBP_QUALITY = int(os.environ.get("IA_SCREENSHOT_WEBP_QUALITY", "80"))
+THUMB_WIDTH = int(os.environ.get("IA_SCREENSHOT_THUMB_WIDTH", "480"))
+THUMB_MAX_HEIGHT = int(os.environ.get("IA_SCREENSHOT_THUMB_MAX_HEIGHT", "1600"))
+WEBP_MAX_DIMENSION = 16383  # WebP 포맷이 표현할 수 있는 최대 가로/세로 픽셀
+
+
+def capture_tiles(driver, width, height, tile_height=TILE_HEIGHT):
+    # 창 크기를 페이지 전체 높이로 늘리지 않고, CDP captureScreenshot의 clip으로 타일 단위 캡처.
+    # 한 번에 타일 하나만 만들어 돌려주므로 브라우저/파이썬 모두 전체 크기 PNG를 들고 있지 않음
+    for y in range(0, height, tile_height):
+        clip = {'x': 0, 'y': y, 'width': width, 'height': min(tile_height, height - y), 'scale': 1}
+        result = driver.execute_cdp_cmd('Page.captureScreenshot', {
+            'format': 'png',
+            'clip': clip,
+            'captureBeyondViewport': True,
+        })
+        yield base64.b64decode(result['data'])
+
+
+def _png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+
+class StreamingPNGWriter:
+    # 행 단위로 받아 바로 압축하는 PNG 인코더. WebP 한계보다 긴 페이지를 전체 캔버스 없이 저장할 때 사용
+    def __init__(self, fp, width, height):
+        self.fp = fp
+        self.width = width
+        self._compressor = zlib.compressobj(6)
+        fp.write(b'\x89PNG\r\n\x1a\n')
+        fp.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+
+    def write(self, image):
+        # RGB 이미지의 행마다 필터 바이트(0: None)를 붙여 압축
+        raw = image.tobytes()
+        stride = self.width * 3
+        rows = b''.join(b'\x00' + raw[i:i + stride] for i in range(0, len(raw), stride))
+        data = self._compressor.compress(rows)
+        if data:
+            self.fp.write(_png_chunk(b'IDAT', data))
+
+    def close(self):
+        self.fp.write(_png_chunk(b'IDAT', self._compressor.flush()))
+        self.fp.write(_png_chunk(b'IEND', b''))
+
+
+def stitch(tiles, width, height):
+    # 타일을 하나씩 디코딩해 전체 이미지와 썸네일에 붙이고 바로 버림.
+    # 높이가 WebP 한계 안이면 RGB 캔버스 하나(전체 PNG 디코딩의 1/4 수준 메모리)에 모아 WebP로,
+    # 넘으면 캔버스 없이 PNG로 스트리밍 인코딩. 반환: (전체 이미지 바이트, 썸네일 WebP 바이트)
+    use_webp = width <= WEBP_MAX_DIMENSION and height <= WEBP_MAX_DIMENSION
+    canvas = Image.new('RGB', (width, height), (255, 255, 255)) if use_webp else None
+    out = io.BytesIO()
+    writer = None if use_webp else StreamingPNGWriter(out, width, height)
+
+    scale = min(1.0, THUMB_WIDTH / width)
+    thumb_height = max(1, min(THUMB_MAX_HEIGHT, round(height * scale)))
+    thumb = Image.new('RGB', (max(1, round(width * scale)), thumb_height), (255, 255, 255))
+
+    y = 0
+    for data in tiles:
+        with Image.open(io.BytesIO(data)) as tile:
+            tile = tile.convert('RGB')
+        # devicePixelRatio가 1이 아니면 CSS 픽셀 기준 크기로 맞춤
+        tile_height = min(max(1, round(tile.height * width / tile.width)), height - y)
+        if tile.size != (width, tile_height):
+            tile = tile.resize((width, tile_height), Image.LANCZOS)
+        if canvas is not None:
+            canvas.paste(tile, (0, y))
+        else:
+            writer.write(tile)
+
+        top, bottom = round(y * scale), round((y + tile_height) * scale)
+        if top < thumb_height and bottom > top:
+            thumb.paste(tile.resize((thumb.width, bottom - top), Image.LANCZOS), (0, top))
+        y += tile_height
+        del tile
+        if y >= height:
+            break
+
+    with span('encode', format='webp' if use_webp else 'png', height=height):
+        if canvas is not None:
+            canvas.save(out, format='WEBP', quality=WEBP_QUALITY, method=4)
+            canvas.close()
+        else:
+            if y < height:
+                # 타일이 모자라면 남은 행을 흰색으로 채워 IHDR의 높이와 맞춤
+                writer.write(Image.new('RGB', (width, height - y), (255, 255, 255)))
+            writer.close()
+        thumb_bytes = encode_thumbnail(thumb)
+    return out.getvalue(), thumb_bytes
+
+
+def encode_thumbnail(image):
+    out = io.BytesIO()
+    image.save(out, format='WEBP', quality=WEBP_QUALITY, method=4)
+    return out.getvalue()
+
+
+def make_thumbnail(data):
+    # 이미 저장된 전체 이미지(PNG/WebP)에서 썸네일 생성. 이전 버전 캐시의 PNG에 썸네일이 없을 때 사용
+    with Image.open(io.BytesIO(data)) as image:
+        scale = min(1.0, THUMB_WIDTH / image.width)
+        crop_height = min(image.height, max(1, round(THUMB_MAX_HEIGHT / scale)))
+        thumb = image.convert('RGB').crop((0, 0, image.width, crop_height))
+    thumb = thumb.resize((max(1, round(thumb.width * scale)), max(1, round(thumb.height * scale))), Image.LANCZOS)
+    return encode_thumbnail(thumb)
+
+
+def capture_full_page(driver, width, height, tile_height=TILE_HEIGHT):
+    # 페이지 전체 높이(최대 MAX_HEIGHT)를 타일로 캡처해 (전체 이미지, 썸네일)을 돌려줌
+    if height > MAX_HEIGHT:
+        logger.info(f"페이지 높이 {height}px가 최대 {MAX_HEIGHT}px를 넘어 잘라서 캡처")
+        height = MAX_HEIGHT
+    height = max(1, int(height))
+    return stitch(capture_tiles(driver, width, height, tile_height), width, height)
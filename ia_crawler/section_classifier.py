@@ -0,0 +1,208 @@
+import re
+
+from .dom import get_dom
+
+# 후보 순서가 곧 동점일 때의 우선순위이므로 기존 find_*_element의 탐색 순서를 그대로 유지
+GNB_TAGS = ['nav', 'header']
+GNB_CLASSES = ['gnb', 'nav', 'navigation', 'menu', 'main-menu', 'top-menu', 'topmenu', 'global-nav', 'util-menu', 'user-menu', 'header-menu']
+GNB_IDS = ['gnb', 'nav', 'navigation', 'menu', 'top-menu', 'topmenu', 'global-nav', 'util-menu', 'user-menu', 'header-menu']
+SIDE_TAGS = ['aside']
+SIDE_CLASSES = ['sidebar', 'side', 'side-menu', 'side-nav']
+SIDE_IDS = ['sidebar', 'side', 'side-menu']
+FOOTER_KEYWORDS = ['이용약관', '개인정보', '사이트맵', '회사소개']
+LOGIN_KEYWORDS = ['login', 'logout', 'join', 'mypage']
+
+GNB_CLASS_RES = [re.compile(re.escape(name), re.I) for name in GNB_CLASSES]
+GNB_ID_RES = [re.compile(re.escape(name), re.I) for name in GNB_IDS]
+SIDE_CLASS_RES = [re.compile(re.escape(name), re.I) for name in SIDE_CLASSES]
+SIDE_ID_RES = [re.compile(re.escape(name), re.I) for name in SIDE_IDS]
+
+NO_MATCH = 1 << 30
+
+
+def _first_match(patterns, value, memo):
+    # 값에 처음으로 매칭되는 패턴의 순번 (클래스/ID 토큰은 페이지 안에서 반복되므로 메모이즈)
+    rank = memo.get(value)
+    if rank is None:
+        rank = next((i for i, pattern in enumerate(patterns) if pattern.search(value)), NO_MATCH)
+        memo[value] = rank
+    return rank
+
+
+def _class_rank(patterns, classes, memo):
+    return min((_first_match(patterns, cls, memo) for cls in classes), default=NO_MATCH)
+
+
+def _footer_rank(name, element_id, classes):
+    # 'footer', '#footer', '.footer', '[class*="footer"]', '[class*="Footer"]', '.bottom', '#bottom', '.site-bottom'
+    if name == 'footer':
+        return 0
+    if element_id == 'footer':
+        return 1
+    if 'footer' in classes:
+        return 2
+    if any('footer' in cls for cls in classes):
+        return 3
+    if any('Footer' in cls for cls in classes):
+        return 4
+    if 'bottom' in classes:
+        return 5
+    if element_id == 'bottom':
+        return 6
+    if 'site-bottom' in classes:
+        return 7
+    return NO_MATCH
+
+
+def _best(candidates):
+    # candidates: (score, rank, order, element) — 점수가 같으면 기존 후보 목록에서 먼저 나온 요소
+    if not candidates:
+        return None
+    return min(candidates, key=lambda c: (-c[0], c[1], c[2]))[3]
+
+
+def _footer_fallback(dom, soup):
+    # 하위 요소의 텍스트는 항상 상위 div/section 텍스트의 부분 문자열이므로, 키워드가 없는 서브트리는 건너뜀
+    matches = []
+    stack = list(reversed(dom.children(soup)))
+    while stack:
+        element = stack.pop()
+        if dom.tag(element) in ('div', 'section'):
+            text = dom.text(element).lower()
+            if not any(keyword in text for keyword in FOOTER_KEYWORDS):
+                continue
+            matches.append(element)
+        stack.extend(reversed(dom.children(element)))
+    return matches
+
+
+def classify_sections(soup, dom=None):
+    # DOM을 한 번만 순회하며 GNB/사이드/푸터 후보를 동시에 채점. soup은 dom 백엔드가 파싱한 문서
+    dom = dom or get_dom('html.parser')
+    nodes = []      # 문서 순서(전위 순회)의 요소
+    parents = []    # 부모 요소의 nodes 인덱스 (최상위는 -1)
+    in_header = []  # 조상 중 <header>가 있는지
+    names = []
+    stack = [(child, -1, False) for child in reversed(dom.children(soup))]
+    while stack:
+        element, parent, header_above = stack.pop()
+        index = len(nodes)
+        name = dom.tag(element)
+        nodes.append(element)
+        names.append(name)
+        parents.append(parent)
+        in_header.append(header_above)
+        below = header_above or name == 'header'
+        for child in reversed(dom.children(element)):
+            stack.append((child, index, below))
+
+    # 서브트리 단위 집계를 자식 → 부모 방향으로 한 번에 누적
+    count = len(nodes)
+    links = [0] * count
+    has_list = [False] * count
+    has_login = [False] * count
+    for index in range(count - 1, -1, -1):
+        parent = parents[index]
+        if parent < 0:
+            continue
+        name = names[index]
+        links[parent] += links[index]
+        if has_list[index] or name in ('ul', 'ol'):
+            has_list[parent] = True
+        if has_login[index]:
+            has_login[parent] = True
+        if name == 'a':
+            links[parent] += 1
+            if not has_login[parent]:
+                text = dom.text(nodes[index]).lower()
+                if any(keyword in text for keyword in LOGIN_KEYWORDS):
+                    has_login[parent] = True
+
+    gnb_class_memo, side_class_memo = {}, {}
+    gnb_id_first = [None] * len(GNB_IDS)
+    side_id_first = [None] * len(SIDE_IDS)
+    gnb_ranks = {}
+    side_ranks = {}
+    footer_candidates = []
+
+    for index, element in enumerate(nodes):
+        name = names[index]
+        classes = dom.classes(element)
+        element_id = dom.attr(element, 'id')
+
+        rank = GNB_TAGS.index(name) if name in GNB_TAGS else NO_MATCH
+        if classes:
+            rank = min(rank, len(GNB_TAGS) + _class_rank(GNB_CLASS_RES, classes, gnb_class_memo))
+        if rank < NO_MATCH:
+            gnb_ranks[index] = rank
+
+        rank = SIDE_TAGS.index(name) if name in SIDE_TAGS else NO_MATCH
+        if classes:
+            rank = min(rank, len(SIDE_TAGS) + _class_rank(SIDE_CLASS_RES, classes, side_class_memo))
+        if rank < NO_MATCH:
+            side_ranks[index] = rank
+
+        if element_id is not None:
+            # soup.find(id=...)는 패턴마다 문서상 첫 요소만 돌려줌
+            for i, pattern in enumerate(GNB_ID_RES):
+                if gnb_id_first[i] is None and pattern.search(element_id):
+                    gnb_id_first[i] = index
+            for i, pattern in enumerate(SIDE_ID_RES):
+                if side_id_first[i] is None and pattern.search(element_id):
+                    side_id_first[i] = index
+
+        rank = _footer_rank(name, element_id, classes)
+        if rank < NO_MATCH:
+            score = links[index] * 2
+            if name == 'footer':
+                score += 20
+            if any(cls and 'footer' in cls.lower() for cls in classes):
+                score += 10
+            footer_candidates.append((score, rank, index, element))
+
+    offset = len(GNB_TAGS) + len(GNB_CLASSES)
+    for i, index in enumerate(gnb_id_first):
+        if index is not None:
+            gnb_ranks[index] = min(gnb_ranks.get(index, NO_MATCH), offset + i)
+    offset = len(SIDE_TAGS) + len(SIDE_CLASSES)
+    for i, index in enumerate(side_id_first):
+        if index is not None:
+            side_ranks[index] = min(side_ranks.get(index, NO_MATCH), offset + i)
+
+    gnb_candidates = []
+    for index, rank in gnb_ranks.items():
+        score = 0
+        if names[index] == 'nav':
+            score += 30
+        if in_header[index]:
+            score += 20
+        score += min(links[index] * 2, 20)
+        if has_list[index]:
+            score += 15
+        if has_login[index]:
+            score += 10  # 로그인, 회원가입 등이 포함된 메뉴에 가산점
+        gnb_candidates.append((score, rank, index, nodes[index]))
+
+    side_candidates = []
+    for index, rank in side_ranks.items():
+        score = 0
+        if names[index] == 'aside':
+            score += 20
+        score += min(links[index] * 2, 20)
+        if has_list[index]:
+            score += 15
+        side_candidates.append((score, rank, index, nodes[index]))
+
+    if not footer_candidates:
+        for order, element in enumerate(_footer_fallback(dom, soup)):
+            score = sum(1 for descendant in dom.iter(element) if dom.tag(descendant) == 'a') * 2
+            classes = dom.classes(element)
+            if any(cls and 'footer' in cls.lower() for cls in classes):
+                score += 10
+            footer_candidates.append((score, 0, order, element))
+
+    return {
+        'gnb': _best(gnb_candidates),
+        'side': _best(side_candidates),
+        'footer': _best(footer_candidates),
+    }
@@ -0,0 +1,174 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from .link_store import LinkNode, Section
+from .metrics import count
+from .robots import link_text
+from .url_canon import UrlSeenSet, canonicalize
+
+logger = logging.getLogger(__name__)
+
+SECTION_ATTRS = ['gnb_links', 'side_links', 'footer_links', 'other_links']
+
+
+def url_key(url):
+    # 프래그먼트, 추적 파라미터, 끝의 /만 다른 URL은 같은 페이지로 취급
+    return canonicalize(url)
+
+
+def iter_links(links):
+    stack = list(reversed(links))
+    while stack:
+        link = stack.pop()
+        yield link
+        stack.extend(reversed(link.get('children', [])))
+
+
+class HostThrottle:
+    # 호스트별 동시 요청 수와 최소 요청 간격을 제한
+    def __init__(self, max_concurrent=2, min_interval=0.0):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _host_state(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = {'sem': threading.Semaphore(self.max_concurrent), 'lock': threading.Lock(), 'next_at': 0.0}
+                self._hosts[host] = state
+            return state
+
+    @contextmanager
+    def slot(self, url):
+        state = self._host_state(urlparse(url).hostname or '')
+        with state['sem']:
+            if self.min_interval:
+                with state['lock']:
+                    delay = state['next_at'] - time.monotonic()
+                    state['next_at'] = max(state['next_at'], time.monotonic()) + self.min_interval
+                if delay > 0:
+                    time.sleep(delay)
+            yield
+
+
+class SiteCrawlEngine:
+    def __init__(self, crawler_factory, max_depth=2, max_pages=100, concurrency=4,
+                 per_host_limit=2, per_host_delay=0.0, progress=None, cancel=None, robots=None, seeds=None):
+        self.crawler_factory = crawler_factory
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        self.throttle = HostThrottle(per_host_limit, per_host_delay)
+        self.progress = progress
+        self.cancel = cancel  # threading.Event. set되면 진행 중인 페이지만 마치고 중단
+        self.robots = robots  # RobotsPolicy. 금지된 URL은 프런티어에 넣지 않음
+        self.seeds = seeds  # 사이트맵 등에서 얻은 추가 URL. 링크로 찾은 페이지가 예산보다 적을 때만 채워 넣음
+        self.pages = {}  # url -> {'depth': n, 'status': 'ok' | 오류 메시지, 'tier': 'http' | 'browser' | 'cache', 'hash': 본문 해시}
+
+    def in_scope(self, url):
+        parsed = urlparse(url)
+        return parsed.scheme in ('http', 'https') and parsed.hostname == self.host
+
+    def _enqueue(self, node, frontier):
+        if not self.in_scope(node['url']):
+            return
+        if self.robots is not None and not self.robots.allowed(node['url']):
+            count('robots_disallowed_total')
+            return
+        frontier.append(node)
+
+    def add_orphan(self, root, url):
+        # 메뉴 링크로는 닿지 않는 페이지(사이트맵에서만 찾은 페이지)는 Other 섹션 최상위에 둠
+        node = LinkNode(self.strings, link_text(url), url, Section.OTHER, 1)
+        root.other_links.append(node)
+        return node
+
+    def _top_up(self, root, frontier, budget, seen):
+        if self.seeds is None:
+            return
+        while len(frontier) < budget:
+            url = next(self.seeds, None)
+            if url is None:
+                self.seeds = None
+                break
+            if seen.add(url):
+                self._enqueue(self.add_orphan(root, url), frontier)
+
+    def _fetch(self, url):
+        with self.throttle.slot(url):
+            crawler = self.crawler_factory()
+            result = crawler.crawl(url)
+        return crawler if result is True else result
+
+    def cancelled(self):
+        return self.cancel is not None and self.cancel.is_set()
+
+    def _graft(self, parent, links, seen, frontier, nodes=None):
+        # 이미 트리에 있는 URL은 건너뛰고, 새 링크만 parent 아래에 붙임. nodes가 있으면 url_key -> 노드도 기록
+        for link in links:
+            if not seen.add(link['url']):
+                self._graft(parent, link.get('children', []), seen, frontier, nodes)
+                continue
+            node = LinkNode(self.strings, link['text'], link['url'], parent['section'], parent['depth'] + 1)
+            parent.setdefault('children', []).append(node)
+            if nodes is not None:
+                nodes[url_key(node['url'])] = node
+            self._enqueue(node, frontier)
+            self._graft(node, link.get('children', []), seen, frontier, nodes)
+
+    def merge(self, parent, links, seen, nodes=None):
+        # 페이지를 더 가져오지 않고 links만 parent 아래에 병합 (분산 크롤링 결과 수집 등). 새로 붙인 노드 목록을 반환
+        added = []
+        self._graft(parent, links, seen, added, nodes)
+        return added
+
+    def run(self, root):
+        # root: 시드 URL로 crawl()을 이미 마친 크롤러. 하위 페이지 링크를 root의 IA 트리에 병합
+        seed = url_key(root.base_url)
+        self.strings = root.strings
+        self.host = urlparse(seed).hostname
+        self.pages[seed] = {'depth': 0, 'status': 'ok', 'tier': root.fetch_tier, 'hash': root.content_hash}
+
+        # 트리에 있는 URL의 중복 판정은 정규 URL 지문 집합으로 (URL 문자열을 따로 들고 있지 않음)
+        seen = UrlSeenSet()
+        seen.add(seed)
+        frontier = []
+        for attr in SECTION_ATTRS:
+            for link in iter_links(getattr(root, attr)):
+                if seen.add(link['url']):
+                    self._enqueue(link, frontier)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for depth in range(1, self.max_depth + 1):
+                budget = self.max_pages - len(self.pages)
+                self._top_up(root, frontier, budget, seen)
+                if budget <= 0 or not frontier:
+                    break
+                batch, frontier = frontier[:budget], []
+                logger.info(f"사이트 크롤링 {depth}단계: {len(batch)}페이지")
+                results = executor.map(self._fetch, [node['url'] for node in batch])
+                for node, page in zip(batch, results):
+                    key = url_key(node['url'])
+                    if isinstance(page, str):
+                        self.pages[key] = {'depth': depth, 'status': page}
+                    else:
+                        self.pages[key] = {'depth': depth, 'status': 'ok', 'tier': page.fetch_tier, 'hash': page.content_hash}
+                        for attr in SECTION_ATTRS:
+                            self._graft(node, getattr(page, attr), seen, frontier)
+                    if self.progress:
+                        self.progress(len(self.pages), self.max_pages, node['url'])
+                    if self.cancelled():
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+                if self.cancelled():
+                    logger.info(f"사이트 크롤링 취소: {len(self.pages)}페이지까지 수집")
+                    break
+
+        logger.info(f"사이트 크롤링 완료: {len(self.pages)}페이지, 링크 {len(seen) - 1}개")
+        return self.pages
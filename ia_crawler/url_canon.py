@@ -0,0 +1,104 @@
+import hashlib
+import os
+from array import array
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# 같은 페이지를 가리키지만 유입 경로만 다른 파라미터. utm_*은 접두어로 처리
+TRACKING_PREFIXES = ('utm_',)
+TRACKING_PARAMS = frozenset([
+    'gclid', 'dclid', 'gbraid', 'wbraid', 'gclsrc', '_ga', '_gl',
+    'fbclid', 'msclkid', 'yclid', 'igshid', 'twclid', 'ttclid', 'li_fat_id',
+    'mc_cid', 'mc_eid', '_hsenc', '_hsmi', 'mkt_tok', 'ref_src', 'spm',
+    'n_media', 'n_query', 'n_rank', 'n_ad_group', 'n_ad', 'n_keyword_id', 'n_keyword',
+    'n_campaign_type', 'n_ad_group_type', 'n_match', 'napm',
+] + [name.strip().lower() for name in os.environ.get("IA_TRACKING_PARAMS", "").split(',') if name.strip()])
+
+
+def is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+@lru_cache(maxsize=65536)
+def canonicalize(url):
+    # 중복 판정용 정규 URL: 스킴/호스트 소문자, 기본 포트·프래그먼트·추적 파라미터 제거,
+    # 남은 쿼리는 이름순 정렬, 경로 끝의 /는 루트가 아니면 제거 (/a, /a/, /a?utm_source=x, /a#top -> /a)
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower().rstrip('.')
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+    query = ''
+    if parts.query:
+        params = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if not is_tracking_param(name)]
+        query = urlencode(sorted(params))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+def url_fingerprint(url):
+    # 정규 URL의 64비트 지문. 0은 빈 슬롯 표시로 쓰므로 피함
+    digest = hashlib.blake2b(canonicalize(url).encode('utf-8', 'surrogatepass'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+class UrlSeenSet:
+    # 정규 URL 지문(8바이트)만 저장하는 열린 주소법 해시 집합. URL 문자열을 들고 있지 않아
+    # 항목당 약 16바이트(적재율 0.5 이하)로 수백만 URL도 수십 MB 안에서 중복을 걸러냄.
+    # 64비트 지문이라 1억 개 수준까지 충돌 확률은 무시할 만함
+    MIN_CAPACITY = 1024
+
+    def __init__(self, capacity=MIN_CAPACITY):
+        size = self.MIN_CAPACITY
+        while size < capacity * 2:
+            size *= 2
+        self._slots = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    def _probe(self, slots, mask, fingerprint):
+        i = fingerprint & mask
+        while True:
+            value = slots[i]
+            if value == 0 or value == fingerprint:
+                return i
+            i = (i + 1) & mask
+
+    def _grow(self):
+        old = self._slots
+        self._slots = array('Q', bytes(8 * len(old) * 2))
+        self._mask = len(self._slots) - 1
+        for value in old:
+            if value:
+                self._slots[self._probe(self._slots, self._mask, value)] = value
+
+    def add(self, url):
+        # 새 URL이면 True, 이미 있던 URL이면 False
+        fingerprint = url_fingerprint(url)
+        i = self._probe(self._slots, self._mask, fingerprint)
+        if self._slots[i] == fingerprint:
+            return False
+        self._slots[i] = fingerprint
+        self._count += 1
+        if self._count * 2 > len(self._slots):
+            self._grow()
+        return True
+
+    def __contains__(self, url):
+        fingerprint = url_fingerprint(url)
+        return self._slots[self._probe(self._slots, self._mask, fingerprint)] == fingerprint
+
+    def __len__(self):
+        return self._count
+
+    def nbytes(self):
+        return self._slots.itemsize * len(self._slots)
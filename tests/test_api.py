@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+
+from ia_crawler.api import MAX_BODY_BYTES, CrawlApi
+from ia_crawler.jobs import JOB_HANDLERS
+
+
+class FakeQueue:
+    handlers = JOB_HANDLERS
+
+    def __init__(self):
+        self.submitted = []
+        self.refreshed = []
+
+    def submit(self, kind, refresh=False, **params):
+        self.submitted.append((kind, params))
+        self.refreshed.append(refresh)
+        return 'abc123'
+
+    def get(self, job_id, result=True):
+        return {'id': job_id, 'status': 'queued'}
+
+
+def _post(params):
+    queue = FakeQueue()
+    status, _, body = CrawlApi(queue).handle('POST', '/jobs', body=json.dumps(params).encode('utf-8'))
+    return status, json.loads(body), queue.submitted
+
+
+def test_submit_valid_jobs():
+    status, _, submitted = _post({'kind': 'crawl', 'url': 'example.com', 'site': True, 'max_pages': 50})
+    assert status == 202
+    assert submitted == [('crawl', {'url': 'https://example.com', 'site': True, 'max_pages': 50})]
+    status, _, submitted = _post({'kind': 'screenshots', 'urls': ['https://a.com/', 'http://b.com/x'], 'widths': [1920]})
+    assert status == 202
+    assert submitted[0][1]['urls'] == ['https://a.com/', 'http://b.com/x']
+
+
+def test_submit_refresh_flag():
+    queue = FakeQueue()
+    api = CrawlApi(queue)
+    api.handle('POST', '/jobs', body=json.dumps({'url': 'https://a.com/'}).encode('utf-8'))
+    status, _, _ = api.handle('POST', '/jobs', body=json.dumps({'url': 'https://a.com/', 'refresh': True}).encode('utf-8'))
+    assert status == 202
+    assert queue.submitted == [('crawl', {'url': 'https://a.com/'})] * 2
+    assert queue.refreshed == [False, True]
+
+
+@pytest.mark.parametrize('params', [
+    {'kind': 'screenshots', 'urls': 'http://a.com/'},
+    {'kind': 'screenshots', 'urls': []},
+    {'kind': 'screenshots', 'urls': ['file:///etc/passwd']},
+    {'kind': 'screenshots', 'urls': ['chrome://settings']},
+    {'kind': 'screenshots', 'urls': [123]},
+    {'kind': 'screenshots', 'urls': ['https://a.com/'], 'widths': [10]},
+    {'kind': 'crawl', 'url': 'file:///etc/passwd'},
+    {'kind': 'crawl', 'url': ''},
+    {'kind': 'crawl', 'url': 'https://a.com/', 'max_pages': '100'},
+    {'kind': 'crawl', 'url': 'https://a.com/', 'max_pages': 0},
+    {'kind': 'crawl', 'url': 'https://a.com/', 'concurrency': 1000},
+    {'kind': 'crawl', 'url': 'https://a.com/', 'max_depth': True},
+    {'kind': 'crawl', 'url': 'https://a.com/', 'site': 'yes'},
+    {'kind': 'crawl', 'url': 'https://a.com/', 'unknown': 1},
+    {'kind': 'crawl', 'url': 'https://a.com/', 'refresh': 1},
+])
+def test_submit_rejects_invalid_params(params):
+    status, body, submitted = _post(params)
+    assert status == 400, body
+    assert submitted == []
+
+
+def _asgi_post(chunks):
+    queue = FakeQueue()
+    received = []
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': i < len(chunks) - 1} for i, chunk in enumerate(chunks)]
+    sent = []
+
+    async def receive():
+        received.append(messages[len(received)])
+        return received[-1]
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': 'POST', 'path': '/jobs', 'query_string': b''}
+    asyncio.run(CrawlApi(queue).asgi(scope, receive, send))
+    return sent[0]['status'], json.loads(sent[1]['body']), len(received), queue.submitted
+
+
+def test_asgi_reads_chunked_body():
+    body = json.dumps({'url': 'https://a.com/'}).encode('utf-8')
+    status, _, _, submitted = _asgi_post([body[:5], body[5:], b''])
+    assert status == 202 and submitted == [('crawl', {'url': 'https://a.com/'})]
+
+
+def test_asgi_rejects_oversized_body_early():
+    # 한도를 넘는 청크가 오면 바로 413. 넘친 청크를 빼고 나머지로 처리하거나 끝까지 읽지 않음
+    body = json.dumps({'url': 'https://a.com/', 'pad': ' ' * MAX_BODY_BYTES}).encode('utf-8')
+    chunks = [body[:10], body[10:MAX_BODY_BYTES + 10]] + [b'x' * 1024] * 5
+    status, response, received, submitted = _asgi_post(chunks)
+    assert status == 413 and 'error' in response
+    assert received == 2 and submitted == []
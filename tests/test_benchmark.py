@@ -0,0 +1,45 @@
+import json
+import os
+
+import benchmark
+
+
+def test_fixtures_regenerate_on_generator_or_content_change(tmp_path, monkeypatch):
+    directory = str(tmp_path / 'fixtures')
+    paths = benchmark.build_fixtures(directory)
+    mtimes = {name: os.stat(path).st_mtime_ns for name, path in paths.items()}
+    hashes = benchmark.fixture_hashes(paths)
+    assert benchmark.build_fixtures(directory) == paths
+    assert {name: os.stat(path).st_mtime_ns for name, path in paths.items()} == mtimes
+
+    # 손으로 고친 픽스처는 원래 내용으로 되돌림
+    with open(paths['spa_shell'], 'a', encoding='utf-8') as f:
+        f.write('<!-- edited -->')
+    benchmark.build_fixtures(directory)
+    assert benchmark.fixture_hashes(paths) == hashes
+
+    # 생성기 버전이 바뀌면 모든 픽스처를 다시 생성
+    monkeypatch.setattr(benchmark, 'FIXTURE_VERSION', benchmark.FIXTURE_VERSION + 1)
+    benchmark.build_fixtures(directory)
+    with open(os.path.join(directory, benchmark.FIXTURE_MANIFEST), encoding='utf-8') as f:
+        manifest = json.load(f)
+    assert all(manifest[name]['generator'] == benchmark.generator_hash(name) for name in paths)
+
+
+def test_compare_flags_changed_corpus():
+    def report(p50, fixture_hash):
+        return {'meta': {'fixture_hashes': {'portal_megamenu': fixture_hash}},
+                'results': [{'name': 'parse', 'fixture': 'portal_megamenu', 'parser': 'lxml', 'p50_ms': p50},
+                            {'name': 'export', 'fixture': 'other', 'format': 'csv', 'p50_ms': p50}]}
+    rows = benchmark.compare(report(2.0, 'a'), report(1.0, 'a'))
+    assert [row['status'] for row in rows] == ['regression', 'regression']
+    rows = benchmark.compare(report(2.0, 'b'), report(1.0, 'a'))
+    assert [row['status'] for row in rows] == ['corpus-changed', 'regression']
+
+
+def test_committed_baseline_matches_current_corpus(tmp_path):
+    # 생성기를 고치면 bench_baseline.json도 다시 만들어 커밋해야 함 (python benchmark.py --save-baseline bench_baseline.json)
+    with open(benchmark.BASELINE_PATH, encoding='utf-8') as f:
+        baseline = json.load(f)
+    paths = benchmark.build_fixtures(str(tmp_path))
+    assert baseline['meta']['fixture_hashes'] == benchmark.fixture_hashes(paths)
@@ -0,0 +1,178 @@
+# 파서 백엔드(html.parser/lxml/selectolax)가 같은 문서에서 같은 IA 트리를 만드는지 골든 출력과 비교.
+# 골든 파일은 html.parser 결과로 만들며, 픽스처를 바꿨다면 `python tests/test_dom_parity.py`로 다시 생성
+import json
+import os
+import random
+
+import pytest
+
+from ia_crawler.crawler import SiteIACrawler
+from ia_crawler.dom import BACKENDS, fallback_needed, get_dom
+from ia_crawler.link_store import json_default
+from ia_crawler.section_classifier import classify_sections
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(HERE, 'fixtures')
+GOLDEN_DIR = os.path.join(HERE, 'golden')
+BASE_URL = 'https://www.example.co.kr/index.do'
+
+FIXTURES = sorted(name[:-len('.html')] for name in os.listdir(FIXTURE_DIR) if name.endswith('.html'))
+SECTIONS = (('gnb', 'GNB'), ('side', 'Side Menu'), ('footer', 'Footer'))
+
+
+def _describe(dom, element):
+    # 백엔드마다 노드 객체가 다르므로 섹션 요소는 태그/id/class로 비교
+    if element is None:
+        return None
+    return {'tag': dom.tag(element), 'id': dom.attr(element, 'id'), 'class': dom.classes(element)}
+
+
+def extract_ia(parser, html):
+    crawler = SiteIACrawler(parser=parser)
+    crawler.base_url = BASE_URL
+    soup = crawler.parse(html)
+    dom = crawler.dom
+    sections = classify_sections(soup, dom)
+    result = {
+        'needs_browser': crawler.needs_browser(soup),
+        'sections': {name: _describe(dom, element) for name, element in sections.items()},
+    }
+    for name, label in SECTIONS:
+        element = sections[name]
+        result[f'{name}_links'] = crawler.extract_links(soup, element, label) if element is not None else []
+    result['other_links'] = crawler.extract_links(soup, section="Other")
+    return json.loads(json.dumps(result, ensure_ascii=False, default=json_default))
+
+
+def _read(fixture):
+    with open(os.path.join(FIXTURE_DIR, f'{fixture}.html'), encoding='utf-8') as f:
+        return f.read()
+
+
+def _golden_path(fixture):
+    return os.path.join(GOLDEN_DIR, f'{fixture}.json')
+
+
+@pytest.mark.parametrize('parser', list(BACKENDS))
+@pytest.mark.parametrize('fixture', FIXTURES)
+def test_backend_matches_golden(fixture, parser):
+    if get_dom(parser).name != parser:
+        pytest.skip(f"{parser} 미설치")
+    with open(_golden_path(fixture), encoding='utf-8') as f:
+        expected = json.load(f)
+    assert extract_ia(parser, _read(fixture)) == expected
+
+
+@pytest.mark.parametrize('fixture, expected', [
+    ('portal_megamenu', False),
+    ('footer_heavy', False),
+    ('spa_shell', False),
+    ('malformed_unclosed_li', True),
+    ('malformed_nested_a', True),
+])
+def test_fallback_detection(fixture, expected):
+    assert fallback_needed(_read(fixture)) is expected
+
+
+@pytest.mark.parametrize('html, expected', [
+    ('<ul><li>A</li><li>B</li></ul>', False),
+    ('<ul><li>A<ul><li>A1</li></ul></li><li>B</li></ul>', False),
+    ('<ul><li>A<li>B</ul>', True),
+    ('<ul><li>A<ul><li>A1</ul><li>B</ul>', True),
+    ('<a href="/a">A</a><a href="/b">B</a>', False),
+    ('<a href="/a">A<a href="/b">B</a></a>', True),
+    ('<a href="/a">A<div><a href="/b">B</a></div></a>', True),
+    ('<!-- <li><li> --><script>"<a><a>"</script><abbr>x</abbr><link rel="x"><a>A</a>', False),
+    # <p> 안의 블록 요소, lxml(libxml2)만의 암시적 종료
+    ('<p class="gnb"><ul><li><a href="/a">A</a></li></ul></p>', True),
+    ('<p class="gnb"><span><a href="/a">A</a></span></p><div>x</div>', False),
+    ('<b><p>x</p></b>', True),
+    ('<h2><p>x</p></h2>', True),
+    ('<a href="/a"><table><tr><td>x</td></tr></table></a>', True),
+    ('<a href="/a"><div>A</div></a>', False),
+    # 어긋난 종료 태그
+    ('<label><header><a href="/a">A</a></label></header>', True),
+    ('<div><span><a href="/a">A</a></div>', False),
+    ('<div><b>A</div>B', True),
+    ('<ul><li><a href="/a">A</a></ul>', False),
+    # 테이블 밖으로 옮겨지는 요소와 텍스트
+    ('<table><tr><td><a href="/a">A</a></td></tr></table>', False),
+    ('<table><a href="/a">A</a><tr><td>x</td></tr></table>', True),
+    ('<table><tr>텍스트<td>x</td></tr></table>', True),
+    ('<div><td>x</td></div>', True),
+    # 빈 요소 표기, 외부 콘텐츠, RCDATA, 문서 구조
+    ('<div class="gnb"/><a href="/a">A</a>', True),
+    ('<svg><path d="M0"/><g><path d="M1"/></g></svg><a href="/a">A</a>', False),
+    ('<svg><div>x</div></svg>', True),
+    ('<title>메인</title><textarea>a < b</textarea>', False),
+    ('<title><a href="/a">A</a></title>', True),
+    ('<html><head><title>x</title></head><body><a href="/a">A</a></body></html>\n', False),
+    ('<html><body><a href="/a">A</a></body></html><a href="/b">B</a>', True),
+    ('<div>x</div><body class="main"><a href="/a">A</a></body>', True),
+    ('<select><option>A<option>B</select>', True),
+    ('<select><option>A</option><option>B</option></select>', False),
+    ('<div>' * 250 + 'x' + '</div>' * 250, False),
+    ('<div>' * 300 + 'x' + '</div>' * 300, True),
+])
+def test_fallback_detection_cases(html, expected):
+    assert fallback_needed(html) is expected
+
+
+FUZZ_TAGS = ['div', 'p', 'ul', 'ol', 'li', 'nav', 'header', 'footer', 'aside', 'section', 'span', 'b', 'strong', 'em', 'i',
+             'table', 'tr', 'td', 'h2', 'dl', 'dt', 'dd', 'form', 'select', 'option', 'button', 'label', 'svg', 'a', 'img', 'br',
+             'address', 'pre', 'center', 'fieldset', 'font', 'small', 'title', 'textarea']
+FUZZ_CHILDREN = {'ul': ['li'], 'ol': ['li'], 'dl': ['dt', 'dd'], 'table': ['tr', 'tbody'], 'tbody': ['tr'], 'tr': ['td', 'th'],
+                 'select': ['option'], 'svg': ['path', 'g']}
+FUZZ_CLASSES = ['gnb', 'menu', 'footer', 'sidebar', 'side-menu', 'nav', '']
+
+
+def _fuzz_tree(rng, tag, depth, out, links):
+    cls = rng.choice(FUZZ_CLASSES)
+    attrs = f' class="{cls}"' if cls else ''
+    if tag == 'a':
+        links.append(len(links))
+        attrs = f' href="/p{len(links)}"' + attrs
+    if tag in ('img', 'br') or tag == 'path':
+        out.append('<path d="M0"/>' if tag == 'path' else f'<{tag}{attrs}>')
+        return
+    out.append(f'<{tag}{attrs}>')
+    for _ in range(rng.randint(0, 4) if depth < 5 else 0):
+        if rng.random() < 0.3 and tag not in FUZZ_CHILDREN:
+            out.append(rng.choice(['메뉴', '이용약관', 'Home']))
+        else:
+            _fuzz_tree(rng, rng.choice(FUZZ_CHILDREN.get(tag, FUZZ_TAGS)), depth + 1, out, links)
+    out.append(f'</{tag}>')
+
+
+def fuzz_document(rng):
+    # 올바르게 중첩된 트리에 종료 태그 누락/끼어든 태그를 0~2개 섞음
+    out = []
+    _fuzz_tree(rng, rng.choice(['body', 'div', 'nav', 'ul']), 0, out, [])
+    for _ in range(rng.randint(0, 2)):
+        index = rng.randrange(len(out))
+        if out[index].startswith('</') and rng.random() < 0.4:
+            del out[index]
+        else:
+            out.insert(index, f'<{rng.choice(["/", ""])}{rng.choice(FUZZ_TAGS + ["li", "td", "p"])}>')
+    return ''.join(out)
+
+
+@pytest.mark.parametrize('parser', [name for name in BACKENDS if name != 'html.parser'])
+def test_fuzzed_documents_match_html_parser(parser):
+    # 폴백 판정을 통과한(빠른 백엔드로 파싱한) 문서도 html.parser와 IA가 같아야 함
+    if get_dom(parser).name != parser:
+        pytest.skip(f"{parser} 미설치")
+    rng = random.Random(20240501)
+    documents = [fuzz_document(rng) for _ in range(300)]
+    assert sum(not fallback_needed(html) for html in documents) > 100
+    for html in documents:
+        assert extract_ia(parser, html) == extract_ia('html.parser', html), html
+
+
+if __name__ == '__main__':
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    for fixture in FIXTURES:
+        with open(_golden_path(fixture), 'w', encoding='utf-8') as f:
+            json.dump(extract_ia('html.parser', _read(fixture)), f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(_golden_path(fixture))
@@ -0,0 +1,130 @@
+import threading
+
+import pytest
+
+from ia_crawler.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self, name):
+        self.name = name
+        self.alive = True
+        self.quit_called = False
+        self.calls = []
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError('session deleted')
+        self.calls.append('script')
+        return 1
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append(cmd)
+
+    def delete_all_cookies(self):
+        self.calls.append('delete_all_cookies')
+
+    def get(self, url):
+        self.calls.append(url)
+
+    def set_window_size(self, width, height):
+        self.calls.append((width, height))
+
+    def quit(self):
+        self.quit_called = True
+
+
+def _pool(**kwargs):
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver(len(drivers)))
+        return drivers[-1]
+    return DriverPool(factory, **kwargs), drivers
+
+
+def test_lease_reuses_warm_driver_and_resets_state():
+    pool, drivers = _pool(max_size=2)
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+    assert first is second
+    assert len(drivers) == 1
+    assert 'Network.clearBrowserCookies' in first.calls and 'about:blank' in first.calls
+    assert first.calls[-1] == pool.window_size
+    stats = pool.metrics()
+    assert (stats['leases'], stats['cold_starts'], stats['size'], stats['idle'], stats['in_use']) == (2, 1, 1, 1, 0)
+
+
+def test_pool_is_bounded_and_waiters_get_released_driver():
+    pool, drivers = _pool(max_size=1, acquire_timeout=5)
+    driver = pool.acquire()
+    leased = []
+    waiter = threading.Thread(target=lambda: leased.append(pool.acquire()))
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive() and pool.metrics()['waits'] == 1
+    pool.release(driver)
+    waiter.join(5)
+    assert leased == [driver]
+    assert len(drivers) == 1
+
+
+def test_acquire_times_out_when_exhausted():
+    pool, _ = _pool(max_size=1, acquire_timeout=0.05)
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+
+def test_recycles_after_max_uses_and_crash():
+    pool, drivers = _pool(max_size=1, max_uses=2)
+    for _ in range(2):
+        with pool.lease():
+            pass
+    assert drivers[0].quit_called
+    with pytest.raises(ValueError):
+        with pool.lease() as driver:
+            driver.alive = False
+            raise ValueError('boom')
+    assert driver is drivers[1] and driver.quit_called
+    # 유휴 중에 죽은 드라이버는 대여 시점에 교체
+    with pool.lease() as driver:
+        pass
+    driver.alive = False
+    with pool.lease() as replacement:
+        assert replacement is drivers[3]
+    stats = pool.metrics()
+    assert stats['recycles'] == 3
+    assert stats['crashes'] == 2
+    assert stats['size'] == 1
+
+
+def test_factory_failure_frees_slot():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('chromedriver missing')
+        return FakeDriver('ok')
+    pool = DriverPool(factory, max_size=1, acquire_timeout=0.05)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert pool.acquire().name == 'ok'
+
+
+def test_shutdown_quits_idle_and_returned_drivers():
+    pool, drivers = _pool(max_size=2)
+    busy = pool.acquire()
+    with pool.lease():
+        pass
+    idle = drivers[1] if busy is drivers[0] else drivers[0]
+    pool.shutdown()
+    assert idle.quit_called and not busy.quit_called
+    pool.release(busy)
+    assert busy.quit_called
+    assert pool.metrics()['size'] == 0
+    with pytest.raises(RuntimeError):
+        pool.acquire()
@@ -0,0 +1,23 @@
+import importlib.util
+
+import pytest
+
+from ia_crawler import exporters
+
+
+def test_check_format_accepts_known_formats():
+    for fmt in exporters.EXPORTERS:
+        if fmt not in exporters.FORMAT_REQUIREMENTS:
+            assert exporters.check_format(fmt) == fmt
+
+
+def test_check_format_rejects_unknown_format():
+    with pytest.raises(ValueError, match="지원하지 않는 형식"):
+        exporters.check_format('xlsx')
+
+
+def test_check_format_reports_missing_dependency(monkeypatch):
+    real_find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name, *args: None if name == 'pyarrow' else real_find_spec(name, *args))
+    with pytest.raises(ValueError, match="pip install pyarrow"):
+        exporters.check_format('parquet')
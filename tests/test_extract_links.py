@@ -0,0 +1,75 @@
+import pytest
+
+from ia_crawler.crawler import SiteIACrawler
+from ia_crawler.dom import BACKENDS, get_dom
+
+BASE_URL = 'https://www.example.com/main/index.do'
+
+
+@pytest.fixture(params=list(BACKENDS))
+def crawler(request):
+    if get_dom(request.param).name != request.param:
+        pytest.skip(f"{request.param} 미설치")
+    crawler = SiteIACrawler(parser=request.param)
+    crawler.base_url = BASE_URL
+    return crawler
+
+
+def _outline(links):
+    # (텍스트, 깊이, 하위) 형태로 줄여 비교
+    return [(link['text'], link['depth'], _outline(link.get('children', []))) for link in links]
+
+
+def _extract(crawler, html, section='GNB'):
+    soup = crawler.parse(html)
+    return crawler.extract_links(soup, section=section)
+
+
+def test_nested_menu_depths(crawler):
+    html = '''<ul>
+      <li><a href="/a">A</a>
+        <ul><li><a href="/a/1">A1</a><ul><li><a href="/a/1/x">A1x</a></li></ul></li><li><a href="/a/2">A2</a></li></ul>
+      </li>
+      <li><a href="/b">B</a></li>
+    </ul>'''
+    links = _extract(crawler, html)
+    assert _outline(links) == [
+        ('A', 1, [('A1', 2, [('A1x', 3, [])]), ('A2', 2, [])]),
+        ('B', 1, []),
+    ]
+    assert links[0]['section'] == 'GNB'
+    assert links[0]['children'][0]['url'] == 'https://www.example.com/a/1'
+
+
+def test_label_and_unlabelled_items(crawler):
+    # <li>의 첫 링크가 라벨, 나머지 링크는 라벨의 하위. 라벨 링크가 없는 <li>의 하위 항목은 같은 깊이에 둠
+    html = '''<ul>
+      <li><a href="/a">A</a><a href="/a/more">더보기</a></li>
+      <li><span>B</span><ul><li><a href="/b/1">B1</a></li></ul></li>
+    </ul>'''
+    assert _outline(_extract(crawler, html)) == [('A', 1, [('더보기', 2, [])]), ('B1', 1, [])]
+
+
+def test_skips_and_dedups(crawler):
+    html = '''<div>
+      <a href="/x">X</a><a href="/x/">X 다시</a><a href="/x#top">X 앵커</a><a href="/x?utm_source=gnb">X 추적</a>
+      <a href="#">빈</a><a href="javascript:void(0)">스크립트</a><a href="/empty"> </a><a>href 없음</a>
+      <a href="sub.do">상대</a><a href="https://other.com/">외부</a><a href="/full">ＦＵＬＬ</a>
+    </div>'''
+    links = _extract(crawler, html, section='Other')
+    assert [(link['text'], link['url']) for link in links] == [
+        ('X', 'https://www.example.com/x'),
+        ('상대', 'https://www.example.com/main/sub.do'),
+        ('외부', 'https://other.com/'),
+        ('FULL', 'https://www.example.com/full'),
+    ]
+
+
+def test_deep_nesting_is_iterative(crawler):
+    levels = 200
+    html = ''.join(f'<ul><li><a href="/l{i}">L{i}</a>' for i in range(levels)) + '</li></ul>' * levels
+    links = _extract(crawler, html)
+    deepest = links[0]
+    while deepest.get('children'):
+        deepest = deepest['children'][0]
+    assert deepest['depth'] == levels
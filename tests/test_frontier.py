@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from ia_crawler.frontier import RedisFrontier, SQLiteFrontier
+
+
+@pytest.fixture(params=['sqlite', 'redis'])
+def make_frontier(request, tmp_path):
+    # 여러 번 호출하면 같은 저장소를 쓰는 프런티어를 각각 만듦 (워커 프로세스 여러 개에 해당)
+    if request.param == 'redis':
+        fakeredis = pytest.importorskip('fakeredis')
+        pytest.importorskip('lupa')
+        server = fakeredis.FakeServer()
+
+    def make(**kwargs):
+        if request.param == 'sqlite':
+            return SQLiteFrontier(str(tmp_path / 'frontier.sqlite3'), **kwargs)
+        return RedisFrontier(None, client=fakeredis.FakeRedis(server=server, decode_responses=True), **kwargs)
+    return make
+
+
+def test_expired_lease_fails_after_max_attempts(make_frontier):
+    # 워커가 죽거나 멈춰 임대가 계속 만료되는 페이지는 max_attempts 뒤 실패로 확정되고 크롤링이 끝나야 함
+    frontier = make_frontier(visibility_timeout=-1, max_attempts=2)
+    crawl = frontier.create('https://example.com/')
+    assert [item['attempts'] for item in frontier.lease(crawl, 'w1')] == [1]
+    assert [item['attempts'] for item in frontier.lease(crawl, 'w2')] == [2]
+    assert frontier.lease(crawl, 'w3') == []
+    assert frontier.finished(crawl)
+    pages = list(frontier.pages(crawl))
+    assert [page['state'] for page in pages] == ['failed']
+    assert '임대 기한 초과' in pages[0]['error']
+
+
+def test_stale_worker_cannot_complete_or_extend(make_frontier):
+    frontier = make_frontier(visibility_timeout=-1)
+    crawl = frontier.create('https://example.com/')
+    key = frontier.lease(crawl, 'stale')[0]['key']
+    assert frontier.lease(crawl, 'owner')[0]['key'] == key  # 기한이 지나 다른 워커가 가져감
+
+    frontier.extend(crawl, key, 'stale')
+    frontier.complete(crawl, key, 'stale', {'ia': 'stale'})
+    assert frontier.stats(crawl)['done'] == 0
+
+    frontier.complete(crawl, key, 'owner', {'ia': 'owner'})
+    assert [page['result'] for page in frontier.pages(crawl)] == [{'ia': 'owner'}]
+    assert frontier.finished(crawl)
+
+
+def test_fail_requeues_until_max_attempts(make_frontier):
+    frontier = make_frontier(max_attempts=2)
+    crawl = frontier.create('https://example.com/')
+    key = frontier.lease(crawl, 'w')[0]['key']
+    frontier.fail(crawl, key, 'w', 'boom')
+    assert frontier.stats(crawl)['pending'] == 1
+    frontier.lease(crawl, 'w')
+    frontier.fail(crawl, key, 'w', 'boom')
+    assert frontier.stats(crawl)['failed'] == 1
+    assert frontier.finished(crawl)
+
+
+def test_crawl_delay_is_shared_across_workers(make_frontier):
+    # 워커마다 따로 Crawl-delay를 지키면 N배 빨라지므로, 3개 워커의 요청 4번은 간격 3번 이상 걸려야 함
+    crawl = make_frontier().create('https://example.com/')
+    frontiers = [make_frontier() for _ in range(3)]
+    started = []
+
+    def fetch(frontier, times):
+        for _ in range(times):
+            frontier.wait_for_host(crawl, 'example.com', 0.2)
+            started.append(time.monotonic())
+
+    threads = [threading.Thread(target=fetch, args=(frontier, 2 if i == 0 else 1)) for i, frontier in enumerate(frontiers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    started.sort()
+    assert len(started) == 4
+    assert min(b - a for a, b in zip(started, started[1:])) >= 0.15
+
+
+def test_concurrent_add_dedups_and_caps_max_pages(make_frontier):
+    # 여러 워커가 같은 링크를 동시에 밀어 넣어도 한 번씩만, max_pages까지만 들어가고 임대도 겹치지 않음
+    crawl = make_frontier().create('https://example.com/', max_pages=30)
+    links = [(f'https://example.com/소개/{i}', 1) for i in range(50)]
+    frontiers = [make_frontier() for _ in range(4)]
+    added = []
+    threads = [threading.Thread(target=lambda frontier: added.append(frontier.add(crawl, links)), args=(frontier,))
+               for frontier in frontiers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(added) == 29
+    leased = []
+    threads = [threading.Thread(target=lambda frontier, worker: leased.extend(frontier.lease(crawl, worker, n=10)),
+                                args=(frontier, f'w{i}')) for i, frontier in enumerate(frontiers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(leased) == 30 and len({item['key'] for item in leased}) == 30
+    assert [item['url'] for item in leased if item['depth'] == 0] == ['https://example.com/']
+    assert {item['url'] for item in leased if item['depth'] == 1} <= {url for url, _ in links}
+    assert frontiers[0].stats(crawl) == {'pending': 0, 'leased': 30, 'done': 0, 'failed': 0}
@@ -0,0 +1,63 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ia_crawler.http_fetch import AsyncHttpFetcher, decode_html
+
+MENU = '회사소개 제품 고객센터 똠방각하'  # '똠'은 EUC-KR(KS X 1001)에는 없고 CP949 확장 영역에만 있음
+EUC_KR_PAGE = (
+    '<html><head><meta charset="euc-kr"><title>메뉴</title></head>'
+    f'<body><nav class="gnb"><a href="/about">{MENU}</a></nav></body></html>'
+).encode('cp949')
+PAGES = {
+    '/meta-only': ('text/html', EUC_KR_PAGE),
+    '/http-equiv': ('text/html', EUC_KR_PAGE.replace(b'<meta charset="euc-kr">',
+                                                      b'<meta http-equiv="Content-Type" content="text/html; charset=euc-kr">')),
+    '/header': ('text/html; charset=euc-kr', EUC_KR_PAGE.replace(b'<meta charset="euc-kr">', b'')),
+    '/header-wins': ('text/html; charset=euc-kr', EUC_KR_PAGE.replace(b'euc-kr', b'utf-8')),
+    '/sniffed': ('text/html', EUC_KR_PAGE.replace(b'<meta charset="euc-kr">', b'')),
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        content_type, body = PAGES[self.path]
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+
+
+@pytest.fixture(scope='module')
+def fetcher():
+    fetcher = AsyncHttpFetcher()
+    yield fetcher
+    fetcher.close()
+
+
+@pytest.mark.parametrize('path', list(PAGES))
+def test_fetch_decodes_like_a_browser(server, fetcher, path):
+    page = fetcher.fetch(server + path)
+    assert MENU in page['text']
+    assert '�' not in page['text']
+
+
+def test_decode_html_order():
+    utf8 = '<meta charset="utf-8">한글'.encode('utf-8')
+    assert decode_html(utf8) == '<meta charset="utf-8">한글'
+    assert decode_html('﻿한글'.encode('utf-8')) == '한글'
+    assert decode_html('한글'.encode('cp949'), 'euc-kr') == '한글'
+    assert decode_html('<meta charset="bogus">한글'.encode('utf-8')) == '<meta charset="bogus">한글'
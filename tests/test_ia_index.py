@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from ia_crawler.ia_index import SEARCH_CACHE_SIZE, IaIndex
+
+
+def _link(text, children=()):
+    return {'text': text, 'url': f"https://a.com/{text.lower()}", 'children': list(children)}
+
+
+IA = {
+    'gnb_links': [
+        _link('About', [_link('History'), _link('CEO', [_link('Greeting')])]),
+        _link('Products', [_link('Phone'), _link('TV')]),
+    ],
+    'footer_links': [_link('Privacy'), _link('Terms')],
+}
+
+
+@pytest.fixture
+def index():
+    return IaIndex(IA)
+
+
+def _texts(index, rows):
+    return [index.get(row)['text'] for row in rows]
+
+
+def test_preorder_rows_and_spans(index):
+    assert _texts(index, range(*index.spans['gnb_links'])) == ['About', 'History', 'CEO', 'Greeting', 'Products', 'Phone', 'TV']
+    assert index.size('gnb_links') == 7 and index.size('footer_links') == 2
+    assert index.size('side_links') == 0 and index.visible('side_links') == []
+    ceo = 2
+    assert index.get(ceo) == {'section': 'gnb_links', 'depth': 1, 'text': 'CEO', 'url': 'https://a.com/ceo', 'parent': 0,
+                              'children': 1}
+    assert index.ancestors(3) == [0, ceo]
+    assert index.ancestors(0) == []
+
+
+def test_visible_follows_expanded_rows(index):
+    assert _texts(index, index.visible('gnb_links')) == ['About', 'Products']
+    assert _texts(index, index.visible('gnb_links', {0})) == ['About', 'History', 'CEO', 'Products']
+    # 접힌 부모 아래의 펼친 행은 보이지 않음
+    assert _texts(index, index.visible('gnb_links', {2})) == ['About', 'Products']
+    assert _texts(index, index.visible('gnb_links', {0, 2, 4})) == \
+        ['About', 'History', 'CEO', 'Greeting', 'Products', 'Phone', 'TV']
+
+
+def test_search_within_section(index):
+    assert _texts(index, index.search('gnb_links', 'GREET')) == ['Greeting']
+    # URL도 검색 대상
+    assert _texts(index, index.search('gnb_links', 'a.com/p')) == ['Products', 'Phone']
+    assert index.search('footer_links', 'phone') == []
+    assert index.search('gnb_links', 'greet') is index.search('gnb_links', 'Greet')
+
+
+def test_search_cache_is_bounded():
+    links = [_link(f"L{i}") for i in range(50)]
+    index = IaIndex({'other_links': links})
+    for i in range(SEARCH_CACHE_SIZE * 2):
+        assert _texts(index, index.search('other_links', f"l{i}")) == [text for text in (f"L{j}" for j in range(50))
+                                                                      if f"l{i}" in text.lower()]
+    assert len(index._searches) <= SEARCH_CACHE_SIZE
+
+
+def test_search_cache_shared_across_threads():
+    # 결과 화면의 인덱스는 st.cache_resource로 여러 세션이 공유하므로 동시에 검색해도 캐시가 깨지지 않아야 함
+    index = IaIndex({'other_links': [_link(f"L{i}") for i in range(200)]})
+    errors = []
+
+    def search(offset):
+        try:
+            for i in range(300):
+                needle = f"l{(i + offset) % 40}"
+                assert all(needle in index.get(row)['text'].lower() for row in index.search('other_links', needle))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=search, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(index._searches) <= SEARCH_CACHE_SIZE
+
+
+def test_search_cache_evicts_least_recently_used():
+    index = IaIndex(IA)
+    first = index.search('gnb_links', 'about')
+    for i in range(SEARCH_CACHE_SIZE - 1):
+        index.search('gnb_links', f"q{i}")
+        assert index.search('gnb_links', 'about') is first
+    index.search('gnb_links', 'new')
+    assert index.search('gnb_links', 'about') is first
+
+
+def test_paging_large_section():
+    # 화면과 같은 방식으로 잘라 쓸 때 행이 빠지거나 겹치지 않음
+    links = [_link(f"M{i}", [_link(f"M{i}-{j}") for j in range(3)]) for i in range(120)]
+    index = IaIndex({'gnb_links': links})
+    rows = index.visible('gnb_links', set(index.roots['gnb_links'][::2]))
+    size = 50
+    pages = [rows[offset:offset + size] for offset in range(0, len(rows), size)]
+    assert sum(pages, []) == rows and len(rows) == 120 + 60 * 3
+    assert all(index.get(row)['depth'] in (0, 1) for row in rows)
+
+
+def test_index_from_link_nodes_matches_dicts():
+    # 화면은 크롤러의 압축 노드(LinkNode)로 인덱스를 만듦. URL 문자열은 크롤러의 문자열 테이블과 공유
+    from ia_crawler.crawler import SiteIACrawler
+
+    crawler = SiteIACrawler()
+    crawler.load_ia(IA)
+    index = IaIndex(crawler.to_ia())
+    assert index.rows == IaIndex(IA).rows
+    assert index.rows[0][3] is crawler.strings[crawler.strings.lookup('https://a.com/about')]
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from ia_crawler.ia_snapshot import SnapshotStore, changed_pages, diff_ia
+
+SITE = 'https://www.example.com/'
+
+
+def _ia(*texts):
+    return {'gnb_links': [{'text': text, 'url': f"https://www.example.com/{i}", 'children': []} for i, text in enumerate(texts)]}
+
+
+def test_concurrent_saves_get_distinct_versions(tmp_path):
+    # 여러 프로세스에 해당하는 저장소 인스턴스가 동시에 저장해도 버전이 겹치거나 저장이 실패하지 않음
+    path = str(tmp_path / 'snapshots.sqlite3')
+    stores = [SnapshotStore(path, keep=0) for _ in range(4)]
+    versions, errors = [], []
+
+    def save(store):
+        try:
+            for _ in range(10):
+                versions.append(store.save(SITE, _ia('A')))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(store,)) for store in stores]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert sorted(versions) == list(range(1, 41))
+
+
+def test_keep_latest_versions(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'snapshots.sqlite3'), keep=3)
+    for i in range(5):
+        store.save(SITE, _ia(f"v{i}"))
+    store.save('https://other.com/', _ia('x'))
+    assert [item['version'] for item in store.versions(SITE)] == [3, 4, 5]
+    assert store.get(SITE)['ia'] == _ia('v4')
+    assert store.get(SITE, 1) is None
+    assert [item['version'] for item in store.versions('https://other.com/')] == [1]
+
+
+def test_max_age_keeps_latest(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'snapshots.sqlite3'), keep=0, max_age=60)
+    store.save(SITE, _ia('old'))
+    store.save(SITE, _ia('older'))
+    with store._connect() as conn:
+        conn.execute("UPDATE snapshots SET created_at = ?", (time.time() - 3600,))
+    assert [item['version'] for item in store.versions(SITE)] == [1, 2]
+    store.save(SITE, _ia('new'))
+    assert [item['version'] for item in store.versions(SITE)] == [3]
+    # 오래됐더라도 사이트의 유일한(최신) 버전은 남김
+    with store._connect() as conn:
+        conn.execute("UPDATE snapshots SET created_at = ?", (time.time() - 3600,))
+    assert store.save(SITE, _ia('newer')) == 4
+    assert [item['version'] for item in store.versions(SITE)] == [4]
+
+
+def test_diff_and_changed_pages():
+    old = _ia('회사소개', '제품')
+    new = {'gnb_links': [{'text': '기업소개', 'url': 'https://www.example.com/0', 'children': [
+        {'text': '제품', 'url': 'https://www.example.com/1', 'children': []}]}]}
+    changes = {(change['type'], change['url']) for change in diff_ia(old, new)}
+    assert changes == {('renamed', 'https://www.example.com/0'), ('moved', 'https://www.example.com/1')}
+    assert changed_pages({'a': {'hash': '1'}, 'b': {'hash': '2'}}, {'a': {'hash': '1'}, 'b': {'hash': '3'}, 'c': {'hash': '4'}}) == ['b']
@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+
+from ia_crawler import jobs
+from ia_crawler.jobs import STALE_AFTER, JobQueue, JobStore, dedupe_key
+
+
+def _wait(queue, job_id, statuses=('done', 'failed', 'cancelled'), timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"{job_id}: {queue.get(job_id)['status']}")
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+    release = threading.Event()
+
+    def blocking(ctx, url, fail=False):
+        while not release.wait(0.01):
+            ctx.progress(0.5, url, force=True)
+            ctx.check()
+        if fail:
+            raise RuntimeError('HTTP 500')
+        return {'url': url}
+
+    def make(**kwargs):
+        queue = JobQueue({'crawl': blocking}, store=JobStore(str(tmp_path / 'jobs.sqlite3')), **kwargs)
+        queues.append(queue)
+        return queue
+    make.release = release
+    yield make
+    release.set()
+    for queue in queues:
+        queue.shutdown()
+
+
+def test_dedupe_key_normalizes_url_and_param_order():
+    assert dedupe_key('crawl', {'url': 'https://A.com', 'site': True, 'max_pages': 5}) == \
+        dedupe_key('crawl', {'max_pages': 5, 'site': True, 'url': 'https://a.com/'})
+    assert dedupe_key('crawl', {'url': 'https://a.com/'}) != dedupe_key('crawl', {'url': 'https://a.com/', 'site': True})
+    assert dedupe_key('crawl', {'url': 'https://a.com/'}) != dedupe_key('screenshots', {'url': 'https://a.com/'})
+
+
+def test_same_request_reuses_running_and_recent_job(make_queue):
+    queue = make_queue()
+    job_id = queue.submit('crawl', url='https://a.com')
+    assert queue.submit('crawl', url='https://a.com/') == job_id
+    other = queue.submit('crawl', url='https://b.com')
+    assert other != job_id
+    make_queue.release.set()
+    assert _wait(queue, job_id)['result'] == {'url': 'https://a.com'}
+    assert queue.submit('crawl', url='https://a.com') == job_id
+    assert queue.get(job_id, result=False)['result'] is None
+
+
+def test_refresh_bypasses_recent_result(make_queue):
+    queue = make_queue()
+    make_queue.release.set()
+    job_id = queue.submit('crawl', url='https://a.com')
+    _wait(queue, job_id)
+    fresh = queue.submit('crawl', refresh=True, url='https://a.com')
+    assert fresh != job_id
+    # 이후 일반 요청은 새 결과를 재사용
+    _wait(queue, fresh)
+    assert queue.submit('crawl', url='https://a.com') == fresh
+
+
+def test_expired_or_failed_results_are_not_reused(make_queue):
+    queue = make_queue(result_ttl=-1)
+    make_queue.release.set()
+    job_id = queue.submit('crawl', url='https://a.com')
+    _wait(queue, job_id)
+    assert queue.submit('crawl', url='https://a.com') != job_id
+    failed = queue.submit('crawl', url='https://c.com', fail=True)
+    assert _wait(queue, failed)['error'] == 'HTTP 500'
+    assert queue.submit('crawl', url='https://c.com', fail=True) != failed
+
+
+def test_cancel_running_and_queued_jobs(make_queue):
+    queue = make_queue(workers=1)
+    running = queue.submit('crawl', url='https://a.com')
+    queued = queue.submit('crawl', url='https://b.com')
+    _wait(queue, running, statuses=('running',))
+    queue.cancel(queued)
+    queue.cancel(running)
+    assert _wait(queue, running)['status'] == 'cancelled'
+    assert _wait(queue, queued)['status'] == 'cancelled'
+    # 취소된 작업은 재사용하지 않음
+    assert queue.submit('crawl', url='https://a.com') != running
+
+
+def test_cancel_from_another_process(make_queue, tmp_path):
+    # 다른 프로세스(별도 JobStore)의 취소 요청은 progress 보고 때 전달됨
+    queue = make_queue()
+    job_id = queue.submit('crawl', url='https://a.com')
+    _wait(queue, job_id, statuses=('running',))
+    JobStore(str(tmp_path / 'jobs.sqlite3')).request_cancel(job_id)
+    assert _wait(queue, job_id)['status'] == 'cancelled'
+
+
+def test_orphaned_jobs_fail_on_startup(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    job_id, created = store.create_or_reuse('crawl', {'url': 'https://a.com/'}, 'k')
+    assert created
+    store.update(job_id, status='running', owner=2 ** 22 + 12345)  # 존재하지 않는 PID
+    assert store.fail_orphans() == 1
+    job = store.get(job_id)
+    assert job['status'] == 'failed' and job['finished_at'] is not None
+    assert store.create_or_reuse('crawl', {'url': 'https://a.com/'}, 'k')[0] != job_id
+
+
+def test_stale_running_job_is_replaced(tmp_path):
+    # 살아 있는 PID라도(다른 호스트 등) heartbeat가 끊긴 진행 중 작업은 재사용하지 않고 실패로 바꿈
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    job_id, _ = store.create_or_reuse('crawl', {'url': 'https://a.com/'}, 'k')
+    store.update(job_id, status='running', owner=1)
+    assert store.create_or_reuse('crawl', {'url': 'https://a.com/'}, 'k') == (job_id, False)
+    store._conn().execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (time.time() - STALE_AFTER - 1, job_id))
+    new_id, created = store.create_or_reuse('crawl', {'url': 'https://a.com/'}, 'k')
+    assert created and new_id != job_id
+    assert store.get(job_id)['status'] == 'failed'
+
+
+def test_heartbeat_keeps_own_jobs_fresh(tmp_path, monkeypatch):
+    # 작업 함수가 진행률을 보고하지 않는 동안에도(긴 요청 등) 실행 중인 프로세스가 updated_at을 갱신
+    monkeypatch.setattr(jobs, 'HEARTBEAT_INTERVAL', 0.01)
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    job_id, _ = store.create_or_reuse('crawl', {'url': 'https://a.com/'}, 'k')
+    store.update(job_id, status='running')
+    store._conn().execute("UPDATE jobs SET updated_at = 0 WHERE id = ?", (job_id,))
+    queue = JobQueue({}, store=store)
+    try:
+        deadline = time.monotonic() + 5
+        while store.get(job_id)['updated_at'] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.get(job_id)['updated_at'] > time.time() - STALE_AFTER
+        assert store.create_or_reuse('crawl', {'url': 'https://a.com/'}, 'k') == (job_id, False)
+    finally:
+        queue.shutdown()
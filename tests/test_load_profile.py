@@ -0,0 +1,39 @@
+import fnmatch
+
+import pytest
+
+from ia_crawler.load_profile import blocked_url_patterns
+
+
+def _blocked(url, patterns):
+    # Network.setBlockedURLs와 같이 *만 와일드카드로 취급
+    return any(fnmatch.fnmatchcase(url, pattern.replace('[', '[[]').replace('?', '[?]')) for pattern in patterns)
+
+
+@pytest.mark.parametrize('url', [
+    'https://www.example.com/img/logo.png',
+    'https://cdn.example.com/a/b/banner.gif?v=3',
+    'https://www.example.com/favicon.ico',
+    'https://cdn.example.com/fonts/NotoSans.woff2?display=swap',
+    'https://cdn.example.com/video/intro.mov',
+])
+def test_blocks_resources_by_extension(url):
+    assert _blocked(url, blocked_url_patterns(('image', 'font', 'media'), ()))
+
+
+@pytest.mark.parametrize('url', [
+    'https://m.movie.daum.net/',
+    'https://www.icon.example.com/',
+    'https://m.gift.example.com/index.html',
+    'https://www.example.com/static/app.icons.js',
+    'https://www.example.com/api/svg-menu?lang=ko',
+    'https://www.example.com/news/ogg-festival.do',
+])
+def test_does_not_block_documents_or_scripts(url):
+    assert not _blocked(url, blocked_url_patterns(('image', 'font', 'media'), ()))
+
+
+def test_blocks_tracker_domains():
+    patterns = blocked_url_patterns((), ('doubleclick.net',))
+    assert _blocked('https://stats.g.doubleclick.net/collect?v=1', patterns)
+    assert not _blocked('https://www.example.com/doubleclick.net.html', patterns)
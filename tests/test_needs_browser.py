@@ -0,0 +1,46 @@
+import pytest
+
+from ia_crawler.crawler import MIN_STATIC_LINKS, SiteIACrawler
+from ia_crawler.dom import BACKENDS, get_dom
+
+
+def _links(n, href=True):
+    return ''.join(f'<a href="/p{i}">메뉴{i}</a>' if href else f'<a>메뉴{i}</a>' for i in range(n))
+
+
+STATIC_PAGE = f'<html><body><header><nav class="gnb">{_links(MIN_STATIC_LINKS)}</nav></header><main>본문</main></body></html>'
+
+
+@pytest.fixture(params=list(BACKENDS))
+def crawler(request):
+    if get_dom(request.param).name != request.param:
+        pytest.skip(f"{request.param} 미설치")
+    return SiteIACrawler(parser=request.param)
+
+
+def _reason(crawler, html):
+    return crawler.needs_browser(crawler.parse(html))
+
+
+def test_static_page_stays_on_http_tier(crawler):
+    assert _reason(crawler, STATIC_PAGE) is None
+    assert crawler.dom_nodes > MIN_STATIC_LINKS
+
+
+@pytest.mark.parametrize('root_id', ['root', '__next'])
+def test_empty_spa_root(crawler, root_id):
+    html = f'<html><body><div id="{root_id}"></div><footer>{_links(MIN_STATIC_LINKS)}</footer></body></html>'
+    assert _reason(crawler, html) == f"SPA 셸 마커(#{root_id})가 비어 있음"
+    # 서버 렌더링으로 내용이 채워진 루트는 정적으로 처리
+    rendered = html.replace('></div>', f'>{_links(3)}</div>')
+    assert _reason(crawler, rendered) is None
+
+
+def test_navigation_without_links(crawler):
+    html = f'<html><body><header><nav class="gnb"><button>메뉴</button></nav></header><div>{_links(20)}</div></body></html>'
+    assert _reason(crawler, html) == "내비게이션 컨테이너에 링크가 없음"
+
+
+def test_too_few_links(crawler):
+    html = f'<html><body><div>{_links(MIN_STATIC_LINKS - 1)}{_links(5, href=False)}</div></body></html>'
+    assert _reason(crawler, html) == f"<a> 태그가 {MIN_STATIC_LINKS - 1}개뿐임 (기준 {MIN_STATIC_LINKS}개)"
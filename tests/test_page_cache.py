@@ -0,0 +1,53 @@
+import os
+
+from ia_crawler import page_cache
+from ia_crawler.crawler import SiteIACrawler
+from ia_crawler.page_cache import PageCache, ia_reusable
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+URL = 'https://www.example.co.kr/'
+
+
+class StaticFetcher:
+    # 항상 같은 SPA 셸을 200으로 돌려주는 HTTP 수집기
+    def __init__(self, text):
+        self.text = text
+
+    def fetch(self, url, cached=None):
+        return {'text': self.text, 'headers': {}, 'not_modified': False}
+
+
+def _rendered(menu):
+    links = ''.join(f'<li><a href="/{name}">{name}</a></li>' for name in menu)
+    return f'<html><body><div id="root"><header><nav class="gnb"><ul>{links}</ul></nav></header></div></body></html>'
+
+
+def _crawl(cache, menu):
+    with open(os.path.join(FIXTURE_DIR, 'spa_shell.html'), encoding='utf-8') as f:
+        crawler = SiteIACrawler(http_fetcher=StaticFetcher(f.read()), page_cache=cache, parser='html.parser')
+    crawler.fetch_browser = lambda url: _rendered(menu)
+    assert crawler.crawl(URL) is True
+    return crawler
+
+
+def test_ia_reusable():
+    entry = {'ia': {}, 'tier': 'http', 'fetched_at': 0.0}
+    assert ia_reusable(entry, now=1e9)
+    assert not ia_reusable(dict(entry, ia=None))
+    assert ia_reusable(dict(entry, tier='browser'), now=10.0, browser_ttl=60)
+    assert not ia_reusable(dict(entry, tier='browser'), now=100.0, browser_ttl=60)
+
+
+def test_browser_tier_ia_is_rerendered_after_ttl(tmp_path, monkeypatch):
+    cache = PageCache(str(tmp_path / 'pages.sqlite3'))
+    first = _crawl(cache, ['a', 'b'])
+    assert first.fetch_tier == 'browser'
+
+    # HTML 셸은 그대로지만 TTL 안에서는 저장된 IA를 재사용
+    assert _crawl(cache, ['a', 'b', 'c']).fetch_tier == 'cache'
+
+    # TTL이 지나면 다시 렌더링해 JS가 그린 메뉴 변경을 반영
+    monkeypatch.setattr(page_cache, 'BROWSER_IA_TTL', 0)
+    again = _crawl(cache, ['a', 'b', 'c'])
+    assert again.fetch_tier == 'browser'
+    assert [link['text'] for link in again.gnb_links] == ['a', 'b', 'c']
@@ -0,0 +1,134 @@
+import gzip
+import io
+
+import pytest
+
+from ia_crawler.robots import RobotsPolicy, link_text, parse_robots, select_group, sitemap_seeds
+
+
+class HTTPError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+class FakeFetcher:
+    def __init__(self, files):
+        self.files = files
+        self.opened = []
+
+    def open_stream(self, url):
+        self.opened.append(url)
+        body = self.files.get(url)
+        if isinstance(body, int):
+            raise HTTPError(body)
+        if body is None:
+            raise HTTPError(404)
+        return io.BufferedReader(io.BytesIO(body.encode('utf-8') if isinstance(body, str) else body))
+
+
+ROBOTS = """\
+User-agent: *
+Disallow: /admin/
+Disallow: /search
+Allow: /admin/public/
+Crawl-delay: 0.5   # 초 단위 소수도 허용
+
+User-agent: IACrawler
+User-agent: OtherBot
+Crawl-delay: 2
+Disallow: /private/
+
+Sitemap: https://www.example.com/sitemap_index.xml
+"""
+
+
+def test_groups_by_agent():
+    groups, sitemaps = parse_robots(ROBOTS.splitlines())
+    assert groups['iacrawler'] == groups['otherbot']
+    assert groups['iacrawler'] == {'rules': [('/private/', False)], 'delay': 2.0}
+    assert groups['*']['delay'] == 0.5
+    assert sitemaps == ['https://www.example.com/sitemap_index.xml']
+    assert select_group(groups, 'Mozilla/5.0 (compatible; OtherBot/2.1)') is groups['otherbot']
+    assert select_group(groups, 'SomeBot') is groups['*']
+    assert parse_robots(['User-agent: *', 'Crawl-delay: soon']) == ({'*': {'rules': []}}, [])
+
+
+def test_longest_match_and_wildcards():
+    robots = """\
+User-agent: *
+Disallow: /
+Allow: /$
+Allow: /board/*/view
+Disallow: /*.pdf$
+Allow: /docs/
+Disallow: /docs
+Disallow: /%EA%B4%80%EB%A6%AC
+"""
+    policy = RobotsPolicy('https://a.com/', FakeFetcher({'https://a.com/robots.txt': robots}))
+    assert policy.allowed('https://a.com/')
+    assert not policy.allowed('https://a.com/index.do')
+    assert policy.allowed('https://a.com/board/notice/view?id=1')
+    assert not policy.allowed('https://a.com/board/notice/list')
+    # 길이가 같으면 Allow 우선, 더 긴 패턴이 이김
+    assert policy.allowed('https://a.com/docs/guide')
+    assert not policy.allowed('https://a.com/docs/guide.pdf')
+    assert not policy.allowed('https://a.com/관리/x')
+    assert policy.allowed('https://a.com/robots.txt')
+
+
+def test_policy_rules_and_delay():
+    fetcher = FakeFetcher({'https://www.example.com/robots.txt': ROBOTS})
+    policy = RobotsPolicy('https://www.example.com/index.do', fetcher)
+    assert policy.allowed('https://www.example.com/about')
+    assert not policy.allowed('https://www.example.com/admin/users')
+    assert policy.allowed('https://www.example.com/admin/public/faq')
+    assert not policy.allowed('https://www.example.com/search?q=x')
+    assert policy.crawl_delay == 0.5
+    assert policy.sitemaps == ['https://www.example.com/sitemap_index.xml']
+
+    bot = RobotsPolicy('https://www.example.com/', fetcher, agent='IACrawler/1.0')
+    assert bot.crawl_delay == 2.0
+    assert not bot.allowed('https://www.example.com/private/x')
+    assert bot.allowed('https://www.example.com/admin/users')
+
+
+def test_request_rate_and_delay_cap():
+    fetcher = FakeFetcher({'https://a.com/robots.txt': "User-agent: *\nRequest-rate: 1/4\n"})
+    assert RobotsPolicy('https://a.com/', fetcher).crawl_delay == 4.0
+    fetcher = FakeFetcher({'https://a.com/robots.txt': "User-agent: *\nCrawl-delay: 3600\n"})
+    assert RobotsPolicy('https://a.com/', fetcher).crawl_delay == 30.0
+
+
+@pytest.mark.parametrize('status, allowed', [(404, True), (500, True), (401, False), (403, False)])
+def test_unreadable_robots(status, allowed):
+    policy = RobotsPolicy('https://a.com/', FakeFetcher({'https://a.com/robots.txt': status}))
+    assert policy.allowed('https://a.com/page') is allowed
+    assert policy.crawl_delay == 0
+    assert policy.sitemaps == ['https://a.com/sitemap.xml']
+
+
+def test_sitemap_seeds_follow_index_and_filter():
+    urlset = """<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+      <url><loc>https://www.example.com/careers/jobs/</loc></url>
+      <url><loc>https://www.example.com/careers/jobs</loc></url>
+      <url><loc>https://www.example.com/admin/secret</loc></url>
+      <url><loc>https://other.com/x</loc></url>
+      <url><loc>https://www.example.com/%EC%86%8C%EA%B0%9C</loc></url>
+    </urlset>"""
+    fetcher = FakeFetcher({
+        'https://www.example.com/robots.txt': ROBOTS,
+        'https://www.example.com/sitemap_index.xml': """<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <sitemap><loc>https://www.example.com/a.xml.gz</loc></sitemap>
+            <sitemap><loc>https://www.example.com/b.txt</loc></sitemap>
+            <sitemap><loc>https://www.example.com/missing.xml</loc></sitemap>
+        </sitemapindex>""",
+        'https://www.example.com/a.xml.gz': gzip.compress(urlset.encode('utf-8')),
+        'https://www.example.com/b.txt': "https://www.example.com/b1\n\nhttps://www.example.com/careers/jobs#top\n",
+    })
+    policy = RobotsPolicy('https://www.example.com/', fetcher)
+    seeds = list(sitemap_seeds('https://www.example.com/', fetcher, policy))
+    assert seeds == ['https://www.example.com/careers/jobs/', 'https://www.example.com/%EC%86%8C%EA%B0%9C',
+                     'https://www.example.com/b1']
+    assert link_text(seeds[1]) == '/소개'
+    assert list(sitemap_seeds('https://www.example.com/', fetcher, policy, limit=1)) == seeds[:1]
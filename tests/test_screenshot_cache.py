@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+from ia_crawler.screenshot_cache import FULL, THUMB, ScreenshotCache
+
+
+def _png(n, size=100):
+    return b'\x89PNG' + bytes([n % 256]) * size
+
+
+def _blobs(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(('.png', '.webp')))
+
+
+def test_put_get_and_shared_blob(tmp_path):
+    cache = ScreenshotCache(str(tmp_path))
+    cache.put('https://a.com/', 1920, _png(1), variant=FULL)
+    cache.put('https://a.com/', 1920, _png(1), variant=THUMB)
+    assert cache.get('https://a.com/', 1920, FULL) == _png(1)
+    assert cache.get('https://a.com/', 1920, THUMB) == _png(1)
+    assert cache.get('https://a.com/', 360, FULL) is None
+    # 같은 내용은 blob 하나만 저장하고 용량도 한 번만 계산
+    assert len(_blobs(tmp_path)) == 1
+    assert cache.stats()['bytes'] == len(_png(1))
+
+
+def test_replacing_entry_releases_old_blob(tmp_path):
+    cache = ScreenshotCache(str(tmp_path))
+    cache.put('https://a.com/', 1920, _png(1))
+    cache.put('https://a.com/', 1920, _png(2))
+    assert cache.get('https://a.com/', 1920) == _png(2)
+    assert _blobs(tmp_path) == [hashlib.sha256(_png(2)).hexdigest() + '.png']
+    assert cache.stats()['bytes'] == len(_png(2))
+
+
+def test_rolled_back_put_keeps_old_blob(tmp_path, monkeypatch):
+    # 트랜잭션이 롤백되면 인덱스가 가리키는 blob 파일도 그대로 남아야 함 (삭제는 COMMIT 뒤)
+    cache = ScreenshotCache(str(tmp_path))
+    cache.put('https://a.com/', 1920, _png(1))
+
+    def fail(conn, now):
+        raise RuntimeError('disk I/O error')
+    monkeypatch.setattr(cache, '_evict', fail)
+    with pytest.raises(RuntimeError):
+        cache.put('https://a.com/', 1920, _png(2))
+    assert cache.get('https://a.com/', 1920) == _png(1)
+    assert hashlib.sha256(_png(1)).hexdigest() + '.png' in _blobs(tmp_path)
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    size = len(_png(0))
+    cache = ScreenshotCache(str(tmp_path), max_bytes=size * 3)
+    for n in range(3):
+        cache.put(f'https://a.com/{n}', 1920, _png(n))
+    cache.get('https://a.com/0', 1920)  # 0을 최근 사용으로
+    cache.put('https://a.com/3', 1920, _png(3))
+    assert cache.get('https://a.com/1', 1920) is None
+    assert cache.get('https://a.com/0', 1920) == _png(0)
+    stats = cache.stats()
+    assert stats['entries'] == 3
+    assert stats['bytes'] == size * 3
+    assert stats['evictions'] == 1
+    assert len(_blobs(tmp_path)) == 3
+
+
+def test_expired_and_negative_entries(tmp_path):
+    cache = ScreenshotCache(str(tmp_path), ttl=-1, negative_ttl=0)
+    cache.put('https://a.com/', 1920, _png(1))
+    assert cache.get('https://a.com/', 1920) is None
+    cache.put('https://b.com/', 1920, _png(2), negative=True)
+    assert cache.get('https://b.com/', 1920) is None
+    cache.flush()
+    assert cache.stats()['entries'] == 0
+    assert _blobs(tmp_path) == []
+
+
+def test_migrates_legacy_layouts(tmp_path):
+    # 최초 버전: md5(url_width).png, 이전 버전: index.json + sha256 blob
+    legacy_key = ScreenshotCache.make_key('https://old.com/', 1920)
+    (tmp_path / f'{legacy_key}.png').write_bytes(_png(1))
+    digest = hashlib.sha256(_png(2)).hexdigest()
+    (tmp_path / f'{digest}.png').write_bytes(_png(2))
+    (tmp_path / 'index.json').write_text(json.dumps({
+        ScreenshotCache.make_key('https://json.com/', 360, THUMB): {
+            'url': 'https://json.com/', 'width': 360, 'variant': THUMB, 'digest': digest, 'ext': '.png',
+            'size': len(_png(2)), 'created_at': 1.0, 'expires_at': None, 'last_access': 1.0, 'hits': 3, 'negative': False,
+        },
+    }))
+
+    cache = ScreenshotCache(str(tmp_path))
+    assert cache.get('https://old.com/', 1920, FULL) == _png(1)
+    assert cache.get('https://json.com/', 360, THUMB) == _png(2)
+    assert cache.stats()['migrated'] == 2
+    assert not (tmp_path / 'index.json').exists()
+    assert not (tmp_path / f'{legacy_key}.png').exists()
+    assert cache.stats()['bytes'] == len(_png(1)) + len(_png(2))
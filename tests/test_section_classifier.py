@@ -0,0 +1,128 @@
+# classify_sections가 기존 find_gnb/side/footer_element(요소마다 find_all/정규식 반복)와 같은 요소를 고르는지 무작위 문서로 비교
+import random
+import re
+
+import pytest
+from bs4 import BeautifulSoup
+
+from ia_crawler.dom import get_dom
+from ia_crawler.section_classifier import classify_sections
+
+
+def legacy_gnb(soup):
+    potential = []
+    for tag in ['nav', 'header']:
+        potential.extend(soup.find_all(tag))
+    for name in ['gnb', 'nav', 'navigation', 'menu', 'main-menu', 'top-menu', 'topmenu', 'global-nav', 'util-menu', 'user-menu', 'header-menu']:
+        potential.extend(soup.find_all(class_=re.compile(f".*{name}.*", re.I)))
+    for name in ['gnb', 'nav', 'navigation', 'menu', 'top-menu', 'topmenu', 'global-nav', 'util-menu', 'user-menu', 'header-menu']:
+        element = soup.find(id=re.compile(f".*{name}.*", re.I))
+        if element:
+            potential.append(element)
+    scored = []
+    for element in potential:
+        score = 0
+        if element.name == 'nav':
+            score += 30
+        if element.find_parent('header'):
+            score += 20
+        links = element.find_all('a')
+        score += min(len(links) * 2, 20)
+        if element.find(['ul', 'ol']):
+            score += 15
+        if any(word in link.get_text().lower() for link in links for word in ('login', 'logout', 'join', 'mypage')):
+            score += 10
+        scored.append((element, score))
+    return max(scored, key=lambda x: x[1])[0] if scored else None
+
+
+def legacy_side(soup):
+    potential = []
+    potential.extend(soup.find_all('aside'))
+    for name in ['sidebar', 'side', 'side-menu', 'side-nav']:
+        potential.extend(soup.find_all(class_=re.compile(f".*{name}.*", re.I)))
+    for name in ['sidebar', 'side', 'side-menu']:
+        element = soup.find(id=re.compile(f".*{name}.*", re.I))
+        if element:
+            potential.append(element)
+    scored = []
+    for element in potential:
+        score = 0
+        if element.name == 'aside':
+            score += 20
+        score += min(len(element.find_all('a')) * 2, 20)
+        if element.find(['ul', 'ol']):
+            score += 15
+        scored.append((element, score))
+    return max(scored, key=lambda x: x[1])[0] if scored else None
+
+
+def legacy_footer(soup):
+    candidates = []
+    for selector in ['footer', '#footer', '.footer', '[class*="footer"]', '[class*="Footer"]', '.bottom', '#bottom', '.site-bottom']:
+        candidates.extend(soup.select(selector))
+    if not candidates:
+        for element in soup.find_all(['div', 'section']):
+            if any(keyword in element.get_text().lower() for keyword in ['이용약관', '개인정보', '사이트맵', '회사소개']):
+                candidates.append(element)
+    scored = []
+    for element in candidates:
+        score = len(element.find_all('a')) * 2
+        if element.name == 'footer':
+            score += 20
+        if any(cls and 'footer' in cls.lower() for cls in element.get('class', [])):
+            score += 10
+        scored.append((element, score))
+    return max(scored, key=lambda x: x[1])[0] if scored else None
+
+
+TAGS = ['div', 'div', 'section', 'nav', 'header', 'aside', 'footer', 'ul', 'ol', 'li', 'span']
+CLASSES = ['', '', 'gnb', 'Main-Menu', 'topMenu', 'navigation', 'util-menu', 'sideBar', 'side-nav', 'footer', 'footer-inner',
+           'siteFooter', 'bottom', 'site-bottom', 'inner', 'menu gnb', 'wrap side']
+IDS = ['', '', '', 'gnb', 'header-menu', 'side', 'footer', 'bottom', 'content']
+TEXTS = ['회사소개', '이용약관', '개인정보처리방침', 'Login', 'JOIN', 'mypage', '제품', '고객센터']
+
+
+def _tree(rng, depth, out, footerless):
+    tag = rng.choice(TAGS)
+    cls, element_id = rng.choice(CLASSES), rng.choice(IDS)
+    if footerless and (tag == 'footer' or re.search('footer|bottom', cls + element_id, re.I)):
+        # 푸터 선택자가 하나도 맞지 않아 키워드 기반 폴백을 타는 문서
+        tag, cls, element_id = 'div', '', ''
+    attrs = (f' class="{cls}"' if cls else '') + (f' id="{element_id}"' if element_id else '')
+    out.append(f'<{tag}{attrs}>')
+    for _ in range(rng.randint(0, 4) if depth < 5 else 0):
+        if rng.random() < 0.35:
+            out.append(f'<a href="/p{len(out)}">{rng.choice(TEXTS)}</a>')
+        elif rng.random() < 0.1:
+            out.append(rng.choice(TEXTS))
+        else:
+            _tree(rng, depth + 1, out, footerless)
+    out.append(f'</{tag}>')
+
+
+def random_document(rng, footerless=False):
+    out = ['<html><body>']
+    for _ in range(rng.randint(1, 4)):
+        _tree(rng, 0, out, footerless)
+    out.append('</body></html>')
+    return ''.join(out)
+
+
+@pytest.mark.parametrize('footerless', [False, True])
+@pytest.mark.parametrize('seed', range(2))
+def test_matches_legacy_finders(seed, footerless):
+    rng = random.Random(seed)
+    dom = get_dom('html.parser')
+    for _ in range(80):
+        html = random_document(rng, footerless)
+        soup = BeautifulSoup(html, 'html.parser')
+        sections = classify_sections(soup, dom)
+        assert sections['gnb'] is legacy_gnb(soup), html
+        assert sections['side'] is legacy_side(soup), html
+        assert sections['footer'] is legacy_footer(soup), html
+
+
+def test_no_sections():
+    soup = BeautifulSoup('<html><body><p><a href="/a">A</a></p></body></html>', 'html.parser')
+    assert classify_sections(soup, get_dom('html.parser')) == {'gnb': None, 'side': None, 'footer': None}
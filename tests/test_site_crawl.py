@@ -0,0 +1,93 @@
+import threading
+
+from ia_crawler.link_store import LinkNode, Section, StringTable
+from ia_crawler.site_crawl import SiteCrawlEngine, iter_links
+
+BASE = 'https://www.example.com'
+# 페이지 -> 그 페이지에서 추출한 링크. 오류 페이지는 crawl()이 메시지를 돌려줌
+SITE = {
+    '/': ['/about', '/products', 'https://other.com/x'],
+    '/about': ['/about/team', '/', '/products/'],
+    '/products': ['/products/1', '/about/#top', '/about?utm_source=gnb', '/broken'],
+    '/about/team': ['/about/team/deep'],
+    '/products/1': ['/products/2'],
+    '/products/2': [],
+    '/about/team/deep': [],
+}
+
+
+class FakeCrawler:
+    fetched = None
+
+    def __init__(self, strings, lock):
+        self.strings = strings
+        self.lock = lock
+        self.fetch_tier = 'http'
+        self.content_hash = None
+        self.gnb_links = self.side_links = self.footer_links = []
+        self.other_links = []
+
+    def crawl(self, url):
+        path = url[len(BASE):]
+        with self.lock:
+            self.fetched.append(path)
+        if path == '/broken':
+            return "HTTP 500"
+        self.base_url = url
+        self.content_hash = path
+        self.other_links = [{'text': link, 'url': link if link.startswith('http') else BASE + link, 'children': []}
+                            for link in SITE[path.rstrip('/') or '/']]
+        return True
+
+
+def _crawl(**kwargs):
+    strings = StringTable()
+    lock = threading.Lock()
+    FakeCrawler.fetched = []
+    root = FakeCrawler(strings, lock)
+    root.base_url = BASE + '/'
+    root.gnb_links = [LinkNode(strings, link, BASE + link, Section.GNB, 1) for link in SITE['/'][:2]]
+    root.other_links = [LinkNode(strings, 'x', SITE['/'][2], Section.OTHER, 1)]
+    engine = SiteCrawlEngine(lambda: FakeCrawler(strings, lock), **kwargs)
+    pages = engine.run(root)
+    return root, pages, FakeCrawler.fetched
+
+
+def test_bfs_depths_and_tree():
+    root, pages, fetched = _crawl(max_depth=2, max_pages=100)
+    assert {url: page['depth'] for url, page in pages.items()} == {
+        BASE + '/': 0, BASE + '/about': 1, BASE + '/products': 1,
+        BASE + '/about/team': 2, BASE + '/products/1': 2, BASE + '/broken': 2,
+    }
+    # 깊이 1 페이지를 모두 가져온 뒤에 깊이 2로 내려감
+    assert sorted(fetched[:2]) == ['/about', '/products']
+    assert pages[BASE + '/broken'] == {'depth': 2, 'status': 'HTTP 500'}
+    about = root.gnb_links[0]
+    assert [child['url'] for child in about['children']] == [BASE + '/about/team']
+    assert about['children'][0]['depth'] == 2 and about['children'][0]['section'] == 'GNB'
+    # 마지막 깊이에서 찾은 링크는 트리에만 붙이고 가져오지 않음
+    assert [child['url'] for child in about['children'][0]['children']] == [BASE + '/about/team/deep']
+    assert '/about/team/deep' not in fetched
+
+
+def test_dedup_and_scope():
+    root, pages, fetched = _crawl(max_depth=3, max_pages=100)
+    # /about/, /about#top, /about?utm_source=... 는 /about과 같은 페이지. 외부 호스트는 가져오지 않음
+    assert sorted(fetched) == sorted(set(fetched))
+    assert '/about/' not in fetched and not any('other.com' in url for url in pages)
+    urls = [link['url'] for attr in ('gnb_links', 'other_links') for link in iter_links(getattr(root, attr))]
+    assert len(urls) == len(set(urls))
+    assert BASE + '/about/team/deep' in pages and BASE + '/products/2' in pages
+
+
+def test_page_budget():
+    _, pages, fetched = _crawl(max_depth=5, max_pages=4)
+    assert len(pages) == 4
+    assert len(fetched) == 3
+
+
+def test_cancel_stops_after_current_page():
+    cancel = threading.Event()
+    cancel.set()
+    _, pages, fetched = _crawl(max_depth=3, max_pages=100, concurrency=1, cancel=cancel)
+    assert len(pages) == 2
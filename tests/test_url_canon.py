@@ -0,0 +1,43 @@
+import pytest
+
+from ia_crawler.url_canon import UrlSeenSet, canonicalize, url_fingerprint
+
+
+@pytest.mark.parametrize('variants', [
+    ['https://www.example.com/careers/jobs', 'https://www.example.com/careers/jobs/', 'https://www.example.com/careers/jobs#open',
+     'HTTPS://WWW.Example.COM:443/careers/jobs?utm_source=gnb&utm_medium=x', 'https://www.example.com./careers/jobs?gclid=1'],
+    ['https://a.com/', 'https://a.com', 'https://a.com/#top', 'https://a.com/?fbclid=x'],
+    ['https://a.com/list?b=2&a=1', 'https://a.com/list/?a=1&b=2&_ga=3'],
+])
+def test_same_page_variants_collapse(variants):
+    assert len({canonicalize(url) for url in variants}) == 1
+
+
+@pytest.mark.parametrize('left, right', [
+    ('https://a.com/Careers', 'https://a.com/careers'),  # 경로는 대소문자 구분
+    ('http://a.com/x', 'https://a.com/x'),
+    ('https://a.com:8443/x', 'https://a.com/x'),
+    ('https://a.com/list?page=1', 'https://a.com/list?page=2'),
+    ('https://a.com/list?page=', 'https://a.com/list'),
+])
+def test_different_pages_stay_distinct(left, right):
+    assert canonicalize(left) != canonicalize(right)
+
+
+def test_seen_set_dedups_by_canonical_url_and_grows():
+    seen = UrlSeenSet()
+    assert seen.add('https://www.example.com/careers/jobs/')
+    assert not seen.add('https://www.example.com/careers/jobs')
+    assert 'https://www.example.com/careers/jobs#x' in seen
+    assert 'https://www.example.com/careers' not in seen
+    initial = seen.nbytes()
+    urls = [f'https://www.example.com/p/{i}' for i in range(5000)]
+    assert all(seen.add(url) for url in urls)
+    assert not any(seen.add(url + '/') for url in urls)
+    assert len(seen) == 5001
+    assert seen.nbytes() > initial
+    assert all(url in seen for url in urls)
+
+
+def test_fingerprint_is_never_empty_slot():
+    assert all(url_fingerprint(f'https://a.com/{i}') != 0 for i in range(1000))
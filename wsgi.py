@@ -1,4 +1,24 @@
-from app import app
+# 크롤링 작업 JSON API 진입점 (Streamlit UI는 app.py)
+#   WSGI: gunicorn wsgi:app
+#   ASGI: uvicorn wsgi:asgi_app
+import logging
+import os
+
+from ia_crawler.api import app, asgi_app  # noqa: F401
+
+logger = logging.getLogger(__name__)
 
 if __name__ == "__main__":
-    app.run() 
\ No newline at end of file
+    from wsgiref.simple_server import WSGIServer, make_server
+    from socketserver import ThreadingMixIn
+
+    class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+        daemon_threads = True
+
+    logging.basicConfig(level=logging.INFO)
+    # 개발용 서버는 기본적으로 로컬에서만 접속 가능. 외부에 열려면 HOST=0.0.0.0 (인증 없는 API이므로 주의)
+    host = os.environ.get("HOST", "127.0.0.1")
+    port = int(os.environ.get("PORT", "8000"))
+    with make_server(host, port, app, server_class=ThreadingWSGIServer) as server:
+        logger.info(f"http://{host}:{port}")
+        server.serve_forever()